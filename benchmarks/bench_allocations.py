@@ -0,0 +1,118 @@
+"""Memory churn of LifeField.next_generation.
+
+Runs the same random board through the nested-list step that LifeField
+used to have (a new board and a neighbor list per cell every generation)
+and through the current double-buffered step, and reports the memory
+allocated per generation (the tracemalloc peak above the memory held
+before the step) and the time per generation.  The last two rows compare
+the ways of watching every generation: copying the board with
+``get_board_state()`` after each step, or taking the changed cells from
+``iter_generations()``.
+
+    $ python benchmarks/bench_allocations.py --size 8 --generations 10000
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from lifegame_py import LifeField, protocol
+
+
+class ListLifeField:
+    """The former nested-list implementation of LifeField.next_generation."""
+    def __init__(self, board):
+        self.height = len(board)
+        self.width = len(board[0])
+        self.cells = [list(row) for row in board]
+
+    def _get_neighbors(self, y, x):
+        neighbors = []
+        for dy in [-1, 0, 1]:
+            for dx in [-1, 0, 1]:
+                if dy == 0 and dx == 0:
+                    continue
+                ny, nx = y + dy, x + dx
+                if 0 <= ny < self.height and 0 <= nx < self.width and self.cells[ny][nx] > 0:
+                    neighbors.append(self.cells[ny][nx])
+        return neighbors
+
+    def next_generation(self):
+        new_cells = [[protocol.DEAD] * self.width for _ in range(self.height)]
+        for y in range(self.height):
+            for x in range(self.width):
+                neighbors = self._get_neighbors(y, x)
+                alive_count = len(neighbors)
+                if self.cells[y][x] > 0:
+                    if 2 <= alive_count <= 3:
+                        new_cells[y][x] = self.cells[y][x]
+                elif alive_count == 3:
+                    player1_count = neighbors.count(protocol.PLAYER1)
+                    player2_count = neighbors.count(protocol.PLAYER2)
+                    if player1_count > player2_count:
+                        new_cells[y][x] = protocol.PLAYER1
+                    elif player1_count < player2_count:
+                        new_cells[y][x] = protocol.PLAYER2
+        self.cells = new_cells
+
+
+def churn(step, generations):
+    """Return (bytes allocated per generation, seconds)."""
+    step()  # バッファの確保を計測から外す
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(generations):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        step()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    # tracemalloc なしで時間だけ測る
+    start = time.perf_counter()
+    for _ in range(generations):
+        step()
+    seconds = time.perf_counter() - start
+    return allocated / generations, seconds
+
+
+def main(size, generations, density, seed):
+    rng = random.Random(seed)
+    board = [[rng.choice([protocol.PLAYER1, protocol.PLAYER2]) if rng.random() < density else protocol.DEAD
+              for _ in range(size)] for _ in range(size)]
+
+    copied = LifeField.from_board(board)
+
+    def step_and_copy():
+        copied.next_generation()
+        return copied.get_board_state()
+
+    # churn() は計測前の 1 回を含めて 2 * generations + 1 世代進める
+    diffs = LifeField.from_board(board).iter_generations(2 * generations + 1)
+
+    for name, step in [('nested lists', ListLifeField(board).next_generation),
+                       ('LifeField', LifeField.from_board(board).next_generation),
+                       ('+ board copy', step_and_copy),
+                       ('+ diffs', diffs.__next__)]:
+        per_generation, seconds = churn(step, generations)
+        print(f'{size}x{size} {name:<13} {per_generation:10.0f} bytes/gen '
+              f'{seconds / generations * 1e6:9.2f} us/gen')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="LifeField allocation benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--size", type=int, default=protocol.HEIGHT)
+    parser.add_argument("--generations", type=int, default=10000)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.size, args.generations, args.density, args.seed)
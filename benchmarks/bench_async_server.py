@@ -0,0 +1,114 @@
+"""Throughput and move latency of the asyncio game server under load.
+
+Starts ``AsyncLifeServer`` and ``--concurrency`` pairs of scripted
+clients on one event loop; every pair plays matches back to back with
+random legal moves until ``--games`` matches have finished.  Reports
+games per second and the latency a client sees from sending a placement
+to receiving its result.
+
+    $ python benchmarks/bench_async_server.py --games 2000 --concurrency 200
+
+With ``--workers N`` the load goes to a ``ShardedServer`` of N processes
+instead (the clients stay on one event loop, so give them a core too).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from lifegame_py import protocol
+from lifegame_py.async_server import AsyncLifeServer
+from lifegame_py.sharded import ShardedServer
+
+
+async def client(address, name, rng, latencies, registered):
+    reader, writer = await asyncio.open_connection(*address)
+    await reader.readline()
+    writer.write(name.encode() + b'\n')
+    field_info = json.loads(await reader.readline())
+    registered.set()
+    moves = [(y, x) for y in range(field_info["height"]) for x in range(field_info["width"])]
+    rng.shuffle(moves)
+    occupied = set()
+    sent = None
+    while True:
+        line = (await reader.readline()).decode().rstrip()
+        if not line or line in (protocol.you_win, protocol.you_lose, protocol.draw):
+            break
+        if line == protocol.placement:
+            move = next(pos for pos in moves if pos not in occupied)
+            writer.write(json.dumps({"place": list(move)}).encode() + b'\n')
+            sent = time.perf_counter()
+        elif line.startswith('{'):
+            result = json.loads(line)
+            if result.get("phase") == protocol.phase_placement:
+                occupied = {(y, x) for y, row in enumerate(result["board"])
+                            for x, cell in enumerate(row) if cell != protocol.DEAD}
+                if sent is not None:
+                    latencies.append(time.perf_counter() - sent)
+                    sent = None
+    writer.close()
+
+
+async def pair_loop(address, index, games, rng, latencies):
+    while games[0] > 0:
+        games[0] -= 1
+        tasks = []
+        for side in range(2):
+            registered = asyncio.Event()
+            tasks.append(asyncio.ensure_future(client(address, f'bench{index}-{side}', rng, latencies, registered)))
+            await registered.wait()
+        await asyncio.gather(*tasks)
+
+
+async def run(games, concurrency, seed, workers):
+    if workers is None:
+        server = AsyncLifeServer(max_games=games)
+        ready = asyncio.get_running_loop().create_future()
+        serving = asyncio.ensure_future(server.serve('127.0.0.1', 0, ready))
+        address = await ready
+    else:
+        server = ShardedServer('127.0.0.1', 0, workers)
+        address = server.start()
+
+    rng = random.Random(seed)
+    latencies = []
+    remaining = [games]
+    start = time.perf_counter()
+    await asyncio.gather(*(pair_loop(address, i, remaining, rng, latencies) for i in range(concurrency)))
+    if workers is None:
+        await serving
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{games} games, {concurrency} concurrent: {games / seconds:8.1f} games/s')
+    print(f'move latency (client): median {statistics.median(latencies) * 1e3:.2f} ms, '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms, max {latencies[-1] * 1e3:.2f} ms')
+    if workers is None:
+        stats = server.stats.as_dict()
+        print(f'move handling (server): mean {stats["mean_move_ms"]:.3f} ms, max {stats["max_move_ms"]:.3f} ms')
+    else:
+        server.stop()
+        print(f'server counters: {server.counters()}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="asyncio game server benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100,
+                        help="matches played at the same time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int,
+                        help="benchmark a ShardedServer with this many worker processes")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.games, args.concurrency, args.seed, args.workers))
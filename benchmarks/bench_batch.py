@@ -0,0 +1,73 @@
+"""Throughput (boards/second) of simulate_batch against per-board engines.
+
+    $ python benchmarks/bench_batch.py --batch 64 1024
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import random
+import time
+
+from lifegame_py import LifeField, BitboardField, protocol
+from lifegame_py.vectorized import simulate_batch
+
+
+def random_board(height, width, rng):
+    owners = [protocol.DEAD, protocol.DEAD, protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2]
+    return [[rng.choice(owners) for _ in range(width)] for _ in range(height)]
+
+
+def run_per_board(field_class, boards, generations):
+    for board in boards:
+        field = field_class.from_board(board)
+        for _ in range(generations):
+            field.next_generation()
+        field.count(protocol.PLAYER1)
+        field.count(protocol.PLAYER2)
+
+
+def run_batch(boards, generations):
+    simulate_batch(boards, generations)
+
+
+def throughput(func, boards, generations, min_time):
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        func(boards, generations)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return rounds * len(boards) / elapsed
+
+
+def main(batch_sizes, size, generations, min_time, seed):
+    rng = random.Random(seed)
+    runners = {
+        'reference': lambda boards, g: run_per_board(LifeField, boards, g),
+        'bitboard': lambda boards, g: run_per_board(BitboardField, boards, g),
+        'batch': run_batch,
+    }
+    for n in batch_sizes:
+        boards = [random_board(size, size, rng) for _ in range(n)]
+        for name, func in runners.items():
+            rate = throughput(func, boards, generations, min_time)
+            print(f'N={n:<6} {size}x{size} G={generations} {name:<10} {rate:12.0f} boards/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="batched simulation benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--batch", type=int, nargs='+', default=[64, 1024])
+    parser.add_argument("--size", type=int, default=protocol.HEIGHT)
+    parser.add_argument("--generations", type=int, default=protocol.SIMULATION_GENERATIONS)
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="seconds per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.batch, args.size, args.generations, args.min_time, args.seed)
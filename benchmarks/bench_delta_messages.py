@@ -0,0 +1,67 @@
+"""Cost of a placement-phase message: whole board vs delta.
+
+For each board size, plays the placements of a game through
+``LifeGameControl.place_cell`` and a ``LifePlayer``: the server builds
+and encodes the result message, the player decodes and applies it.
+Reports the time and bytes per move with the whole board and with the
+``delta`` option (placed cell plus a periodic checksum).
+
+    $ python benchmarks/bench_delta_messages.py --sizes 8 64 256
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import json
+import random
+import time
+
+from lifegame_py import LifeField, LifeGameControl, LifeClient, LifePlayer, protocol
+
+
+class NullPlayer(LifePlayer):
+    def name(self):
+        return 'null'
+
+    def place_cell(self):
+        raise NotImplementedError
+
+
+def play(size, moves, board):
+    game_control = LifeGameControl(LifeField(size, size))
+    for i in range(2):
+        game_control.add_client(LifeClient(i, f'p{i}', None))
+    player = NullPlayer()
+    player.initialize(LifeField(size, size), protocol.PLAYER1)
+    sent = 0
+    start = time.perf_counter()
+    for i, position in enumerate(moves):
+        # 手数の制限は測定の邪魔なので外す
+        game_control.clients[i % 2].placed_count = 0
+        line = json.dumps(game_control.place_cell(i % 2, position, board))
+        sent += len(line) + 1
+        player.update(line)
+    seconds = time.perf_counter() - start
+    assert player.field.get_board_state() == game_control.field.get_board_state()
+    return seconds / len(moves), sent / len(moves)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="placement message benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs='+', default=[8, 64, 256])
+    parser.add_argument("--moves", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f'{"size":>6} {"full us/move":>13} {"delta us/move":>14} {"full B/move":>12} {"delta B/move":>13}')
+    for size in args.sizes:
+        moves = rng.sample([(y, x) for y in range(size) for x in range(size)], min(args.moves, size * size))
+        full_seconds, full_bytes = play(size, moves, True)
+        delta_seconds, delta_bytes = play(size, moves, False)
+        print(f'{size:>6} {full_seconds * 1e6:13.1f} {delta_seconds * 1e6:14.1f} '
+              f'{full_bytes:12.0f} {delta_bytes:13.0f}')
@@ -0,0 +1,60 @@
+"""Copy cost and per-board memory of LifeField.
+
+Compares the nested-list copy the sample players used to make
+(``copy.deepcopy(field.cells)`` into a fresh field) with ``clone()``.
+
+    $ python benchmarks/bench_field_copy.py --size 8
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import copy
+import random
+import timeit
+import tracemalloc
+
+from lifegame_py import LifeField, protocol
+
+
+def nested_list_copy(cells):
+    return copy.deepcopy(cells)
+
+
+def per_board_bytes(make, count=1000):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    boards = [make() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del boards
+    return (after - before) / count
+
+
+def main(size, seed):
+    rng = random.Random(seed)
+    field = LifeField(size, size)
+    for y in range(size):
+        for x in range(size):
+            field.place(rng.choice([protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2]), (y, x))
+    cells = field.get_board_state()
+
+    for name, make in [('deepcopy(list)', lambda: nested_list_copy(cells)),
+                       ('clone()', field.clone)]:
+        timer = timeit.Timer(make)
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=3, number=number)) / number
+        print(f'{size}x{size} {name:<15} {seconds * 1e6:9.2f} us/copy {per_board_bytes(make):9.0f} bytes/board')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="LifeField copy benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--size", type=int, default=protocol.HEIGHT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.size, args.seed)
@@ -0,0 +1,78 @@
+"""Greedy evaluation of every placement: whole board vs light cone.
+
+Scatters a few small live clusters on an N x N board and scores every
+empty cell for PLAYER1 after SIMULATION_GENERATIONS generations, once by
+simulating the whole board per candidate (BitboardField) and once with
+``PlacementEvaluator``.  The results are checked to be identical.
+
+    $ python benchmarks/bench_lightcone.py --sizes 8 32 64 128
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import random
+import time
+
+from lifegame_py import BitboardField, LifeField, protocol
+from lifegame_py.lightcone import PlacementEvaluator
+
+OWNERS = (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2)
+
+
+def clustered_field(size, clusters, rng):
+    field = LifeField(size, size)
+    for _ in range(clusters):
+        cy, cx = rng.randrange(size), rng.randrange(size)
+        for _ in range(6):
+            pos = (min(size - 1, cy + rng.randrange(3)), min(size - 1, cx + rng.randrange(3)))
+            field.place(rng.choice([protocol.PLAYER1, protocol.PLAYER2]), pos)
+    return field
+
+
+def whole_board(field, generations):
+    base = BitboardField.from_field(field)
+    results = {}
+    for y in range(field.height):
+        for x in range(field.width):
+            if field.cells[y][x] == protocol.DEAD:
+                temp = base.clone()
+                temp.place(protocol.PLAYER1, (y, x))
+                temp.advance(generations)
+                results[(y, x)] = tuple(temp.count(owner) for owner in OWNERS)
+    return results
+
+
+def main(sizes, clusters, generations, seed):
+    rng = random.Random(seed)
+    for size in sizes:
+        field = clustered_field(size, clusters, rng)
+
+        start = time.perf_counter()
+        expected = whole_board(field, generations)
+        whole_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluator = PlacementEvaluator(field, generations)
+        results = evaluator.evaluate_all(protocol.PLAYER1)
+        cone_seconds = time.perf_counter() - start
+
+        assert results == expected
+        print(f'{size:>4}x{size:<4} {len(results):6} candidates  whole board {whole_seconds:8.3f}s  '
+              f'light cone {cone_seconds:8.3f}s ({evaluator.simulations} simulations)  '
+              f'x{whole_seconds / cone_seconds:5.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="light-cone placement evaluation benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs='+', default=[protocol.HEIGHT, 32, 64, 128])
+    parser.add_argument("--clusters", type=int, default=4)
+    parser.add_argument("--generations", type=int, default=protocol.SIMULATION_GENERATIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.sizes, args.clusters, args.generations, args.seed)
@@ -0,0 +1,67 @@
+"""A/B timing of next_generation across field engines.
+
+    $ python benchmarks/bench_next_generation.py --sizes 8 64 256
+
+Every backend registered in ``lifegame_py.backend`` is measured; set
+``LIFEGAME_BACKEND`` to the fastest one to use it on this machine.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import random
+import timeit
+
+from lifegame_py import protocol
+from lifegame_py.backend import available_backends, get_backend
+
+
+ENGINES = available_backends()
+
+
+def random_board(height, width, rng, density):
+    board = [[protocol.DEAD] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < density:
+                board[y][x] = rng.choice([protocol.PLAYER1, protocol.PLAYER2])
+    return board
+
+
+def bench(make_field, board, min_time):
+    field = make_field(board)
+    timer = timeit.Timer(field.next_generation)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main(sizes, engines, density, min_time, seed):
+    rng = random.Random(seed)
+    for size in sizes:
+        board = random_board(size, size, rng, density)
+        baseline = None
+        for name in engines:
+            seconds = bench(get_backend(name).from_board, board, min_time)
+            if baseline is None:
+                baseline = seconds
+            print(f'{size:>5}x{size:<5} {name:<10} {seconds * 1e6:12.1f} us/gen'
+                  f'  x{baseline / seconds:7.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="next_generation benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs='+', default=[protocol.HEIGHT, 64, 256])
+    parser.add_argument("--engines", nargs='+', default=ENGINES, choices=ENGINES)
+    parser.add_argument("--density", type=float, default=0.4,
+                        help="fraction of live cells in the initial board")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.sizes, args.engines, args.density, args.min_time, args.seed)
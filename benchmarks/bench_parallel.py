@@ -0,0 +1,61 @@
+"""Scaling of ParallelLifeField with the number of worker processes.
+
+Times ``advance()`` on one large random board for each worker count and
+compares it with the single-process numpy engine.  Needs numpy.
+
+    $ python benchmarks/bench_parallel.py --size 8192 --workers 1 2 4 8
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import time
+
+from lifegame_py import protocol
+from lifegame_py.vectorized import np, NumpyLifeField
+from lifegame_py.parallel import ParallelLifeField
+
+
+def random_board(size, density, seed):
+    rng = np.random.default_rng(seed)
+    owners = rng.choice(np.array([protocol.PLAYER1, protocol.PLAYER2], dtype=np.uint8), (size, size))
+    return np.where(rng.random((size, size)) < density, owners, protocol.DEAD).astype(np.uint8)
+
+
+def main(size, workers, generations, density, seed):
+    board = random_board(size, density, seed)
+
+    serial = NumpyLifeField(size, size)
+    serial.cells = board.copy()
+    start = time.perf_counter()
+    for _ in range(generations):
+        serial.next_generation()
+    baseline = (time.perf_counter() - start) / generations
+    serial.next_generation()  # 並列版はワーカー起動に 1 世代使うので揃える
+    print(f'{size}x{size} numpy        {baseline * 1e3:10.2f} ms/gen')
+
+    for count in workers:
+        with ParallelLifeField(size, size, workers=count) as field:
+            field.cells[:] = board
+            field.advance(1)  # ワーカーの起動を計測から外す
+            start = time.perf_counter()
+            field.advance(generations)
+            seconds = (time.perf_counter() - start) / generations
+            assert np.array_equal(field.cells, serial.cells)
+        print(f'{size}x{size} {count:2d} workers  {seconds * 1e3:10.2f} ms/gen  x{baseline / seconds:6.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="ParallelLifeField scaling benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.size, args.workers, args.generations, args.density, args.seed)
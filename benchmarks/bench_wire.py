@@ -0,0 +1,76 @@
+"""Messages per second: JSON lines vs binary frames.
+
+Encodes and decodes the messages of the placement phase (turn status,
+the player's placement, the result with the whole board) and the final
+result, as the server and a client do for every move, with the text
+protocol and with ``wire``.  Board sizes are given by ``--sizes``.
+
+    $ python benchmarks/bench_wire.py --sizes 8 64 256
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import argparse
+import json
+import random
+import time
+
+from lifegame_py import LifeField, protocol
+from lifegame_py import wire
+
+
+def messages(size, rng):
+    board = [[rng.choice([protocol.PLAYER1, protocol.PLAYER2]) if rng.random() < 0.3 else protocol.DEAD
+              for _ in range(size)] for _ in range(size)]
+    field = LifeField.from_board(board)
+    position = (rng.randrange(size), rng.randrange(size))
+    placement = {"phase": protocol.phase_placement, "board": board, "next_player": protocol.PLAYER2}
+    return field, position, placement
+
+
+def json_round(field, position, placement):
+    # サーバは盤面を入れ子のリストにして JSON に、クライアントは読み戻す
+    (protocol.placement + '\n').rstrip()
+    tuple(json.loads(json.dumps({"place": list(position)}))["place"])
+    placement["board"] = field.get_board_state()
+    json.loads(json.dumps(placement))
+    return 3
+
+
+def binary_round(field, position, placement):
+    wire.decode(wire.encode_status(protocol.placement)[4:])
+    wire.decode_placement(wire.encode_placement(position)[4:])
+    wire.decode(wire.encode_result(placement, field)[4:])
+    return 3
+
+
+def measure(function, args, seconds):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        count += function(*args)
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="wire format benchmark",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs='+', default=[8, 64, 256])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f'{"size":>6} {"json msg/s":>12} {"binary msg/s":>13} {"speedup":>8} '
+          f'{"json B/board":>13} {"binary B/board":>15}')
+    for size in args.sizes:
+        field, position, placement = messages(size, rng)
+        json_rate = measure(json_round, (field, position, placement), args.seconds)
+        binary_rate = measure(binary_round, (field, position, placement), args.seconds)
+        json_bytes = len(json.dumps(placement)) + 1
+        binary_bytes = len(wire.encode_result(placement, field))
+        print(f'{size:>6} {json_rate:12.0f} {binary_rate:13.0f} {binary_rate / json_rate:7.1f}x '
+              f'{json_bytes:13} {binary_bytes:15}')
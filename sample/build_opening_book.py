@@ -0,0 +1,110 @@
+"""
+オープニングブックを作成するスクリプト
+・空の盤面から --plies 手目までに現れる局面を列挙する（回転・反転で同じになる局面はまとめる）
+・各局面を探索プレイヤーで読み、最善手を固定長レコードのファイルに書き出す
+
+    $ python sample/build_opening_book.py opening.book --plies 2
+    $ python sample/minimax_ab_player.py localhost 2000 --book opening.book
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lifegame_py import LifeField, protocol, unique_moves
+from lifegame_py.book import position_key, write_book
+from lifegame_py.symmetry import transform_position
+import logging
+import time
+
+from greed_player import GreedPlayer
+from minimax_ab_player import MinimaxABPlayer
+
+PLAYERS = {
+    'greed': GreedPlayer,
+    'minimax_ab': MinimaxABPlayer,
+}
+
+
+def opening_positions(height, width, plies):
+    """空の盤面から plies 手未満の局面を (盤面, 手番のプレイヤー) で列挙する。対称な局面は1つだけ。"""
+    seen = set()
+    level = [LifeField(height, width)]
+    for ply in range(plies):
+        # 先手 (PLAYER1) と後手 (PLAYER2) が交互に置く
+        mover = protocol.PLAYER1 if ply % 2 == 0 else protocol.PLAYER2
+        next_level = []
+        for field in level:
+            key, _ = position_key(field, mover)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield field, mover
+            for pos in unique_moves(field):
+                child = field.clone()
+                child.place(mover, pos)
+                next_level.append(child)
+        level = next_level
+
+
+def build(path, player_name, plies, height, width):
+    player = PLAYERS[player_name]()
+    entries = []
+    start = time.time()
+    for field, mover in opening_positions(height, width, plies):
+        key, transform = position_key(field, mover)
+        player.initialize(field.clone(), mover)
+        y, x = player.place_cell()
+        # ブックには正準形の座標で保存する
+        entries.append((key, transform_position((y, x), transform, height, width)))
+        if len(entries) % 100 == 0:
+            logging.info(f'{len(entries)} positions searched ({time.time() - start:.1f}s)')
+    count = write_book(path, height, width, entries)
+    logging.info(f'Wrote {count} positions to {path} in {time.time() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Build an opening book for Life Game players",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "output",
+        help="Path of the book file to write"
+    )
+    parser.add_argument(
+        "--plies",
+        type=int,
+        default=2,
+        help="Cover positions with fewer than this many placements"
+    )
+    parser.add_argument(
+        "--player",
+        choices=sorted(PLAYERS),
+        default='minimax_ab',
+        help="Player whose search chooses the book moves"
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=protocol.HEIGHT
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=protocol.WIDTH
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="verbose output"
+    )
+    args = parser.parse_args()
+
+    FORMAT = '%(asctime)s %(levelname)s %(message)s'
+    level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(format=FORMAT, level=level, force=True)
+
+    build(args.output, args.player, args.plies, args.height, args.width)
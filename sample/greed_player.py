@@ -1,9 +1,9 @@
-import copy
 import sys 
 import os 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from lifegame_py import LifePlayer, play_game, protocol, LifeField
+from lifegame_py import LifePlayer, play_game, protocol, unique_moves
+from lifegame_py.lightcone import PlacementEvaluator
 import logging
 
 class GreedPlayer(LifePlayer):
@@ -13,9 +13,11 @@ class GreedPlayer(LifePlayer):
     ・3世代先読み
     ・「自分のセル数 - 相手のセル数」の差分を最大化
     ・次の相手の手を考慮しない。
+    ・盤面の回転・反転で互いに移り合う手は同じ結果になるので、1 つだけ評価する。
+    ・配置の影響は SIMULATION_GENERATIONS マス先までしか届かないので、その範囲だけを計算する。
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, opening_book=None):
+        super().__init__(opening_book)
     
     def name(self): 
         return 'greed-lifegame-player'
@@ -30,28 +32,21 @@ class GreedPlayer(LifePlayer):
         # 相手プレイヤーのIDを決定
         other_player_id = protocol.PLAYER1 if self.player_id == protocol.PLAYER2 else protocol.PLAYER2
 
-        # 全ての空いている位置を試す
-        for y in range(self.field.height):
-            for x in range(self.field.width):
-                if self.field.cells[y][x] == protocol.DEAD:
-                    # 試行用のフィールドを作成し、現在の状態をコピー
-                    temp_field = LifeField(width=self.field.width, height=self.field.height)
-                    temp_field.cells = copy.deepcopy(self.field.cells)
-                    # 仮にセルを配置
-                    temp_field.cells[y][x] = self.player_id
+        # 配置の影響が届く範囲 (光円錐) だけを SIMULATION_GENERATIONS 世代シミュレーションする。
+        # 小さい盤面では盤面全体をビットボードで進めるのと同じ
+        evaluator = PlacementEvaluator(self.field, protocol.SIMULATION_GENERATIONS)
 
-                    # SIMULATION_GENERATIONS 世代シミュレーション
-                    for _ in range(protocol.SIMULATION_GENERATIONS):
-                        temp_field.next_generation()
-                    
-                    current_my_cells = temp_field.count(self.player_id)
-                    current_opponent_cells = temp_field.count(other_player_id)
+        # 全ての空いている位置を試す (対称な手は行優先で最初のものだけ)
+        for y, x in unique_moves(self.field):
+            counts = evaluator.evaluate(self.player_id, (y, x))
+            current_my_cells = counts[self.player_id]
+            current_opponent_cells = counts[other_player_id]
 
-                    # 最も良い配置を更新 (自分のセル数 - 相手のセル数 の差分を最大化)
-                    current_score = current_my_cells - current_opponent_cells
-                    if current_score > max_score:
-                        max_score = current_score
-                        best_pos = (y, x)
+            # 最も良い配置を更新 (自分のセル数 - 相手のセル数 の差分を最大化)
+            current_score = current_my_cells - current_opponent_cells
+            if current_score > max_score:
+                max_score = current_score
+                best_pos = (y, x)
         
         # 最適な位置が見つからなかった場合（全てのセルが埋まっているなど）のフォールバック
         if best_pos is None:
@@ -64,8 +59,8 @@ class GreedPlayer(LifePlayer):
 
         return best_pos
 
-def main(host, port , seed=0): 
-    player = GreedPlayer()
+def main(host, port , seed=0, book=None): 
+    player = GreedPlayer(opening_book=book)
     play_game(host, port, player) 
 
 if __name__ == '__main__': 
@@ -90,6 +85,10 @@ if __name__ == '__main__':
         default=0,
         help="Random seed for reproducibility"
     )
+    parser.add_argument(
+        "--book",
+        help="Opening book file built by build_opening_book.py"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -101,5 +100,5 @@ if __name__ == '__main__':
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format=FORMAT, level=level, force=True)
 
-    main(args.host, args.port, args.seed)
+    main(args.host, args.port, args.seed, args.book)
     
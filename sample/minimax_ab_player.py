@@ -1,9 +1,8 @@
-import copy
 import sys 
 import os 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from lifegame_py import LifePlayer, play_game, protocol, LifeField
+from lifegame_py import LifePlayer, play_game, protocol, LifeField, SimulationCache, unique_moves
 import logging
 
 class MinimaxABPlayer(LifePlayer):
@@ -12,9 +11,13 @@ class MinimaxABPlayer(LifePlayer):
     行動規則：
     ・N世代先読み（アルファベータ法）
     ・「自分のセル数 - 相手のセル数」の差分を最大化
+    ・評価済みの盤面はZobristハッシュで引ける置換表に保存し、兄弟ノードや次の手番で再利用する
+    ・探索中は1つの盤面に push_place / pop で手を打ち戻しし、ノードごとに盤面を確保しない
+    ・盤面の回転・反転で互いに移り合う手は同じ評価値になるので、1 つだけ探索する
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache_bytes=64 * 1024 * 1024, opening_book=None):
+        super().__init__(opening_book)
+        self.cache = SimulationCache(max_bytes=cache_bytes)
     
     def name(self): 
         return 'minimax-lifegame-player-ab'
@@ -30,14 +33,11 @@ class MinimaxABPlayer(LifePlayer):
         """
         other_player_id = protocol.PLAYER1 if player_id == protocol.PLAYER2 else protocol.PLAYER2
         
-        # SIMULATION_GENERATIONS 世代シミュレーション
-        temp_field = LifeField(width=field.width, height=field.height)
-        temp_field.cells = copy.deepcopy(field.cells)
-        for _ in range(protocol.SIMULATION_GENERATIONS):
-            temp_field.next_generation()
+        # SIMULATION_GENERATIONS 世代シミュレーション (置換表にあれば再利用)
+        counts = self.cache.simulate(field, protocol.SIMULATION_GENERATIONS).counts
         
-        my_cells = temp_field.count(player_id)
-        opponent_cells = temp_field.count(other_player_id)
+        my_cells = counts[player_id]
+        opponent_cells = counts[other_player_id]
         
         return float(my_cells - opponent_cells)
 
@@ -52,12 +52,8 @@ class MinimaxABPlayer(LifePlayer):
         # 現在の手番のプレイヤーIDを決定
         current_player_id = self.player_id if is_maximizing_player else (protocol.PLAYER1 if self.player_id == protocol.PLAYER2 else protocol.PLAYER2)
         
-        # 配置可能な手を生成
-        available_moves = []
-        for y in range(field.height):
-            for x in range(field.width):
-                if field.cells[y][x] == protocol.DEAD:
-                    available_moves.append((y, x))
+        # 配置可能な手を生成 (対称な手は 1 つにまとめる)
+        available_moves = unique_moves(field)
         
         # 配置可能な手がない場合（ゲーム終了とみなす）
         if not available_moves:
@@ -66,11 +62,10 @@ class MinimaxABPlayer(LifePlayer):
         if is_maximizing_player: # 最大化プレイヤーの番
             max_eval = -float('inf')
             for move_y, move_x in available_moves:
-                new_field = LifeField(width=field.width, height=field.height)
-                new_field.cells = copy.deepcopy(field.cells)
-                new_field.cells[move_y][move_x] = current_player_id
+                field.push_place(current_player_id, (move_y, move_x))
+                eval = self._minimax(field, depth - 1, False, alpha, beta)
+                field.pop()
                 
-                eval = self._minimax(new_field, depth - 1, False, alpha, beta)
                 max_eval = max(max_eval, eval)
                 alpha = max(alpha, eval)
                 if beta <= alpha: # Beta cutoff
@@ -79,11 +74,10 @@ class MinimaxABPlayer(LifePlayer):
         else: # 最小化プレイヤーの番
             min_eval = float('inf')
             for move_y, move_x in available_moves:
-                new_field = LifeField(width=field.width, height=field.height)
-                new_field.cells = copy.deepcopy(field.cells)
-                new_field.cells[move_y][move_x] = current_player_id
+                field.push_place(current_player_id, (move_y, move_x))
+                eval = self._minimax(field, depth - 1, True, alpha, beta)
+                field.pop()
                 
-                eval = self._minimax(new_field, depth - 1, True, alpha, beta)
                 min_eval = min(min_eval, eval)
                 beta = min(beta, eval)
                 if beta <= alpha: # Alpha cutoff
@@ -98,30 +92,29 @@ class MinimaxABPlayer(LifePlayer):
         best_pos = None
         max_score = -float('inf')
 
-        # 全ての空いている位置を試す (自分の手)
-        available_moves_for_root = []
-        for y in range(self.field.height):
-            for x in range(self.field.width):
-                if self.field.cells[y][x] == protocol.DEAD:
-                    available_moves_for_root.append((y, x))
+        # 全ての空いている位置を試す (自分の手、対称な手は行優先で最初のものだけ)
+        available_moves_for_root = unique_moves(self.field)
         
         if not available_moves_for_root:
             raise RuntimeError("No empty positions available")
 
+        # 探索用の盤面 (手は push_place で打ち、pop で戻す)
+        temp_field = self.field.clone()
         for my_y, my_x in available_moves_for_root:
-            temp_field = LifeField(width=self.field.width, height=self.field.height)
-            temp_field.cells = copy.deepcopy(self.field.cells)
-            temp_field.cells[my_y][my_x] = self.player_id
+            temp_field.push_place(self.player_id, (my_y, my_x))
 
             # ミニマックス探索を呼び出す
             # 自分の手なので、次は相手の番 (is_maximizing_player=False)
             # SEARCH_DEPTH - 1 は、現在の手を除いた残りの探索深さ
             score = self._minimax(temp_field, SEARCH_DEPTH - 1, False, -float('inf'), float('inf'))
+            temp_field.pop()
 
             if score > max_score:
                 max_score = score
                 best_pos = (my_y, my_x)
         
+        logging.debug(f'simulation cache: {self.cache.cache_info()}')
+        
         # 最適な位置が見つからなかった場合（全てのセルが埋まっているなど）のフォールバック
         if best_pos is None:
             # 念のため、空いている最初のセルを返す
@@ -133,8 +126,8 @@ class MinimaxABPlayer(LifePlayer):
 
         return best_pos
 
-def main(host, port , seed=0): 
-    player = MinimaxABPlayer()
+def main(host, port , seed=0, book=None): 
+    player = MinimaxABPlayer(opening_book=book)
     play_game(host, port, player) 
 
 if __name__ == '__main__': 
@@ -159,6 +152,10 @@ if __name__ == '__main__':
         default=0,
         help="Random seed for reproducibility"
     )
+    parser.add_argument(
+        "--book",
+        help="Opening book file built by build_opening_book.py"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -170,5 +167,5 @@ if __name__ == '__main__':
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format=FORMAT, level=level, force=True)
 
-    main(args.host, args.port, args.seed)
+    main(args.host, args.port, args.seed, args.book)
     
@@ -1,9 +1,8 @@
-import copy
 import sys 
 import os 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from lifegame_py import LifePlayer, play_game, protocol, LifeField
+from lifegame_py import LifePlayer, play_game, protocol
 import logging
 
 class MinimaxPlayer(LifePlayer):
@@ -17,8 +16,8 @@ class MinimaxPlayer(LifePlayer):
         ・相手の最適な手までシミュレートした後、さらにSIMULATION_GENERATIONS（プロトコルで定義された世代数）分、ライフゲームのシミュレーションを進める。
         ・最終的な盤面で「自分のセル数 - 相手のセル数」を計算する。
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, opening_book=None):
+        super().__init__(opening_book)
     
     def name(self): 
         return 'minimax-lifegame-player'
@@ -42,62 +41,55 @@ class MinimaxPlayer(LifePlayer):
 
         other_player_id = protocol.PLAYER1 if self.player_id == protocol.PLAYER2 else protocol.PLAYER2
 
+        # 探索用の盤面。手は push_place で仮に置き、pop で戻す
+        temp_field = self.field.clone()
+
         # 全ての空いている位置を試す (自分の手)
         for my_y in range(self.field.height):
             for my_x in range(self.field.width):
                 if self.field.cells[my_y][my_x] == protocol.DEAD:
-                    # --- 1. 自分のセルを仮に配置した後のボードを作成 ---
-                    temp_field_after_my_move = LifeField(width=self.field.width, height=self.field.height)
-                    temp_field_after_my_move.cells = copy.deepcopy(self.field.cells)
-                    temp_field_after_my_move.cells[my_y][my_x] = self.player_id
+                    # --- 1. 自分のセルを仮に配置 ---
+                    temp_field.push_place(self.player_id, (my_y, my_x))
 
                     # --- 2. 相手の最適な応答をシミュレート ---
                     # 相手も自分のスコア（相手のセル数 - 自分のセル数）を最大化しようとすると仮定する。
                     # これは、私のスコア（自分のセル数 - 相手のセル数）を最小化する手となる。
                     
-                    best_opponent_response_field = None
                     min_my_score_after_opponent_move = float('inf') # 相手が選ぶ手によって、私のスコアが最小になる値
 
                     opponent_possible_moves_found = False
-                    for opp_y in range(temp_field_after_my_move.height):
-                        for opp_x in range(temp_field_after_my_move.width):
-                            if temp_field_after_my_move.cells[opp_y][opp_x] == protocol.DEAD:
+                    for opp_y in range(temp_field.height):
+                        for opp_x in range(temp_field.width):
+                            if temp_field.cells[opp_y][opp_x] == protocol.DEAD:
                                 opponent_possible_moves_found = True
                                 
-                                temp_field_after_opponent_move = LifeField(width=self.field.width, height=self.field.height)
-                                temp_field_after_opponent_move.cells = copy.deepcopy(temp_field_after_my_move.cells)
-                                temp_field_after_opponent_move.cells[opp_y][opp_x] = other_player_id
+                                temp_field.push_place(other_player_id, (opp_y, opp_x))
 
-                                # SIMULATION_GENERATIONS 世代シミュレーション 
-                                for _ in range(protocol.SIMULATION_GENERATIONS):
-                                    temp_field_after_opponent_move.next_generation()
+                                # SIMULATION_GENERATIONS 世代シミュレーション (盤面は作業領域で進め、配置フェーズの盤面は壊さない)
+                                simulated = temp_field.simulate(protocol.SIMULATION_GENERATIONS)
+                                temp_field.pop()
                                 
                                 # 相手の視点でのスコアを評価 (相手のセル数 - 自分のセル数)
-                                current_my_cells_after_sim = temp_field_after_opponent_move.count(self.player_id)
-                                current_opponent_cells_after_sim = temp_field_after_opponent_move.count(other_player_id)
+                                current_my_cells_after_sim = simulated.count(self.player_id)
+                                current_opponent_cells_after_sim = simulated.count(other_player_id)
                                 
                                 # 相手は自分のスコアを最大化する
                                 my_score_if_opponent_chooses_this = current_my_cells_after_sim - current_opponent_cells_after_sim
 
                                 if my_score_if_opponent_chooses_this < min_my_score_after_opponent_move:
                                     min_my_score_after_opponent_move = my_score_if_opponent_chooses_this
-                                    best_opponent_response_field = temp_field_after_opponent_move # 相手が選んだ後のボード
 
                     # --- 3. 相手が最適な応答をした後のボードで最終評価 --- 
                     # 相手がセルを配置する場所が見つからなかった場合（ボードが満杯など）の考慮
                     if not opponent_possible_moves_found:
                         # 相手が配置できない場合、自分の配置後のボードで評価
-                        final_field_for_evaluation = temp_field_after_my_move
                         # ただし、この場合も SIMULATION_GENERATIONS を実行する必要がある
-                        for _ in range(protocol.SIMULATION_GENERATIONS):
-                            final_field_for_evaluation.next_generation()
+                        simulated = temp_field.simulate(protocol.SIMULATION_GENERATIONS)
+                        current_score = simulated.count(self.player_id) - simulated.count(other_player_id)
                     else:
-                        final_field_for_evaluation = best_opponent_response_field
-
-                    current_my_cells = final_field_for_evaluation.count(self.player_id)
-                    current_opponent_cells = final_field_for_evaluation.count(other_player_id)
+                        current_score = min_my_score_after_opponent_move
 
-                    current_score = current_my_cells - current_opponent_cells
+                    temp_field.pop()
                     if current_score > max_score:
                         max_score = current_score
                         best_pos = (my_y, my_x)
@@ -113,8 +105,8 @@ class MinimaxPlayer(LifePlayer):
 
         return best_pos
 
-def main(host, port , seed=0): 
-    player = MinimaxPlayer()
+def main(host, port , seed=0, book=None): 
+    player = MinimaxPlayer(opening_book=book)
     play_game(host, port, player) 
 
 if __name__ == '__main__': 
@@ -139,6 +131,10 @@ if __name__ == '__main__':
         default=0,
         help="Random seed for reproducibility"
     )
+    parser.add_argument(
+        "--book",
+        help="Opening book file built by build_opening_book.py"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -150,5 +146,5 @@ if __name__ == '__main__':
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format=FORMAT, level=level, force=True)
 
-    main(args.host, args.port, args.seed)
+    main(args.host, args.port, args.seed, args.book)
     
@@ -1,10 +1,9 @@
-import copy
 import random
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from lifegame_py import LifePlayer, play_game, protocol, LifeField
+from lifegame_py import LifePlayer, play_game, protocol, BitboardField, compile_rule
 import logging
 
 # モンテカルロ探索の試行回数
@@ -17,8 +16,8 @@ class MonteCarloPlayer(LifePlayer):
     ・各合法手について、ランダムにゲームを最後までシミュレーション（プレイアウト）する。
     ・これを指定回数繰り返し、最も勝率の高かった手を選ぶ。
     """
-    def __init__(self, seed=0):
-        super().__init__()
+    def __init__(self, seed=0, opening_book=None):
+        super().__init__(opening_book)
         self.rng = random.Random(seed or None)
 
     def name(self):
@@ -37,13 +36,19 @@ class MonteCarloPlayer(LifePlayer):
         best_move = None
         max_wins = -1
 
+        # 盤面をビットボードに変換しておき、試行ごとのコピーは整数 2 つで済ませる
+        # (ビットボードは標準ルールしか計算できないので、それ以外は LifeField のまま)
+        if self.field.rule == compile_rule():
+            base_field = BitboardField.from_field(self.field)
+        else:
+            base_field = self.field.clone()
+
         # 各合法手についてプレイアウトを実行
         for move in legal_moves:
             current_wins = 0
             for _ in range(PLAYOUT_COUNT):
                 # 現在の盤面をコピーして、試行用の盤面を作成
-                temp_field = LifeField(width=self.field.width, height=self.field.height)
-                temp_field.cells = copy.deepcopy(self.field.cells)
+                temp_field = base_field.clone()
 
                 # 最初に試す手を打つ
                 temp_field.place(self.player_id, move)
@@ -60,7 +65,7 @@ class MonteCarloPlayer(LifePlayer):
 
         return best_move if best_move is not None else legal_moves[0]
 
-    def _playout(self, field: LifeField) -> int:
+    def _playout(self, field) -> int:
         """
         現在の盤面状態から、ゲーム終了までランダムに手を打ち続け、勝者を返す。
         """
@@ -77,9 +82,10 @@ class MonteCarloPlayer(LifePlayer):
 
         # 3. 配置可能な空きマスをリストアップ
         empty_cells = []
+        board = field.get_board_state()
         for r in range(field.height):
             for c in range(field.width):
-                if field.cells[r][c] == protocol.DEAD:
+                if board[r][c] == protocol.DEAD:
                     empty_cells.append((r, c))
         
         self.rng.shuffle(empty_cells)
@@ -94,9 +100,8 @@ class MonteCarloPlayer(LifePlayer):
             # プレイヤーを交代
             turn_player_id = protocol.PLAYER1 if turn_player_id == protocol.PLAYER2 else protocol.PLAYER2
 
-        # 5世代シミュレーション
-        for _ in range(protocol.SIMULATION_GENERATIONS):
-            field.next_generation()
+        # 5世代シミュレーション (周期に入ったら打ち切る)
+        field.advance(protocol.SIMULATION_GENERATIONS)
 
         # 勝敗判定
         p1_count = field.count(protocol.PLAYER1)
@@ -110,8 +115,8 @@ class MonteCarloPlayer(LifePlayer):
             # 引き分けは先攻(P1)の勝ち
             return protocol.PLAYER1
 
-def main(host, port, seed=0):
-    player = MonteCarloPlayer(seed)
+def main(host, port, seed=0, book=None):
+    player = MonteCarloPlayer(seed, opening_book=book)
     play_game(host, port, player)
 
 if __name__ == '__main__':
@@ -134,6 +139,10 @@ if __name__ == '__main__':
         "--seed", type=int, default=0,
         help="Random seed of the player (0 for urandom)",
     )
+    parser.add_argument(
+        "--book",
+        help="Opening book file built by build_opening_book.py"
+    )
     parser.add_argument(
         "--verbose", action='store_true',
         help="verbose output",
@@ -144,4 +153,4 @@ if __name__ == '__main__':
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format=FORMAT, level=level, force=True)
 
-    main(args.host, args.port, seed=args.seed)
+    main(args.host, args.port, seed=args.seed, book=args.book)
@@ -21,6 +21,34 @@ if __name__ == '__main__':
         "port", type=int,
         help="port number to listen, e.g., 2000",
     )
+    parser.add_argument(
+        "--backend", choices=lifegame_py.backend.backends(),
+        help="field engine (default: $LIFEGAME_BACKEND or reference)",
+    )
+    parser.add_argument(
+        "--rule", default=lifegame_py.protocol.RULE,
+        help="rule of the simulation, e.g. 'B36/S23, tie=player1' (needs the reference backend)",
+    )
+    parser.add_argument(
+        "--concurrent", action='store_true',
+        help="keep listening and play many matches at once (asyncio server)",
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help="run the concurrent server in this many processes sharing the port (0: one per core)",
+    )
+    parser.add_argument(
+        "--move-timeout", type=float,
+        help="with --concurrent or --workers, seconds a player may think before losing",
+    )
+    parser.add_argument(
+        "--max-games", type=int,
+        help="with --concurrent, stop after this many matches",
+    )
+    parser.add_argument(
+        "--headless", action='store_true',
+        help="do not render boards (the concurrent servers never render them)",
+    )
     parser.add_argument(
         "--verbose", action='store_true',
         help="show messages received from or sent to clients",
@@ -31,4 +59,12 @@ if __name__ == '__main__':
     log_level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format=FORMAT, level=log_level, force=True)
     
-    lifegame_py.server_main(args.host, args.port)
\ No newline at end of file
+    if args.workers is not None:
+        lifegame_py.sharded_server_main(args.host, args.port, workers=args.workers, backend=args.backend,
+                                        rule=args.rule, move_timeout=args.move_timeout)
+    elif args.concurrent:
+        lifegame_py.async_server_main(args.host, args.port, backend=args.backend, rule=args.rule,
+                                      move_timeout=args.move_timeout, max_games=args.max_games)
+    else:
+        lifegame_py.server_main(args.host, args.port, backend=args.backend, rule=args.rule,
+                                headless=args.headless)
\ No newline at end of file
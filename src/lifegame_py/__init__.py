@@ -1,16 +1,53 @@
 from .field import LifeField
+from .vectorized import NumpyLifeField, simulate_batch, placement_boards
+from .bitboard import BitboardField
+from .tiled import ActiveTileField
+from .hashlife import HashlifeField
+from .lut import LutLifeField
+from .sparse import SparseLifeField
+from .parallel import ParallelLifeField
+from .backend import FieldBackend, register_backend, get_backend, create_field
+from .rule import Rule, compile_rule
+from .symmetry import canonical_form, unique_moves
+from .cache import SimulationCache, SimulationResult
 from .player_base import LifePlayer, play_game
 from .server import LifeClient, LifeGameControl, server_main
-from .display import make_view, print_board
+from .async_server import AsyncLifeServer, async_server_main
+from .sharded import ShardedServer, sharded_server_main
+from .display import BoardObserver, make_view, print_board
 from . import protocol
 
 __all__ = [
     'LifeField',
+    'NumpyLifeField',
+    'simulate_batch',
+    'placement_boards',
+    'BitboardField',
+    'ActiveTileField',
+    'HashlifeField',
+    'LutLifeField',
+    'SparseLifeField',
+    'ParallelLifeField',
+    'FieldBackend',
+    'register_backend',
+    'get_backend',
+    'create_field',
+    'Rule',
+    'compile_rule',
+    'canonical_form',
+    'unique_moves',
+    'SimulationCache',
+    'SimulationResult',
     'LifePlayer',
     'play_game',
     'LifeClient',
     'LifeGameControl',
     'server_main',
+    'AsyncLifeServer',
+    'async_server_main',
+    'ShardedServer',
+    'sharded_server_main',
+    'BoardObserver',
     'make_view',
     'print_board',
     'protocol'
@@ -0,0 +1,271 @@
+"""Game server running many matches concurrently on one asyncio event loop.
+
+Unlike ``server_main``, which plays a single game and exits, the server
+keeps listening: each client gets the greeting and the field information
+as soon as it has sent its name, waits for the next client, and the two
+play a match (the first to connect is PLAYER1).  Matches use the same
+line protocol and a fresh ``LifeGameControl`` each.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+import asyncio
+import json
+import logging
+import sys
+import time
+from . import protocol
+from .backend import create_field
+from .server import LifeClient, LifeGameControl, field_info, parse_name, send_result
+from . import wire
+
+
+class AsyncLifeClient(LifeClient):
+    """``LifeClient`` talking through asyncio streams."""
+    def __init__(self, client_id: int, name: str,
+                 reader: asyncio.StreamReader, writer: asyncio.StreamWriter, options: Iterable[str] = ()):
+        super().__init__(client_id, name, writer, options)
+        self.reader = reader
+
+    def write(self, data: Union[str, bytes]) -> None:
+        # 書き込みはバッファに溜めるだけで、送るのはサーバの drain
+        if isinstance(data, bytes):
+            self.sockfile.write(data)
+        else:
+            self.sockfile.write(data.encode() + b'\n')
+
+    async def read_placement(self) -> Optional[Tuple[int, int]]:
+        if self.binary:
+            payload = await wire.read_frame_async(self.reader)
+            return None if payload is None else wire.decode_placement(payload)
+        line = (await self.reader.readline()).decode().rstrip()
+        if not line:
+            return None
+        return tuple(json.loads(line)["place"])
+
+
+class ServerStats:
+    """Counters of an ``AsyncLifeServer``.
+
+    ``move_seconds`` adds up, per accepted placement, the time from
+    receiving it to having sent the result to both players.
+    """
+    def __init__(self):
+        self.started = time.monotonic()
+        self.connections = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.moves = 0
+        self.move_seconds = 0.0
+        self.max_move_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "connections": self.connections,
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "games_in_progress": self.games_started - self.games_finished,
+            "games_per_second": self.games_finished / elapsed if elapsed else 0.0,
+            "moves": self.moves,
+            "mean_move_ms": 1000 * self.move_seconds / self.moves if self.moves else 0.0,
+            "max_move_ms": 1000 * self.max_move_seconds,
+        }
+
+
+class AsyncLifeServer:
+    """Pairs incoming clients and plays their matches concurrently.
+
+    ``backend`` and ``rule`` are passed on to every match.  A player who
+    does not answer within ``move_timeout`` seconds, disconnects or sends
+    an invalid placement loses.  After ``max_games`` matches have
+    finished, ``serve()`` returns.
+    """
+    def __init__(self, backend: Optional[str] = None, rule: Optional[str] = None,
+                 move_timeout: Optional[float] = None, max_games: Optional[int] = None):
+        self.backend = backend
+        self.rule = rule
+        self.move_timeout = move_timeout
+        self.max_games = max_games
+        self.stats = ServerStats()
+        # ゲームごとに同じ内容なので、オプションの組ごとに一度だけ作る
+        self._field_infos: Dict[FrozenSet[str], str] = {}
+        self._field_info(frozenset())  # backend や rule の誤りはここで分かる
+        self._waiting: Optional[Tuple[str, asyncio.StreamReader, asyncio.StreamWriter, FrozenSet[str]]] = None
+        self._games = set()
+        self._done: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def _new_game(self) -> LifeGameControl:
+        return LifeGameControl(create_field(backend=self.backend), self.rule)
+
+    def _field_info(self, options: FrozenSet[str]) -> str:
+        info = self._field_infos.get(options)
+        if info is None:
+            info = self._field_infos[options] = field_info(self._new_game(), options)
+        return info
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        addr = writer.get_extra_info('peername')
+        try:
+            writer.write(protocol.greeting.encode() + b'\n')
+            line = (await asyncio.wait_for(reader.readline(), self.move_timeout)).decode().rstrip()
+            if not line:
+                raise ConnectionError('closed before sending a name')
+            name, options = parse_name(line)
+            writer.write(self._field_info(options).encode() + b'\n')
+            await writer.drain()
+            # バイナリにするクライアントは、ack を送ってからフレームに切り替える
+            if protocol.option_binary in options:
+                if not wire.is_ack(await asyncio.wait_for(wire.read_frame_async(reader), self.move_timeout)):
+                    raise ConnectionError('no ack of the binary protocol')
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            logging.info(f'Client {addr} dropped during the greeting: {e!r}')
+            writer.close()
+            return
+        logging.info(f'Client {addr} name: {name}')
+        self.add_waiting(name, reader, writer, options)
+
+    def add_waiting(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    options: FrozenSet[str] = frozenset()) -> None:
+        """Pair a client that has received the field information, or let it wait for the next one."""
+        # 先に待っていたクライアントと組ませる。いなければ次の接続を待つ
+        if self._waiting is None or self._waiting[1].at_eof() or self._waiting[2].is_closing():
+            self._waiting = (name, reader, writer, options)
+            return
+        first, self._waiting = self._waiting, None
+        clients = [AsyncLifeClient(0, *first), AsyncLifeClient(1, name, reader, writer, options)]
+        game = asyncio.ensure_future(self.play(clients))
+        self._games.add(game)
+        game.add_done_callback(self._games.discard)
+
+    async def _drain(self, clients: List[AsyncLifeClient]) -> None:
+        for client in clients:
+            await client.sockfile.drain()
+
+    async def _broadcast(self, clients: List[AsyncLifeClient], result: dict, field) -> None:
+        send_result(clients, result, field)
+        await self._drain(clients)
+
+    async def play(self, clients: List[AsyncLifeClient]) -> Optional[int]:
+        """Play one match; returns the index of the winner, -1 on a draw, None if aborted."""
+        self.stats.games_started += 1
+        game_control = self._new_game()
+        for client in clients:
+            game_control.add_client(client)
+        logging.info(f'Game started: {clients[0].name} vs {clients[1].name}')
+        try:
+            winner = await self._play(game_control, clients)
+            logging.info(f'Game finished: {clients[0].name} vs {clients[1].name}, winner {winner}')
+            return winner
+        except OSError as e:
+            logging.info(f'Game aborted: {clients[0].name} vs {clients[1].name}: {e!r}')
+            return None
+        except Exception:
+            # 1 つのゲームの不具合で他のゲームを止めない
+            logging.exception(f'Game failed: {clients[0].name} vs {clients[1].name}')
+            return None
+        finally:
+            for client in clients:
+                client.sockfile.close()
+            self.stats.games_finished += 1
+            if (self._done is not None and self.max_games is not None
+                    and self.stats.games_finished >= self.max_games):
+                self._done.set()
+
+    async def _play(self, game_control: LifeGameControl, clients: List[AsyncLifeClient]) -> int:
+        # Placement phase
+        board = not game_control.sends_delta()
+        while not game_control.is_placement_complete():
+            current_client = clients[game_control.current_player]
+            waiting_client = clients[1 - game_control.current_player]
+            current_client.send_status(protocol.placement)
+            waiting_client.send_status(protocol.waiting)
+            await self._drain(clients)
+
+            result = False
+            try:
+                position = await asyncio.wait_for(current_client.read_placement(), self.move_timeout)
+                started = time.perf_counter()
+                if position is None:
+                    logging.error(f'Client {current_client.name} disconnected')
+                else:
+                    result = game_control.place_cell(current_client.id, position, board)
+            except asyncio.TimeoutError:
+                logging.error(f'Client {current_client.name} did not answer in {self.move_timeout}s')
+            except (json.JSONDecodeError, KeyError, ValueError, TypeError, UnicodeDecodeError) as e:
+                logging.error(f'Invalid placement from client {current_client.name}: {e}')
+            if result is False:
+                current_client.send_status(protocol.you_lose)
+                waiting_client.send_status(protocol.you_win)
+                await self._drain(clients)
+                return waiting_client.id
+
+            await self._broadcast(clients, result, game_control.field)
+            elapsed = time.perf_counter() - started
+            self.stats.moves += 1
+            self.stats.move_seconds += elapsed
+            self.stats.max_move_seconds = max(self.stats.max_move_seconds, elapsed)
+
+        # Simulation phase
+        for client in clients:
+            client.send_status(protocol.simulation)
+        result = game_control.run_simulation()
+        await self._broadcast(clients, result, game_control.field)
+
+        # Determine and announce winner
+        winner = game_control.get_winner()
+        if winner == -1:
+            for client in clients:
+                client.send_status(protocol.draw)
+        else:
+            clients[winner].send_status(protocol.you_win)
+            clients[1 - winner].send_status(protocol.you_lose)
+        await self._drain(clients)
+        return winner
+
+    def stop(self) -> None:
+        """Make ``serve()`` return once the matches in progress have finished.
+
+        Called before ``serve()``, it makes ``serve()`` return right after
+        it starts listening.
+        """
+        self._stopping = True
+        if self._done is not None:
+            self._done.set()
+
+    async def serve(self, host: str, port: int, ready: Optional[asyncio.Future] = None,
+                    reuse_port: bool = False) -> None:
+        """Accept clients until ``max_games`` matches have finished (forever if None).
+
+        ``ready``, if given, receives the bound (host, port) once listening.
+        """
+        self._done = asyncio.Event()
+        if self._stopping:
+            self._done.set()
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024,
+                                            reuse_port=reuse_port)
+        async with server:
+            address = server.sockets[0].getsockname()[:2]
+            logging.info(f'Lifegame server listening on {address[0]}:{address[1]}')
+            if ready is not None:
+                ready.set_result(address)
+            await self._done.wait()
+            # 新しい接続は受け付けず、進行中のゲームを終わらせてから閉じる
+            server.close()
+            if self._waiting is not None:
+                self._waiting[2].close()
+                self._waiting = None
+            if self._games:
+                await asyncio.gather(*self._games, return_exceptions=True)
+        logging.info(f'Server stats: {self.stats.as_dict()}')
+
+
+def async_server_main(host: str, port: int, backend: Optional[str] = None, rule: Optional[str] = None,
+                      move_timeout: Optional[float] = None, max_games: Optional[int] = None) -> None:
+    server = AsyncLifeServer(backend, rule, move_timeout, max_games)
+    print(f'Lifegame server listening on {host}:{port}')
+    sys.stdout.flush()
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        logging.info(f'Server stats: {server.stats.as_dict()}')
@@ -0,0 +1,172 @@
+"""Field engines behind one interface, selectable by name.
+
+Every engine derives from ``FieldBackend`` and is registered under a
+short name.  ``create_field`` / ``field_from_board`` build a field of
+the backend named by their ``backend`` argument, else by the
+``LIFEGAME_BACKEND`` environment variable, else ``'reference'``
+(``LifeField``), so a deployment can switch engines without code
+changes.  ``benchmarks/bench_next_generation.py`` times every available
+backend on the machine at hand.
+"""
+from typing import Dict, List, Optional, Tuple, Type
+import abc
+import os
+import zlib
+from . import protocol
+
+
+ENV_VAR = 'LIFEGAME_BACKEND'
+DEFAULT_BACKEND = 'reference'
+
+
+class FieldBackend(abc.ABC):
+    """Interface of a field engine.
+
+    Subclasses provide ``from_board``, ``place``, ``count``,
+    ``next_generation`` and ``get_board_state``; ``advance``,
+    ``snapshot``, ``checksum`` and the conversions have generic
+    implementations on top of them.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """False when an optional dependency of the engine is missing."""
+        return True
+
+    @classmethod
+    @abc.abstractmethod
+    def from_board(cls, board: List[List[int]]) -> 'FieldBackend':
+        pass
+
+    @classmethod
+    def from_field(cls, field, **kwargs) -> 'FieldBackend':
+        """Field of this engine holding the board of any engine's ``field``.
+
+        ``kwargs`` go to ``from_board`` (e.g. ``tile_size`` or ``workers``).
+        """
+        return cls.from_board(field.get_board_state(), **kwargs)
+
+    def to_field(self):
+        from .field import LifeField
+        return LifeField.from_board(self.get_board_state())
+
+    @abc.abstractmethod
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        """Put ``owner`` on the dead cell ``pos``; False if it is taken or off the board.
+
+        ``owner`` must be DEAD, PLAYER1 or PLAYER2 (``ValueError`` otherwise).
+        """
+
+    @abc.abstractmethod
+    def count(self, owner: int) -> int:
+        """Number of cells owned by ``owner``; 0 for owners other than DEAD, PLAYER1 and PLAYER2."""
+
+    @staticmethod
+    def _check_owner(owner: int) -> None:
+        if not protocol.DEAD <= owner <= protocol.PLAYER2:
+            raise ValueError(f"invalid owner {owner!r}")
+
+    @abc.abstractmethod
+    def next_generation(self) -> None:
+        pass
+
+    def advance(self, generations: int) -> Optional[int]:
+        """Advance ``generations`` generations.
+
+        Engines that detect cycles return the period found (0 if none);
+        this generic version steps one generation at a time and returns None.
+        """
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        for _ in range(generations):
+            self.next_generation()
+        return None
+
+    @abc.abstractmethod
+    def get_board_state(self) -> List[List[int]]:
+        pass
+
+    def snapshot(self) -> bytes:
+        """Row-major copy of the board (cell (y, x) at y * width + x)."""
+        return bytes(cell for row in self.get_board_state() for cell in row)
+
+    def checksum(self) -> int:
+        """crc32 of ``snapshot()``; equal on every engine for the same board."""
+        return zlib.crc32(self.snapshot())
+
+
+_BACKENDS: Dict[str, Type[FieldBackend]] = {}
+_builtin_loaded = False
+
+
+def register_backend(name: str, cls: Type[FieldBackend]) -> None:
+    """Make ``cls`` selectable as ``name``; replaces an earlier registration."""
+    if not (isinstance(cls, type) and issubclass(cls, FieldBackend)):
+        raise TypeError(f"{cls!r} is not a FieldBackend subclass")
+    _BACKENDS[name] = cls
+
+
+def backends() -> List[str]:
+    """Names of all registered backends."""
+    _load_builtin()
+    return list(_BACKENDS)
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends usable in this environment."""
+    _load_builtin()
+    return [name for name, cls in _BACKENDS.items() if cls.is_available()]
+
+
+def get_backend(name: Optional[str] = None) -> Type[FieldBackend]:
+    """Backend class registered as ``name`` (default: ``$LIFEGAME_BACKEND`` or 'reference')."""
+    _load_builtin()
+    if name is None:
+        name = os.environ.get(ENV_VAR) or DEFAULT_BACKEND
+    try:
+        cls = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r}; choose from {', '.join(_BACKENDS)}") from None
+    if not cls.is_available():
+        raise ImportError(f"backend {name!r} needs numpy (pip install 'lifegame-py[numpy]')")
+    return cls
+
+
+def create_field(height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 backend: Optional[str] = None) -> FieldBackend:
+    """Empty field of the selected backend."""
+    return get_backend(backend)(height, width)
+
+
+def field_from_board(board: List[List[int]], backend: Optional[str] = None) -> FieldBackend:
+    """Field of the selected backend holding ``board``."""
+    return get_backend(backend).from_board(board)
+
+
+def _load_builtin() -> None:
+    global _builtin_loaded
+    if _builtin_loaded:
+        return
+    _builtin_loaded = True
+    # 循環 import を避けるため、各エンジンのモジュールは最初に使うときに読む
+    from .field import LifeField
+    from .vectorized import NumpyLifeField
+    from .bitboard import BitboardField
+    from .tiled import ActiveTileField
+    from .hashlife import HashlifeField
+    from .lut import LutLifeField
+    from .sparse import SparseLifeField
+    from .parallel import ParallelLifeField
+    for name, cls in [
+        ('reference', LifeField),
+        ('numpy', NumpyLifeField),
+        ('bitboard', BitboardField),
+        ('tiled', ActiveTileField),
+        ('hashlife', HashlifeField),
+        ('lut', LutLifeField),
+        ('sparse', SparseLifeField),
+        ('parallel', ParallelLifeField),
+    ]:
+        # 先に register_backend で登録されたものを優先する
+        _BACKENDS.setdefault(name, cls)
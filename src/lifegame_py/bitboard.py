@@ -0,0 +1,207 @@
+from typing import Dict, List, Tuple
+from . import protocol
+from .backend import FieldBackend
+
+
+# (height, width) -> (full, not_first_col, not_last_col)
+_MASKS: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+
+
+def _masks(height: int, width: int) -> Tuple[int, int, int]:
+    masks = _MASKS.get((height, width))
+    if masks is None:
+        full = (1 << (height * width)) - 1
+        first_col = 0
+        for y in range(height):
+            first_col |= 1 << (y * width)
+        last_col = first_col << (width - 1)
+        masks = (full, full & ~first_col, full & ~last_col)
+        _MASKS[(height, width)] = masks
+    return masks
+
+
+def _full_adder(a: int, b: int, c: int) -> Tuple[int, int]:
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+
+def _count_neighbors(m: int, width: int, full: int, not_first_col: int, not_last_col: int):
+    """Count the 8 neighbors of every bit of ``m``.
+
+    Returns (bit0, bit1, at_least_4) of the per-cell count.
+    """
+    west = (m << 1) & not_first_col
+    east = (m >> 1) & not_last_col
+    n0 = (m << width) & full
+    n1 = m >> width
+    n2 = west
+    n3 = east
+    n4 = (west << width) & full
+    n5 = west >> width
+    n6 = (east << width) & full
+    n7 = east >> width
+
+    # 全加算器の木で 8 本のビット列を足し合わせる
+    s_a, c_a = _full_adder(n0, n1, n2)
+    s_b, c_b = _full_adder(n3, n4, n5)
+    s_c, c_c = n6 ^ n7, n6 & n7
+    bit0, c_d = _full_adder(s_a, s_b, s_c)
+    t, c_e = _full_adder(c_a, c_b, c_c)
+    bit1, c_f = t ^ c_d, t & c_d
+    return bit0, bit1, c_e | c_f
+
+
+def _step(player1: int, player2: int, height: int, width: int) -> Tuple[int, int]:
+    full, not_first_col, not_last_col = _masks(height, width)
+    alive = player1 | player2
+
+    bit0, bit1, high = _count_neighbors(alive, width, full, not_first_col, not_last_col)
+    two_or_three = bit1 & ~high
+    survive = alive & two_or_three
+    born = two_or_three & bit0 & ~alive
+
+    # 誕生セルの近傍はちょうど 3 なので、PLAYER1 が 2 以上なら多数派
+    _, p1_bit1, p1_high = _count_neighbors(player1, width, full, not_first_col, not_last_col)
+    player1_major = p1_bit1 | p1_high
+
+    return ((player1 & survive) | (born & player1_major),
+            (player2 & survive) | (born & ~player1_major))
+
+
+class BitboardField(FieldBackend):
+    """Field packed into one integer bit mask per player.
+
+    Cell (y, x) is bit ``y * width + x``.  Copying a field costs two ints,
+    and a generation is a handful of bitwise operations on whole boards.
+    """
+    __slots__ = ('height', 'width', 'player1', 'player2')
+
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 player1: int = 0, player2: int = 0):
+        self.height = height
+        self.width = width
+        self.player1 = player1
+        self.player2 = player2
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> 'BitboardField':
+        field = cls(len(board), len(board[0]) if board else 0)
+        bit = 1
+        for row in board:
+            for cell in row:
+                if cell == protocol.PLAYER1:
+                    field.player1 |= bit
+                elif cell == protocol.PLAYER2:
+                    field.player2 |= bit
+                bit <<= 1
+        return field
+
+    def clone(self) -> 'BitboardField':
+        return BitboardField(self.height, self.width, self.player1, self.player2)
+
+    __copy__ = clone
+
+    def __deepcopy__(self, memo) -> 'BitboardField':
+        return self.clone()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitboardField):
+            return NotImplemented
+        return (self.height, self.width, self.player1, self.player2) == \
+            (other.height, other.width, other.player1, other.player2)
+
+    def __hash__(self) -> int:
+        return hash((self.height, self.width, self.player1, self.player2))
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def get(self, pos: Tuple[int, int]) -> int:
+        y, x = pos
+        bit = 1 << (y * self.width + x)
+        if self.player1 & bit:
+            return protocol.PLAYER1
+        if self.player2 & bit:
+            return protocol.PLAYER2
+        return protocol.DEAD
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        bit = 1 << (y * self.width + x)
+        if (self.player1 | self.player2) & bit:
+            return False
+        if owner == protocol.PLAYER1:
+            self.player1 |= bit
+        elif owner == protocol.PLAYER2:
+            self.player2 |= bit
+        return True
+
+    def window(self, top: int, left: int, bottom: int, right: int) -> 'BitboardField':
+        """Copy of the rows ``top:bottom`` and columns ``left:right``."""
+        width = right - left
+        mask = (1 << width) - 1
+        player1 = player2 = 0
+        shift = 0
+        for y in range(top, bottom):
+            offset = y * self.width + left
+            player1 |= ((self.player1 >> offset) & mask) << shift
+            player2 |= ((self.player2 >> offset) & mask) << shift
+            shift += width
+        return BitboardField(bottom - top, width, player1, player2)
+
+    def next_generation(self) -> None:
+        self.player1, self.player2 = _step(self.player1, self.player2, self.height, self.width)
+
+    def advance(self, generations: int) -> int:
+        """Advance by ``generations`` generations, skipping ahead on a cycle.
+
+        Same contract as ``LifeField.advance``: returns the period of the
+        cycle the board reached, or 0.
+        """
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        height, width = self.height, self.width
+        state = (self.player1, self.player2)
+        seen = {state: 0}
+        history = [state]
+        for generation in range(1, generations + 1):
+            state = _step(*state, height, width)
+            first = seen.get(state)
+            if first is not None:
+                period = generation - first
+                state = history[first + (generations - generation) % period]
+                break
+            seen[state] = generation
+            history.append(state)
+        else:
+            period = 0
+        self.player1, self.player2 = state
+        return period
+
+    def count(self, owner: int) -> int:
+        if owner == protocol.PLAYER1:
+            return self.player1.bit_count()
+        if owner == protocol.PLAYER2:
+            return self.player2.bit_count()
+        if owner == protocol.DEAD:
+            return self.height * self.width - (self.player1 | self.player2).bit_count()
+        return 0
+
+    def get_board_state(self) -> List[List[int]]:
+        board = []
+        bit = 1
+        for _ in range(self.height):
+            row = []
+            for _ in range(self.width):
+                if self.player1 & bit:
+                    row.append(protocol.PLAYER1)
+                elif self.player2 & bit:
+                    row.append(protocol.PLAYER2)
+                else:
+                    row.append(protocol.DEAD)
+                bit <<= 1
+            board.append(row)
+        return board
@@ -0,0 +1,121 @@
+"""Opening book: best moves for early positions, read through ``mmap``.
+
+A book file is a 12-byte header followed by fixed 10-byte records sorted
+by key, so a lookup is a binary search over the mapped file and opening
+a book parses nothing but the header.
+
+    header: magic b'LGBK', version (u16), height (u8), width (u8), count (u32)
+    record: key (u64), y (u8), x (u8)
+
+Positions are keyed by the board and the player to move, and
+canonicalized by symmetry, so one record answers for all 8 orientations
+of a position.  The move is stored in canonical coordinates.
+"""
+from typing import Iterable, Optional, Tuple
+import mmap
+import os
+import struct
+from . import protocol
+from .field import zobrist_table
+from .symmetry import _canonical, inverse, transform_position
+
+
+MAGIC = b'LGBK'
+VERSION = 2  # 2: 所有者を入れ替えず、手番をキーに含める
+_HEADER = struct.Struct('<4sHBBI')
+_RECORD = struct.Struct('<QBB')
+_KEY = struct.Struct('<Q')
+
+# PLAYER2 の手番の局面のキーに混ぜる値
+_PLAYER2_TO_MOVE = 0x9e3779b97f4a7c15
+
+
+def position_key(field, player_id: int) -> Tuple[int, int]:
+    """Return (key, transform) of the position with ``player_id`` to move.
+
+    ``key`` is the Zobrist hash of the canonical board combined with the
+    player to move; ``transform`` maps ``field`` onto that board.
+    """
+    canonical, transform = _canonical(field.snapshot(), field.height, field.width)
+    table = zobrist_table(field.height, field.width)
+    key = _PLAYER2_TO_MOVE if player_id == protocol.PLAYER2 else 0
+    for i, cell in enumerate(canonical):
+        if cell:
+            key ^= table[i][cell]
+    return key, transform
+
+
+def write_book(path: str, height: int, width: int,
+               entries: Iterable[Tuple[int, Tuple[int, int]]]) -> int:
+    """Write (key, canonical move) pairs to ``path``; returns the record count.
+
+    The file is written to a temporary name and renamed into place.
+    """
+    records = sorted(dict(entries).items())
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, height, width, len(records)))
+        for key, (y, x) in records:
+            f.write(_RECORD.pack(key, y, x))
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class OpeningBook:
+    """Read-only opening book backed by a memory-mapped file."""
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f'{path} is not an opening book')
+        magic, version, self.height, self.width, self._count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a version {VERSION} opening book')
+        if len(self._map) != _HEADER.size + self._count * _RECORD.size:
+            self._map.close()
+            raise ValueError(f'{path} is truncated')
+        self.path = path
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, key: int) -> Optional[Tuple[int, int]]:
+        mm = self._map
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _RECORD.size
+            mid_key, = _KEY.unpack_from(mm, offset)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                _, y, x = _RECORD.unpack_from(mm, offset)
+                return y, x
+        return None
+
+    def lookup(self, field, player_id: int) -> Optional[Tuple[int, int]]:
+        """Book move for ``player_id`` on ``field``, or None if not in the book."""
+        if (field.height, field.width) != (self.height, self.width):
+            return None
+        key, transform = position_key(field, player_id)
+        move = self._find(key)
+        if move is None:
+            return None
+        y, x = transform_position(move, inverse(transform), self.height, self.width)
+        # ハッシュの衝突で埋まったセルを返さないように確かめる
+        if field.cells[y][x] != protocol.DEAD:
+            return None
+        return y, x
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
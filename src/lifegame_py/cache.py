@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+import sys
+from . import protocol
+from .bitboard import BitboardField
+from .rule import STANDARD_RULE
+
+
+# OrderedDict のリンクとハッシュ表 1 エントリ分のおおよその大きさ
+_ENTRY_OVERHEAD = 120
+
+
+class SimulationResult(NamedTuple):
+    """Outcome of simulating a board.
+
+    ``counts[owner]`` is the number of DEAD, PLAYER1 and PLAYER2 cells;
+    ``board`` is the final board as row-major bytes, or None when the
+    cache does not store boards.
+    """
+    counts: Tuple[int, int, int]
+    board: Optional[bytes] = None
+
+    def get_board_state(self, width: int) -> List[List[int]]:
+        return [list(self.board[i:i + width]) for i in range(0, len(self.board), width)]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+class SimulationCache:
+    """LRU transposition cache of simulation outcomes.
+
+    Entries are keyed by (Zobrist hash, board size, rule, generations), so
+    positions reached through different move orders, sibling search
+    branches or consecutive turns are simulated once.  The cache evicts
+    least recently used entries to stay below ``max_bytes`` (an estimate
+    of the memory held by keys and results).
+    """
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, store_boards: bool = False):
+        self.max_bytes = max_bytes
+        self.store_boards = store_boards
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[SimulationResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, result: SimulationResult) -> None:
+        if key in self._entries:
+            return
+        size = (_ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(result) +
+                (sys.getsizeof(result.board) if result.board is not None else 0))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (result, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def simulate(self, field, generations: int = protocol.SIMULATION_GENERATIONS) -> SimulationResult:
+        """Return the outcome of ``field`` after ``generations`` generations.
+
+        ``field`` is not modified.  Its ``zobrist`` attribute must be up to
+        date (see ``LifeField.rehash``).  Boards under the standard rule are
+        simulated on a ``BitboardField``, others with ``field.simulate``.
+        """
+        rule = getattr(field, 'rule', STANDARD_RULE)
+        key = (field.zobrist, field.height, field.width, rule.spec, generations)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        if rule == STANDARD_RULE:
+            temp_field = BitboardField.from_field(field)
+            temp_field.advance(generations)
+        else:
+            # ビットボードは B3/S23 しか計算できない
+            temp_field = field.simulate(generations)
+        counts = (temp_field.count(protocol.DEAD),
+                  temp_field.count(protocol.PLAYER1),
+                  temp_field.count(protocol.PLAYER2))
+        board = None
+        if self.store_boards:
+            board = bytes(cell for row in temp_field.get_board_state() for cell in row)
+        result = SimulationResult(counts, board)
+        self.put(key, result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         len(self._entries), self.current_bytes, self.max_bytes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = self.misses = self.evictions = 0
@@ -1,6 +1,9 @@
-from typing import List
+from typing import Callable, List, Optional
 from tabulate import tabulate
 from . import protocol
+import logging
+import queue
+import threading
 
 # 色の追加
 RED = "\033[91m"
@@ -54,4 +57,53 @@ def print_board(board: List[List[int]], title: str = None):
     # Count cells
     count1 = sum(cell == protocol.PLAYER1 for row in board for cell in row)
     count2 = sum(cell == protocol.PLAYER2 for row in board for cell in row)
-    # print(f"Player 1: {count1} cells, Player 2: {count2} cells")
\ No newline at end of file
+    # print(f"Player 1: {count1} cells, Player 2: {count2} cells")
+
+
+class BoardObserver:
+    """Renders boards on a background thread.
+
+    ``observe()`` only queues an immutable ``snapshot()`` of the field,
+    so the game loop never waits for formatting or the terminal.  When
+    ``maxsize`` boards are already waiting, new ones are dropped and
+    counted in ``dropped``.  ``close()`` (or leaving a ``with`` block)
+    renders what is queued and stops the thread.
+    """
+    def __init__(self, render: Callable[[List[List[int]], Optional[str]], None] = print_board,
+                 maxsize: int = 64):
+        self.render = render
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name='board-observer', daemon=True)
+        self._thread.start()
+    
+    def observe(self, field, title: Optional[str] = None) -> None:
+        try:
+            self._queue.put_nowait((field.snapshot(), field.width, title))
+        except queue.Full:
+            self.dropped += 1
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            snapshot, width, title = item
+            board = [list(snapshot[i:i + width]) for i in range(0, len(snapshot), width)]
+            try:
+                self.render(board, title)
+            except Exception:
+                # 表示の失敗でゲームを止めない
+                logging.exception('Board observer failed to render')
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self.dropped:
+            logging.info(f'Board observer dropped {self.dropped} boards')
+    
+    def __enter__(self) -> 'BoardObserver':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,83 +1,439 @@
-from typing import List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
+import os
+import random
 from . import protocol
+from .backend import FieldBackend
+from .rule import _NEIGHBOR_WEIGHTS, STANDARD_RULE, Rule, compile_rule
 
 
-class LifeField:
-    """Map of a game"""
-    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH):
+# 環境変数 LIFEGAME_DEBUG が設定されていれば、count() のたびに差分更新した値を検算する
+_DEBUG = bool(os.environ.get('LIFEGAME_DEBUG'))
+
+
+# (height, width) -> セルごとの [DEAD, PLAYER1, PLAYER2] の乱数
+_ZOBRIST_TABLES: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+
+
+def zobrist_table(height: int, width: int) -> List[Tuple[int, int, int]]:
+    """Per-cell 64-bit Zobrist keys, indexed ``[y * width + x][owner]``.
+
+    The keys are derived from the board size only, so hashes agree across
+    processes.  DEAD has key 0, which makes the empty board hash to 0.
+    """
+    table = _ZOBRIST_TABLES.get((height, width))
+    if table is None:
+        rng = random.Random(f'lifegame_py-zobrist-{height}x{width}')
+        table = [(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(height * width)]
+        _ZOBRIST_TABLES[(height, width)] = table
+    return table
+
+
+def zobrist_hash(board: List[List[int]]) -> int:
+    """Zobrist hash of a board given as nested lists."""
+    height = len(board)
+    width = len(board[0]) if board else 0
+    table = zobrist_table(height, width)
+    h = 0
+    i = 0
+    for row in board:
+        for cell in row:
+            if cell:
+                h ^= table[i][cell]
+            i += 1
+    return h
+
+
+# (height, width) -> セルごとの近傍セルの添字
+_NEIGHBOR_INDICES: Dict[Tuple[int, int], Tuple[Tuple[int, ...], ...]] = {}
+
+
+def _neighbor_indices(height: int, width: int) -> Tuple[Tuple[int, ...], ...]:
+    indices = _NEIGHBOR_INDICES.get((height, width))
+    if indices is None:
+        indices = tuple(
+            tuple((y + dy) * width + x + dx
+                  for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                  if (dy or dx) and 0 <= y + dy < height and 0 <= x + dx < width)
+            for y in range(height) for x in range(width))
+        _NEIGHBOR_INDICES[(height, width)] = indices
+    return indices
+
+
+# 標準ルールの遷移表 (SparseLifeField はこれを使う)
+_TRANSITIONS = STANDARD_RULE.transitions
+
+
+class _Row:
+    """View of one row of a ``LifeField`` supporting ``row[x]`` access."""
+    __slots__ = ('_field', '_offset')
+
+    def __init__(self, field: 'LifeField', y: int):
+        self._field = field
+        self._offset = y * field.width
+
+    def _index(self, x: int) -> int:
+        width = self._field.width
+        if x < 0:
+            x += width
+        if not 0 <= x < width:
+            raise IndexError('row index out of range')
+        return self._offset + x
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return list(self)[x]
+        return self._field._cells[self._index(x)]
+
+    def __setitem__(self, x: int, owner: int) -> None:
+        self._field._set(self._index(x), owner)
+
+    def __len__(self) -> int:
+        return self._field.width
+
+    def __iter__(self):
+        return iter(self._field._cells[self._offset:self._offset + self._field.width])
+
+    def __eq__(self, other) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __deepcopy__(self, memo) -> List[int]:
+        return list(self)
+
+
+class _Rows:
+    """View of a ``LifeField`` supporting ``cells[y][x]`` access."""
+    __slots__ = ('_field', '_rows')
+
+    def __init__(self, field: 'LifeField'):
+        self._field = field
+        self._rows = [_Row(field, y) for y in range(field.height)]
+
+    def __getitem__(self, y):
+        return self._rows[y]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return [list(row) for row in self] == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr([list(row) for row in self])
+
+    def __deepcopy__(self, memo) -> List[List[int]]:
+        return [list(row) for row in self]
+
+
+class LifeField(FieldBackend):
+    """Map of a game
+
+    Cells are stored row-major in one flat ``bytearray``; ``cells[y][x]``
+    is a view onto it, so reads and writes through ``cells`` stay in sync.
+    ``zobrist`` is the Zobrist hash of the board and ``count()`` reads
+    per-owner counters; both are kept up to date by every write.
+
+    For tree search, ``push_place()`` / ``pop()`` make and unmake moves in
+    place, and ``simulate()`` runs generations in a reusable scratch field
+    without touching the board.
+
+    ``rule`` is a ``Rule`` or a rule spec (see ``rule.py``) and defaults
+    to the game rule ``protocol.RULE``.
+    """
+    __slots__ = ('height', 'width', 'zobrist', '_cells', '_next', '_counts', '_view', '_undo', '_scratch',
+                 '_rule')
+
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 rule: Union[str, Rule, None] = None):
+        self._rule = STANDARD_RULE if rule is None else compile_rule(rule)
         self.height = height
         self.width = width
-        self.cells = []
-        for _ in range(height):
-            row = []
-            for _ in range(width):
-                row.append(protocol.DEAD)
-            self.cells.append(row)
+        self.zobrist = 0
+        self._cells = bytearray(height * width)  # 全て DEAD (0)
+        self._next: Optional[bytearray] = None  # next_generation の書き込み先 (毎世代 _cells と入れ替える)
+        self._counts = [height * width, 0, 0]  # 所有者ごとのセル数
+        self._view = None
+        self._undo: List[int] = []  # push_place で置いたセルの添字
+        self._scratch: Optional['LifeField'] = None
+    
+    @classmethod
+    def from_board(cls, board: List[List[int]], rule: Union[str, Rule, None] = None) -> 'LifeField':
+        field = cls(len(board), len(board[0]) if board else 0, rule)
+        field.cells = board
+        return field
+    
+    @property
+    def rule(self) -> Rule:
+        return self._rule
+    
+    @rule.setter
+    def rule(self, rule: Union[str, Rule]) -> None:
+        self._rule = compile_rule(rule)
+    
+    @property
+    def cells(self) -> _Rows:
+        if self._view is None:
+            self._view = _Rows(self)
+        return self._view
+    
+    @cells.setter
+    def cells(self, board: List[List[int]]) -> None:
+        cells = bytearray()
+        for row in board:
+            cells.extend(row)
+        if len(cells) != self.height * self.width:
+            raise ValueError(f'board does not match field size {self.height}x{self.width}')
+        self._cells = cells
+        self._counts = [cells.count(owner) for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2)]
+        self._undo.clear()
+        self.rehash()
+    
+    def clone(self) -> 'LifeField':
+        field = LifeField.__new__(LifeField)
+        field.height = self.height
+        field.width = self.width
+        field.zobrist = self.zobrist
+        field._cells = self._cells[:]
+        field._next = None
+        field._counts = self._counts[:]
+        field._view = None
+        field._undo = []
+        field._scratch = None
+        field._rule = self._rule
+        return field
+    
+    def window(self, top: int, left: int, bottom: int, right: int) -> 'LifeField':
+        """Copy of the rows ``top:bottom`` and columns ``left:right``."""
+        field = LifeField(bottom - top, right - left, self._rule)
+        cells = self._cells
+        width = self.width
+        field.cells = [cells[y * width + left:y * width + right] for y in range(top, bottom)]
+        return field
+    
+    def __copy__(self) -> 'LifeField':
+        return self.clone()
+    
+    def __deepcopy__(self, memo) -> 'LifeField':
+        return self.clone()
+    
+    def _set(self, i: int, owner: int) -> None:
+        old = self._cells[i]
+        if old != owner:
+            self._cells[i] = owner
+            self._counts[old] -= 1
+            self._counts[owner] += 1
+            keys = zobrist_table(self.height, self.width)[i]
+            self.zobrist ^= keys[old] ^ keys[owner]
     
     def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
         y, x = pos
         if not self._is_valid_position(y, x):
             return False
-        if self.cells[y][x] != protocol.DEAD:
+        i = y * self.width + x
+        if self._cells[i] != protocol.DEAD:
             return False
-        self.cells[y][x] = owner
+        self._set(i, owner)
         return True
     
+    def push_place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        """Like ``place()``, but the placement can be undone with ``pop()``."""
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        i = y * self.width + x
+        if self._cells[i] != protocol.DEAD:
+            return False
+        self._set(i, owner)
+        self._undo.append(i)
+        return True
+    
+    def pop(self) -> None:
+        """Undo the most recent ``push_place()``.
+
+        The undo stack only covers placements made since the last
+        generation or board assignment; ``IndexError`` is raised when it is
+        empty.
+        """
+        if not self._undo:
+            raise IndexError('pop from empty undo stack')
+        self._set(self._undo.pop(), protocol.DEAD)
+    
+    def simulate(self, generations: int = protocol.SIMULATION_GENERATIONS) -> 'LifeField':
+        """Run ``generations`` generations on a copy of the board.
+
+        The copy lives in a scratch field owned by this field and reused by
+        every call, so the returned field is only valid until the next
+        ``simulate()``; the board itself is left untouched.
+        """
+        scratch = self._scratch
+        if scratch is None:
+            scratch = self._scratch = LifeField(self.height, self.width)
+        scratch._rule = self._rule
+        scratch._cells[:] = self._cells
+        scratch.zobrist = self.zobrist
+        scratch._counts[:] = self._counts
+        scratch.advance(generations)
+        return scratch
+    
+    def advance(self, generations: int) -> int:
+        """Advance the field by ``generations`` generations.
+
+        Stops stepping as soon as the board repeats an earlier generation
+        and steps only the remaining generations modulo the period.
+        Returns the period of that cycle (1 for a still life), or 0 if no
+        repetition was reached.  Only the Zobrist hash of each generation
+        is kept; a repetition is confirmed by checking that the board comes
+        back one period later, unless the generations run out first.
+        """
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        # 世代ごとのハッシュ。一致したら 1 周期後に同じ盤面へ戻るかで衝突を除く
+        seen = {self.zobrist: 0}
+        candidate = None  # (盤面, 周期, 確かめる世代)
+        generation = 0
+        while generation < generations:
+            self.next_generation()
+            generation += 1
+            if candidate is not None and generation == candidate[2]:
+                board, period, _ = candidate
+                candidate = None
+                if board == self._cells:
+                    for _ in range((generations - generation) % period):
+                        self.next_generation()
+                    return period
+            first = seen.get(self.zobrist)
+            if first is not None and candidate is None:
+                period = generation - first
+                candidate = (self.snapshot(), period, generation + period)
+            seen[self.zobrist] = generation
+        return candidate[1] if candidate is not None else 0
+    
+    def _compute_hash(self) -> int:
+        table = zobrist_table(self.height, self.width)
+        h = 0
+        for i, cell in enumerate(self._cells):
+            if cell:
+                h ^= table[i][cell]
+        return h
+    
+    def rehash(self) -> int:
+        self.zobrist = self._compute_hash()
+        return self.zobrist
+    
     def _is_valid_position(self, y: int, x: int) -> bool:
         return 0 <= y < self.height and 0 <= x < self.width
     
     def _get_neighbors(self, y: int, x: int) -> List[int]:
+        cells = self._cells
         neighbors = []
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dy == 0 and dx == 0:
-                    continue # 自分自身のセルはスキップ
-                ny, nx = y + dy, x + dx
-                if self._is_valid_position(ny, nx) and self.cells[ny][nx] > 0:
-                    neighbors.append(self.cells[ny][nx])
+        for i in _neighbor_indices(self.height, self.width)[y * self.width + x]:
+            if cells[i] > 0:
+                neighbors.append(cells[i])
         return neighbors
     
     def next_generation(self) -> None:
-        # 新しい盤面を DEAD で初期化
-        new_cells = []
-        for _ in range(self.height):
-            row = []
-            for _ in range(self.width):
-                row.append(protocol.DEAD)
-            new_cells.append(row)
+        self._step(None)
+    
+    def iter_generations(self, generations: int) -> Iterator[List[Tuple[Tuple[int, int], int, int]]]:
+        """Advance ``generations`` generations lazily, yielding what changed.
+
+        Each item lists the ``((y, x), old_owner, new_owner)`` of the cells
+        that changed in one generation, collected while stepping, so the
+        cost of replaying a simulation scales with the activity rather
+        than the board area.  The field advances as the iterator is
+        consumed.
+
+        >>> field = LifeField.from_board([[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+        >>> for changes in field.iter_generations(2):
+        ...     print(sorted(changes))
+        [((0, 1), 1, 0), ((1, 0), 0, 1), ((1, 2), 0, 1), ((2, 1), 1, 0)]
+        [((0, 1), 0, 1), ((1, 0), 1, 0), ((1, 2), 1, 0), ((2, 1), 0, 1)]
+        """
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        for _ in range(generations):
+            changes = []
+            self._step(changes)
+            yield changes
+    
+    def _step(self, changes: Optional[list]) -> None:
+        # 前の世代のバッファに書き込んで入れ替えるので、世代ごとの確保はない
+        cells = self._cells
+        new_cells = self._next
+        if new_cells is None or len(new_cells) != len(cells):
+            new_cells = bytearray(len(cells))
         
-        for y in range(self.height):
-            for x in range(self.width):
-                neighbors = self._get_neighbors(y, x)
-                alive_count = len(neighbors)
-                
-                if self.cells[y][x] > 0:  # 生存セル
-                    if 2 <= alive_count <= 3:
-                        new_cells[y][x] = self.cells[y][x]
-                    else:
-                        new_cells[y][x] = protocol.DEAD
-                else:  # 死亡セル
-                    if alive_count == 3:
-                        # 多数決で誕生
-                        player1_count = neighbors.count(protocol.PLAYER1)
-                        player2_count = neighbors.count(protocol.PLAYER2)
-                        if player1_count > player2_count:
-                            new_cells[y][x] = protocol.PLAYER1
-                        elif player1_count < player2_count:
-                            new_cells[y][x] = protocol.PLAYER2
-                        else:
-                            new_cells[y][x] = protocol.DEAD
+        weights = _NEIGHBOR_WEIGHTS
+        transitions = self._rule.transitions
+        table = zobrist_table(self.height, self.width)
+        zobrist = self.zobrist
+        counts = self._counts
+        width = self.width
+        i = 0
+        for neighbors in _neighbor_indices(self.height, width):
+            total = 0
+            for j in neighbors:
+                total += weights[cells[j]]
+            cell = cells[i]
+            new_cell = transitions[total * 3 + cell]
+            new_cells[i] = new_cell
+            
+            # 変化したセルだけハッシュとセル数を更新
+            if new_cell != cell:
+                counts[cell] -= 1
+                counts[new_cell] += 1
+                keys = table[i]
+                zobrist ^= keys[cell] ^ keys[new_cell]
+                if changes is not None:
+                    changes.append((divmod(i, width), cell, new_cell))
+            i += 1
         
-        self.cells = new_cells
+        self._cells = new_cells
+        self._next = cells
+        self.zobrist = zobrist
+        self._undo.clear()  # 世代が進んだら配置の取り消しはできない
     
     def count(self, owner: int) -> int:
-        count = 0
-        for row in self.cells:
-            for cell in row:
-                if cell == owner:
-                    count += 1
-        return count
+        if _DEBUG:
+            self.check_consistency()
+        # 盤面にない所有者は 0 個 (カウンタの添字にしない)
+        if protocol.DEAD <= owner <= protocol.PLAYER2:
+            return self._counts[owner]
+        return 0
+    
+    def check_consistency(self) -> None:
+        """Recompute the counters and hash from the cells and compare.
+
+        Raises ``AssertionError`` on a mismatch.  ``count()`` calls this
+        when the environment variable ``LIFEGAME_DEBUG`` is set.
+        """
+        cells = self._cells
+        counts = [cells.count(owner) for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2)]
+        if counts != self._counts:
+            raise AssertionError(f'cell counters {self._counts} do not match the board {counts}')
+        # 検査で状態を変えないよう、ハッシュは計算するだけで self.zobrist には書かない
+        if self._compute_hash() != self.zobrist:
+            raise AssertionError(f'zobrist hash {self.zobrist:#x} does not match the board')
+    
+    def snapshot(self) -> bytes:
+        """Immutable row-major copy of the board (cell (y, x) at y * width + x)."""
+        return bytes(self._cells)
     
     def get_board_state(self) -> List[List[int]]:
-        import copy
-        return copy.deepcopy(self.cells)
\ No newline at end of file
+        """Return a copy of the board as nested lists."""
+        cells = self._cells
+        width = self.width
+        return [list(cells[i:i + width]) for i in range(0, len(cells), width)]
@@ -0,0 +1,341 @@
+from collections import OrderedDict
+from typing import List, Tuple
+from . import protocol
+from .backend import FieldBackend
+
+
+# 盤面の外側を囲む壁。常に死亡扱いで、誕生も近傍への寄与もしない
+WALL = 3
+
+
+class Node:
+    """Canonical quadtree node; a level-k node covers 2**k x 2**k cells.
+
+    Level-0 nodes are single cells whose ``state`` is DEAD, PLAYER1,
+    PLAYER2 or WALL.  Nodes are interned by ``HashlifeField`` so equal
+    subtrees are the same object.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'state', 'player1', 'player2')
+
+    def __init__(self, level: int, nw=None, ne=None, sw=None, se=None, state: int = protocol.DEAD):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.state = state
+        if level == 0:
+            self.player1 = int(state == protocol.PLAYER1)
+            self.player2 = int(state == protocol.PLAYER2)
+        else:
+            self.player1 = nw.player1 + ne.player1 + sw.player1 + se.player1
+            self.player2 = nw.player2 + ne.player2 + sw.player2 + se.player2
+
+
+def _next_state(cell: int, neighbors: List[int]) -> int:
+    if cell == WALL:
+        return WALL
+    player1_count = neighbors.count(protocol.PLAYER1)
+    player2_count = neighbors.count(protocol.PLAYER2)
+    alive_count = player1_count + player2_count
+    if cell > 0:  # 生存セル
+        return cell if 2 <= alive_count <= 3 else protocol.DEAD
+    if alive_count == 3:  # 多数決で誕生
+        if player1_count > player2_count:
+            return protocol.PLAYER1
+        if player1_count < player2_count:
+            return protocol.PLAYER2
+    return protocol.DEAD
+
+
+class HashlifeField(FieldBackend):
+    """Memoized quadtree engine for huge boards and long horizons.
+
+    The board is surrounded by a one-cell wall so the infinite-plane
+    quadtree reproduces ``LifeField``'s finite edges exactly.  Results are
+    memoized per (node, log2 generations) in an LRU cache of at most
+    ``cache_size`` entries.  The node table never holds more than
+    ``max_nodes`` nodes, even within one ``advance``: when it is full both
+    tables are flushed on the spot, and once the call returns the live
+    tree is re-interned so equal subtrees are shared again.
+    """
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 cache_size: int = 1 << 20, max_nodes: int = 1 << 21):
+        self.height = height
+        self.width = width
+        self.cache_size = cache_size
+        self.max_nodes = max_nodes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.collections = 0
+        self.flushes = 0
+        self._nodes = {}
+        self._results = OrderedDict()
+        self._leaves = [Node(0, state=state)
+                        for state in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2, WALL)]
+        self._empty = [self._leaves[protocol.DEAD]]
+        self._load([[protocol.DEAD] * width for _ in range(height)])
+
+    # --- 変換 ---
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], **kwargs) -> 'HashlifeField':
+        field = cls(len(board), len(board[0]) if board else 0, **kwargs)
+        field._load(board)
+        return field
+
+    def get_board_state(self) -> List[List[int]]:
+        board = [[protocol.DEAD] * self.width for _ in range(self.height)]
+        self._export(self.root, -self._origin_y, -self._origin_x, board)
+        return board
+
+    def _export(self, node: Node, y: int, x: int, board: List[List[int]]) -> None:
+        if node.player1 == 0 and node.player2 == 0:
+            return
+        size = 1 << node.level
+        if y >= self.height or x >= self.width or y + size <= 0 or x + size <= 0:
+            return
+        if node.level == 0:
+            board[y][x] = node.state
+            return
+        half = size >> 1
+        self._export(node.nw, y, x, board)
+        self._export(node.ne, y, x + half, board)
+        self._export(node.sw, y + half, x, board)
+        self._export(node.se, y + half, x + half, board)
+
+    def _load(self, board: List[List[int]]) -> None:
+        # 壁を含めた (height + 2) x (width + 2) を覆う最小の正方形に置く
+        level = 1
+        while (1 << level) < max(self.height, self.width) + 2:
+            level += 1
+
+        def state(y, x):
+            if 0 <= y < self.height and 0 <= x < self.width:
+                return board[y][x]
+            if -1 <= y <= self.height and -1 <= x <= self.width:
+                return WALL
+            return protocol.DEAD
+
+        def build(level, y, x):
+            if y > self.height or x > self.width:
+                return self._empty_node(level)
+            if level == 0:
+                return self._leaves[state(y, x)]
+            half = 1 << (level - 1)
+            return self._join(build(level - 1, y, x), build(level - 1, y, x + half),
+                              build(level - 1, y + half, x), build(level - 1, y + half, x + half))
+
+        # root の左上は盤面座標で (-1, -1)
+        self._origin_y = self._origin_x = 1
+        self.root = build(level, -1, -1)
+
+    # --- 正準化されたノード ---
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            if len(self._nodes) >= self.max_nodes:
+                self._flush()
+            node = Node(nw.level + 1, nw, ne, sw, se)
+            self._nodes[key] = node
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        while len(self._empty) <= level:
+            child = self._empty[-1]
+            self._empty.append(self._join(child, child, child, child))
+        return self._empty[level]
+
+    def _expand(self) -> None:
+        """Surround the root with empty space, doubling its size."""
+        root = self.root
+        empty = self._empty_node(root.level - 1)
+        self.root = self._join(
+            self._join(empty, empty, empty, root.nw),
+            self._join(empty, empty, root.ne, empty),
+            self._join(empty, root.sw, empty, empty),
+            self._join(root.se, empty, empty, empty))
+        offset = 1 << (root.level - 1)
+        self._origin_y += offset
+        self._origin_x += offset
+
+    # --- 世代計算 ---
+
+    def _base_step(self, node: Node) -> Node:
+        # level 2 (4x4) の中央 2x2 を 1 世代進める
+        rows = [[node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+                [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+                [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+                [node.sw.sw, node.sw.se, node.se.sw, node.se.se]]
+        grid = [[leaf.state for leaf in row] for row in rows]
+        result = []
+        for y in (1, 2):
+            for x in (1, 2):
+                neighbors = [grid[y + dy][x + dx]
+                             for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+                result.append(self._leaves[_next_state(grid[y][x], neighbors)])
+        return self._join(*result)
+
+    def _centre(self, node: Node) -> Node:
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """Return the centre of ``node`` advanced by 2**min(j, level - 2) generations."""
+        if node.player1 == 0 and node.player2 == 0:
+            # 生存セルがなければ何も誕生せず、壁も動かない
+            return self._centre(node)
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return result
+        self.misses += 1
+
+        if node.level == 2:
+            result = self._base_step(node)
+        else:
+            join = self._join
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self._successor(nw, j)
+            c2 = self._successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self._successor(ne, j)
+            c4 = self._successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self._successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self._successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self._successor(sw, j)
+            c8 = self._successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self._successor(se, j)
+            if j < node.level - 2:
+                # 残りの世代がないので中央部分を切り出すだけ
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                              join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw),
+                              join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = join(self._successor(join(c1, c2, c4, c5), j),
+                              self._successor(join(c2, c3, c5, c6), j),
+                              self._successor(join(c4, c5, c7, c8), j),
+                              self._successor(join(c5, c6, c8, c9), j))
+
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def advance(self, generations: int) -> None:
+        """Advance the field by ``generations`` generations."""
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        flushes = self.flushes
+        j = 0
+        while generations:
+            if generations & 1:
+                self._advance_pow2(j)
+            generations >>= 1
+            j += 1
+        if self.flushes != flushes:
+            self._collect()
+
+    def _advance_pow2(self, j: int) -> None:
+        # successor は中央の半分を返すので、盤面が中央 1/4 に収まるまで広げる
+        while self.root.level < j + 2 or not self._board_in_centre():
+            self._expand()
+        half = 1 << (self.root.level - 2)
+        self.root = self._successor(self.root, j)
+        self._origin_y -= half
+        self._origin_x -= half
+
+    def _board_in_centre(self) -> bool:
+        quarter = 1 << (self.root.level - 2)
+        top, left = self._origin_y - 1, self._origin_x - 1
+        return (top >= quarter and left >= quarter and
+                top + self.height + 2 <= 3 * quarter and left + self.width + 2 <= 3 * quarter)
+
+    def _flush(self) -> None:
+        """Drop both tables in the middle of a computation.
+
+        Nodes already built stay valid, so the recursion can go on; new
+        nodes just no longer share with the old ones until ``_collect``.
+        """
+        self._nodes = {}
+        self._results = OrderedDict()
+        self.flushes += 1
+
+    def _collect(self) -> None:
+        """Drop both tables and re-intern the live tree."""
+        board = self.get_board_state()
+        self._nodes = {}
+        self._results = OrderedDict()
+        self._empty = [self._leaves[protocol.DEAD]]
+        self._load(board)
+        self.collections += 1
+
+    # --- LifeField 互換の操作 ---
+
+    def next_generation(self) -> None:
+        self.advance(1)
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            return False
+        if self.get(pos) != protocol.DEAD:
+            return False
+        self.root = self._set(self.root, y + self._origin_y, x + self._origin_x, owner)
+        return True
+
+    def get(self, pos: Tuple[int, int]) -> int:
+        y, x = pos
+        y += self._origin_y
+        x += self._origin_x
+        node = self.root
+        while node.level > 0:
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            y &= half - 1
+            x &= half - 1
+        return node.state
+
+    def _set(self, node: Node, y: int, x: int, state: int) -> Node:
+        if node.level == 0:
+            return self._leaves[state]
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self._set(nw, y, x, state)
+            else:
+                ne = self._set(ne, y, x - half, state)
+        else:
+            if x < half:
+                sw = self._set(sw, y - half, x, state)
+            else:
+                se = self._set(se, y - half, x - half, state)
+        return self._join(nw, ne, sw, se)
+
+    def count(self, owner: int) -> int:
+        if owner == protocol.PLAYER1:
+            return self.root.player1
+        if owner == protocol.PLAYER2:
+            return self.root.player2
+        if owner == protocol.DEAD:
+            return self.height * self.width - self.root.player1 - self.root.player2
+        return 0
+
+    def cache_info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "collections": self.collections,
+            "flushes": self.flushes,
+            "results": len(self._results),
+            "nodes": len(self._nodes),
+        }
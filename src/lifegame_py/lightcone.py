@@ -0,0 +1,140 @@
+"""Placement evaluation restricted to the light cone of the placement.
+
+A cell only reads its 8 neighbors, so after G generations a placement at
+``pos`` can only have changed cells within Chebyshev distance G of it
+(``light_cone``), and those cells only depend on the cells within 2G of
+``pos``.  ``PlacementEvaluator`` therefore simulates the board once,
+and each candidate only on the (4G+1)-square window around it (boards
+less than four times the window area are simulated whole).  The
+counts differ from the unplaced board only inside the cone, which the
+window computes exactly; the dead cells the window assumes beyond its
+border cannot reach the cone within G generations.
+
+Candidates whose windows look the same give the same change, so they are
+simulated once.  In particular every candidate farther than 2G from all
+live cells falls into one of a few classes told apart only by how close
+it is to the border, so the work scales with the number of live clusters
+rather than the board area.
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+from . import protocol
+from .bitboard import BitboardField
+from .field import LifeField
+from .rule import STANDARD_RULE
+
+
+Counts = Tuple[int, int, int]
+_OWNERS = (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2)
+
+
+def light_cone(pos: Tuple[int, int], generations: int, height: int, width: int) -> Tuple[int, int, int, int]:
+    """(top, left, bottom, right) of the cells ``pos`` can affect in ``generations`` generations.
+
+    ``bottom`` and ``right`` are exclusive.
+    """
+    y, x = pos
+    return (max(y - generations, 0), max(x - generations, 0),
+            min(y + generations + 1, height), min(x + generations + 1, width))
+
+
+def _counts(field) -> Counts:
+    return tuple(field.count(owner) for owner in _OWNERS)
+
+
+def _state(field) -> tuple:
+    # 窓の中身を辞書のキーにする
+    if isinstance(field, BitboardField):
+        return field.player1, field.player2
+    return field.snapshot(), field.rule
+
+
+class PlacementEvaluator:
+    """Outcome of single placements on ``field``, simulated in their light cones.
+
+    ``evaluate(owner, pos)`` returns the (DEAD, PLAYER1, PLAYER2) counts
+    of the whole board after ``generations`` generations with ``owner``
+    placed at ``pos``, exactly as a full simulation would.  ``field`` is
+    read once and not modified; ``simulations`` counts the simulations
+    actually run.
+    """
+    def __init__(self, field, generations: int = protocol.SIMULATION_GENERATIONS):
+        self.height = field.height
+        self.width = field.width
+        self.generations = generations
+        self.board = board = field.get_board_state()
+        # 標準ルールならビットボードで進める
+        rule = getattr(field, 'rule', STANDARD_RULE)
+        if rule is STANDARD_RULE:
+            self._start = BitboardField.from_board(board)
+        else:
+            self._start = LifeField.from_board(board, rule)
+        self._final = self._start.clone()
+        self._final.advance(generations)
+        self.base_counts: Counts = _counts(self._final)
+        # 窓が盤面の 1/4 より大きいと、切り出す手間で全体を進めるより遅くなる
+        side = 4 * generations + 1
+        self._windowed = 4 * side * side <= self.height * self.width
+        self.simulations = 0
+        self._near: Optional[Set[Tuple[int, int]]] = None
+        self._deltas: Dict[tuple, Counts] = {}
+
+    def _near_live(self) -> Set[Tuple[int, int]]:
+        # 生存セルから 2G 以内のセル。それ以外の候補の窓には配置したセルしかない
+        if self._near is None:
+            reach = 2 * self.generations
+            near = set()
+            for y, row in enumerate(self.board):
+                for x, cell in enumerate(row):
+                    if cell != protocol.DEAD:
+                        top, left, bottom, right = light_cone((y, x), reach, self.height, self.width)
+                        near.update((ny, nx) for ny in range(top, bottom) for nx in range(left, right))
+            self._near = near
+        return self._near
+
+    def _delta(self, window, owner: int, pos: Tuple[int, int], top: int, left: int) -> Counts:
+        # 光円錐の中だけの、配置による各所有者のセル数の変化
+        self.simulations += 1
+        y, x = pos
+        window.place(owner, (y - top, x - left))
+        window.advance(self.generations)
+        c_top, c_left, c_bottom, c_right = light_cone(pos, self.generations, self.height, self.width)
+        placed = _counts(window.window(c_top - top, c_left - left, c_bottom - top, c_right - left))
+        base = _counts(self._final.window(c_top, c_left, c_bottom, c_right))
+        return tuple(p - b for p, b in zip(placed, base))
+
+    def evaluate(self, owner: int, pos: Tuple[int, int]) -> Counts:
+        """Counts after the simulation with ``owner`` placed at the empty cell ``pos``."""
+        y, x = pos
+        if self.board[y][x] != protocol.DEAD:
+            raise ValueError(f'{pos} is not empty')
+        top, left, bottom, right = light_cone(pos, 2 * self.generations, self.height, self.width)
+        if not self._windowed or (top, left, bottom, right) == (0, 0, self.height, self.width):
+            # 盤面が小さければ、そのまま盤面全体を進める
+            self.simulations += 1
+            field = self._start.clone()
+            field.place(owner, pos)
+            field.advance(self.generations)
+            return _counts(field)
+
+        # 窓の中での位置で、盤面の端による窓の切れ方が決まる
+        shape = (y - top, x - left, bottom - y, right - x)
+        window = None
+        if pos in self._near_live():
+            window = self._start.window(top, left, bottom, right)
+            key = owner, shape, _state(window)
+        else:
+            key = owner, shape
+        delta = self._deltas.get(key)
+        if delta is None:
+            if window is None:
+                window = self._start.window(top, left, bottom, right)
+            delta = self._deltas[key] = self._delta(window, owner, pos, top, left)
+        return tuple(b + d for b, d in zip(self.base_counts, delta))
+
+    def evaluate_all(self, owner: int,
+                     moves: Optional[Iterable[Tuple[int, int]]] = None) -> Dict[Tuple[int, int], Counts]:
+        """``evaluate`` for each of ``moves`` (default: every empty cell)."""
+        if moves is None:
+            moves = [(y, x) for y, row in enumerate(self.board)
+                     for x, cell in enumerate(row) if cell == protocol.DEAD]
+        return {tuple(pos): self.evaluate(owner, pos) for pos in moves}
@@ -0,0 +1,256 @@
+"""Precomputed transition tables for the two-player rule.
+
+The cell table maps the base-3 code of a 3x3 owner neighborhood to the
+next owner of its centre cell.  The tile tables map a 4x4 block to its
+2x2 centre one generation later; the 3**16 owner blocks are factored
+into two 2**16 tables, one indexed by the alive bits and one by the
+PLAYER1 bits, which is exact because survivors keep their owner and a
+birth only needs to know whether PLAYER1 holds at least two of the
+three parents.
+
+``load_tables()`` builds the tables once per process, or reads them
+from a cache file written by an earlier process.  The file starts with
+a header holding the table version and the crc32 of the tables, so a
+stale or corrupted file is rebuilt rather than used.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+import logging
+import os
+import struct
+import zlib
+from . import protocol
+from .backend import FieldBackend
+
+
+def neighborhood_code(neighborhood: List[List[int]]) -> int:
+    """Base-3 code of a 3x3 owner block; the centre is digit 4."""
+    code = 0
+    weight = 1
+    for x in range(3):
+        for y in range(3):
+            code += neighborhood[y][x] * weight
+            weight *= 3
+    return code
+
+
+def _rule(cell: int, player1_count: int, player2_count: int) -> int:
+    alive_count = player1_count + player2_count
+    if cell > 0:  # 生存セル
+        return cell if 2 <= alive_count <= 3 else protocol.DEAD
+    if alive_count == 3:  # 多数決で誕生
+        if player1_count > player2_count:
+            return protocol.PLAYER1
+        if player1_count < player2_count:
+            return protocol.PLAYER2
+    return protocol.DEAD
+
+
+def _build_cell_table() -> bytes:
+    table = bytearray(3 ** 9)
+    for code in range(3 ** 9):
+        digits = []
+        rest = code
+        for _ in range(9):
+            digits.append(rest % 3)
+            rest //= 3
+        cell = digits.pop(4)
+        table[code] = _rule(cell, digits.count(protocol.PLAYER1), digits.count(protocol.PLAYER2))
+    return bytes(table)
+
+
+# 4x4 ブロックのビット r * 4 + c と中央 2x2 のビット (r - 1) * 2 + (c - 1)
+_CENTRES = ((1, 1), (1, 2), (2, 1), (2, 2))
+_NEIGHBOR_MASKS = []
+for _r, _c in _CENTRES:
+    _mask = 0
+    for _dr in (-1, 0, 1):
+        for _dc in (-1, 0, 1):
+            if _dr or _dc:
+                _mask |= 1 << ((_r + _dr) * 4 + _c + _dc)
+    _NEIGHBOR_MASKS.append((_mask, 1 << (_r * 4 + _c)))
+del _r, _c, _dr, _dc, _mask
+
+
+def _build_tile_tables() -> Tuple[bytes, bytes]:
+    # alive: 下位 4bit が生存継続、上位 4bit が誕生
+    # player1: 下位 4bit が「近傍の PLAYER1 が 2 以上」、上位 4bit が中央セル自身
+    alive_table = bytearray(1 << 16)
+    player1_table = bytearray(1 << 16)
+    for block in range(1 << 16):
+        alive = 0
+        player1 = 0
+        for i, (neighbors, centre) in enumerate(_NEIGHBOR_MASKS):
+            count = (block & neighbors).bit_count()
+            if block & centre:
+                if 2 <= count <= 3:
+                    alive |= 1 << i
+                player1 |= 1 << (i + 4)
+            elif count == 3:
+                alive |= 1 << (i + 4)
+            if count >= 2:
+                player1 |= 1 << i
+        alive_table[block] = alive
+        player1_table[block] = player1
+    return bytes(alive_table), bytes(player1_table)
+
+
+class Tables(NamedTuple):
+    cell: bytes      # 3**9: 近傍コード -> 中央セルの次の所有者
+    alive: bytes     # 2**16: 生存ビット -> 生存継続 4bit | 誕生 4bit << 4
+    player1: bytes   # 2**16: PLAYER1 ビット -> 多数派 4bit | 中央の PLAYER1 4bit << 4
+
+
+_TABLES: Optional[Tables] = None
+_TABLE_VERSION = 2  # 2: 版と crc32 のヘッダ付き
+_TABLE_SIZES = (3 ** 9, 1 << 16, 1 << 16)
+# キャッシュファイルの先頭: マジック, 版, 表の crc32
+_CACHE_HEADER = struct.Struct('!4sII')
+_CACHE_MAGIC = b'LGLT'
+
+
+def table_cache_path() -> str:
+    default = os.path.join(os.path.expanduser('~'), '.cache', 'lifegame_py',
+                           f'lut-v{_TABLE_VERSION}.bin')
+    return os.environ.get('LIFEGAME_LUT_CACHE', default)
+
+
+def load_tables() -> Tables:
+    """Return the lookup tables, building them at most once per process.
+
+    The tables are read from ``table_cache_path()`` when present and
+    written there after the first build.
+    """
+    global _TABLES
+    if _TABLES is not None:
+        return _TABLES
+
+    path = table_cache_path()
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        header, data = data[:_CACHE_HEADER.size], data[_CACHE_HEADER.size:]
+        if (len(header) == _CACHE_HEADER.size and len(data) == sum(_TABLE_SIZES)
+                and _CACHE_HEADER.unpack(header) == (_CACHE_MAGIC, _TABLE_VERSION, zlib.crc32(data))):
+            cell_end = _TABLE_SIZES[0]
+            alive_end = cell_end + _TABLE_SIZES[1]
+            _TABLES = Tables(data[:cell_end], data[cell_end:alive_end], data[alive_end:])
+            return _TABLES
+        logging.warning(f'Ignoring malformed lookup table cache {path}')
+    except OSError:
+        pass
+
+    _TABLES = Tables(_build_cell_table(), *_build_tile_tables())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        data = b''.join(_TABLES)
+        with open(tmp_path, 'wb') as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, _TABLE_VERSION, zlib.crc32(data)))
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.debug(f'Could not write lookup table cache {path}: {e}')
+    return _TABLES
+
+
+def next_state(neighborhood: List[List[int]]) -> int:
+    """Next owner of the centre of a 3x3 owner block, by one lookup."""
+    return load_tables().cell[neighborhood_code(neighborhood)]
+
+
+# (新しい PLAYER1 の 4bit, 新しい PLAYER2 の 4bit) -> 中央 2x2 の所有者
+_OWNERS = []
+for _bits in range(256):
+    _OWNERS.append(tuple(
+        protocol.PLAYER1 if _bits >> _i & 1 else
+        protocol.PLAYER2 if _bits >> (_i + 4) & 1 else protocol.DEAD
+        for _i in range(4)))
+_OWNERS = tuple(_OWNERS)
+del _bits
+
+
+class LutLifeField(FieldBackend):
+    """Field stepped by table lookups instead of per-cell branches.
+
+    Each generation walks the board in 2x2 tiles; the surrounding 4x4
+    block is looked up in the tile tables and the result written back
+    with one more lookup.
+    """
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH):
+        self.height = height
+        self.width = width
+        self.cells = [[protocol.DEAD] * width for _ in range(height)]
+        tables = load_tables()
+        self._alive_table, self._player1_table = tables.alive, tables.player1
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> 'LutLifeField':
+        field = cls(len(board), len(board[0]) if board else 0)
+        field.cells = [list(row) for row in board]
+        return field
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        if self.cells[y][x] != protocol.DEAD:
+            return False
+        self.cells[y][x] = owner
+        return True
+
+    def next_generation(self) -> None:
+        height, width = self.height, self.width
+        alive_table, player1_table = self._alive_table, self._player1_table
+
+        # 上下左右に 1 マスずつ余白をとった行ごとのビット列
+        alive_rows = [0] * (height + 3)
+        player1_rows = [0] * (height + 3)
+        for y, row in enumerate(self.cells):
+            alive = 0
+            player1 = 0
+            bit = 2
+            for cell in row:
+                if cell:
+                    alive |= bit
+                    if cell == protocol.PLAYER1:
+                        player1 |= bit
+                bit <<= 1
+            alive_rows[y + 1] = alive
+            player1_rows[y + 1] = player1
+
+        new_cells = [[protocol.DEAD] * width for _ in range(height)]
+        for y in range(0, height, 2):
+            a0, a1, a2, a3 = alive_rows[y:y + 4]
+            p0, p1, p2, p3 = player1_rows[y:y + 4]
+            top = new_cells[y]
+            bottom = new_cells[y + 1] if y + 1 < height else None
+            for x in range(0, width, 2):
+                alive = alive_table[((a0 >> x) & 15) | ((a1 >> x) & 15) << 4 |
+                                    ((a2 >> x) & 15) << 8 | ((a3 >> x) & 15) << 12]
+                if not alive:
+                    continue
+                player1 = player1_table[((p0 >> x) & 15) | ((p1 >> x) & 15) << 4 |
+                                        ((p2 >> x) & 15) << 8 | ((p3 >> x) & 15) << 12]
+                survive = alive & 15
+                born = alive >> 4
+                new_player1 = (survive & (player1 >> 4)) | (born & player1)
+                new_player2 = (survive | born) ^ new_player1
+                o0, o1, o2, o3 = _OWNERS[new_player1 | new_player2 << 4]
+                top[x] = o0
+                if x + 1 < width:
+                    top[x + 1] = o1
+                if bottom is not None:
+                    bottom[x] = o2
+                    if x + 1 < width:
+                        bottom[x + 1] = o3
+        self.cells = new_cells
+
+    def count(self, owner: int) -> int:
+        return sum(row.count(owner) for row in self.cells)
+
+    def get_board_state(self) -> List[List[int]]:
+        return [row[:] for row in self.cells]
@@ -0,0 +1,179 @@
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import multiprocessing
+import os
+import threading
+import weakref
+from . import protocol
+from .backend import FieldBackend
+from .vectorized import np, _require_numpy, step
+
+
+def _bands(height: int, workers: int) -> List[Tuple[int, int]]:
+    """Split ``height`` rows into ``workers`` contiguous (start, stop) bands."""
+    workers = max(1, min(workers, height))
+    bounds = [height * i // workers for i in range(workers + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _worker(name: str, height: int, width: int, band: Tuple[int, int],
+            command, start_barrier, step_barrier) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buffers = np.ndarray((2, height, width), dtype=np.uint8, buffer=shm.buf)
+        top, bottom = band
+        # 上下 1 行ずつの境界 (ハロー) も読む。書き込むのは自分の帯だけ
+        lo, hi = max(top - 1, 0), min(bottom + 1, height)
+        current = 0  # ParallelLifeField._current と同じく世代ごとに入れ替える
+        while True:
+            start_barrier.wait()
+            generations = command.value
+            if generations < 0:
+                break
+            for _ in range(generations):
+                buffers[1 - current, top:bottom] = step(buffers[current, lo:hi])[top - lo:bottom - lo]
+                # 全員が書き終えるまで次の世代の読み込みを待つ
+                step_barrier.wait()
+                current = 1 - current
+            start_barrier.wait()
+        del buffers
+    except BaseException:
+        # 親プロセスや他のワーカーを待たせたままにしない
+        start_barrier.abort()
+        step_barrier.abort()
+        raise
+    finally:
+        shm.close()
+
+
+def _shutdown(processes, command, start_barrier, shm) -> None:
+    if processes:
+        command.value = -1
+        try:
+            start_barrier.wait(timeout=10)
+        except Exception:
+            pass
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+    try:
+        shm.close()
+    except BufferError:
+        pass  # 配列のビューが残っていても、unlink すれば最後の参照が消えたときに解放される
+    shm.unlink()
+
+
+class ParallelLifeField(FieldBackend):
+    """Field stepped by worker processes over shared memory.
+
+    The board is split into horizontal bands, one per worker.  Both
+    generations live in one ``multiprocessing.shared_memory`` block; each
+    worker reads its band plus one halo row above and below from the
+    current generation, writes its band of the next one, and waits on a
+    barrier before the buffers swap.  Workers are started on the first
+    ``advance()`` and stopped by ``close()`` (or when the field is
+    garbage collected).
+
+    Requires numpy.
+    """
+    @classmethod
+    def is_available(cls) -> bool:
+        return np is not None
+
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 workers: Optional[int] = None):
+        _require_numpy()
+        self.height = height
+        self.width = width
+        self.workers = len(_bands(height, workers or os.cpu_count() or 1))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(2 * height * width, 1))
+        self._buffers = np.ndarray((2, height, width), dtype=np.uint8, buffer=self._shm.buf)
+        self._buffers[:] = protocol.DEAD
+        self._current = 0
+        self._processes = []
+        context = multiprocessing.get_context()
+        self._command = context.Value('q', 0, lock=False)
+        self._start_barrier = context.Barrier(self.workers + 1)
+        self._step_barrier = context.Barrier(self.workers)
+        self._context = context
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes,
+                                           self._command, self._start_barrier, self._shm)
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], workers: Optional[int] = None) -> 'ParallelLifeField':
+        field = cls(len(board), len(board[0]) if board else 0, workers)
+        field.cells[:] = np.asarray(board, dtype=np.uint8)
+        return field
+
+    @property
+    def cells(self):
+        """The current generation as a (height, width) uint8 array view."""
+        return self._buffers[self._current]
+
+    def _start(self) -> None:
+        for band in _bands(self.height, self.workers):
+            process = self._context.Process(
+                target=_worker, daemon=True,
+                args=(self._shm.name, self.height, self.width, band,
+                      self._command, self._start_barrier, self._step_barrier))
+            process.start()
+            self._processes.append(process)
+
+    def advance(self, generations: int) -> None:
+        """Advance the field by ``generations`` generations."""
+        if generations < 0:
+            raise ValueError(f"generations must be non-negative: {generations}")
+        if generations == 0 or self.height == 0:
+            return
+        # 起動直後のワーカーが開始を待つところまで来なければ失敗とみなす
+        timeout = None
+        if not self._processes:
+            self._start()
+            timeout = 60
+        self._command.value = generations
+        try:
+            self._start_barrier.wait(timeout)  # 開始
+            self._start_barrier.wait()  # 全ワーカーの終了
+        except threading.BrokenBarrierError:
+            self.close()
+            raise RuntimeError('a ParallelLifeField worker failed; the field is closed') from None
+        # ワーカーも世代ごとに同じ順でバッファを入れ替えている
+        self._current = (self._current + generations) % 2
+
+    def next_generation(self) -> None:
+        self.advance(1)
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        self._buffers = None
+        self._finalizer()
+
+    def __enter__(self) -> 'ParallelLifeField':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def get(self, pos: Tuple[int, int]) -> int:
+        y, x = pos
+        return int(self.cells[y, x])
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        if self.cells[y, x] != protocol.DEAD:
+            return False
+        self.cells[y, x] = owner
+        return True
+
+    def count(self, owner: int) -> int:
+        return int(np.count_nonzero(self.cells == owner))
+
+    def get_board_state(self) -> List[List[int]]:
+        return self.cells.tolist()
@@ -1,6 +1,8 @@
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterable, List, Tuple, Any, Union
 from .field import LifeField
+from .book import OpeningBook
 from . import protocol
+from . import wire
 import json
 import abc
 import logging
@@ -8,11 +10,20 @@ import socket
 
 
 class LifePlayer(abc.ABC):
-    def __init__(self):
+    """Base class of players.
+
+    ``opening_book`` (an ``OpeningBook`` or the path of a book file) makes
+    ``choose_cell()`` answer from the book while the position is in it
+    and fall back to ``place_cell()`` afterwards.
+    """
+    def __init__(self, opening_book=None):
         self.field = None
         self.player_id = None
         self.last_msg = None
         self.placed_cells = 0
+        if opening_book is not None and not isinstance(opening_book, OpeningBook):
+            opening_book = OpeningBook(opening_book)
+        self.opening_book = opening_book
     
     def initialize(self, field: LifeField, player_id: int):
         self.field = field
@@ -24,24 +35,51 @@ class LifePlayer(abc.ABC):
     def place_cell(self) -> Tuple[int, int]:
         pass
     
+    def choose_cell(self) -> Tuple[int, int]:
+        """Move to play: the book move if there is one, else ``place_cell()``."""
+        if self.opening_book is not None:
+            position = self.opening_book.lookup(self.field, self.player_id)
+            if position is not None:
+                logging.debug(f'Opening book move {position}')
+                return position
+        return self.place_cell()
+    
     @abc.abstractmethod
     def name(self) -> str:
         pass
     
-    def update(self, json_str: str):
-        self.last_msg = json.loads(json_str)
+    def update(self, message: Union[str, Dict[str, Any]]):
+        """Apply a message from the server: a whole board or, with delta, the placed cell.
+
+        ``message`` is the JSON text, or the decoded dict with the binary
+        protocol.  Raises ``RuntimeError`` when the board no longer
+        matches the server's ``"checksum"``.
+        """
+        self.last_msg = json.loads(message) if isinstance(message, str) else message
         if "board" in self.last_msg:
             # Update internal field state from server's board
             board = self.last_msg["board"]
             for y in range(len(board)):
                 for x in range(len(board[y])):
                     self.field.cells[y][x] = board[y][x]
+        elif "place" in self.last_msg:
+            # 置かれたセルだけを反映する
+            y, x = self.last_msg["place"]
+            self.field.cells[y][x] = self.last_msg["owner"]
+        if "checksum" in self.last_msg and self.field.checksum() != self.last_msg["checksum"]:
+            raise RuntimeError("Board out of sync with the server")
     
     def get_placement_json(self, position: Tuple[int, int]) -> str:
         return json.dumps({"place": list(position)})
 
 
-def play_game(host: str, port: int, player: LifePlayer):
+def play_game(host: str, port: int, player: LifePlayer, options: Iterable[str] = ()):
+    """Play one game on the server at ``host``:``port``.
+
+    ``options`` are protocol options to ask the server for, such as
+    ``protocol.option_delta`` or ``protocol.option_binary``; servers that
+    do not know them ignore them.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.connect((host, port))
         with sock.makefile(mode='rw', buffering=1) as sockfile:
@@ -50,12 +88,41 @@ def play_game(host: str, port: int, player: LifePlayer):
             logging.debug(f'< {greeting}')
             assert greeting == protocol.greeting
             logging.info(f'connect to server with name {player.name()}')
-            sockfile.write(player.name() + '\n')
+            options = list(options)
+            if options:
+                sockfile.write(player.name() + protocol.option_separator + ','.join(options) + '\n')
+            else:
+                sockfile.write(player.name() + '\n')
             
             # Receive field information
             field_info = sockfile.readline()
             field_data = json.loads(field_info)
-            field = LifeField(field_data["height"], field_data["width"])
+            # ルールを知らせないサーバは標準ルール
+            field = LifeField(field_data["height"], field_data["width"], field_data.get("rule"))
+            accepted = field_data.get("options", [])
+            logging.debug(f'Accepted options: {accepted}')
+            
+            if protocol.option_binary in accepted:
+                # ack を送った後はフレームでやり取りする
+                stream = sockfile.buffer
+                stream.write(wire.encode_ack())
+                stream.flush()
+                
+                def receive():
+                    payload = wire.read_frame(stream)
+                    return '' if payload is None else wire.decode(payload)
+                
+                def send_placement(position):
+                    stream.write(wire.encode_placement(position))
+                    stream.flush()
+            else:
+                def receive():
+                    return sockfile.readline()
+                
+                def send_placement(position):
+                    placement_json = player.get_placement_json(position)
+                    logging.debug('> ' + placement_json)
+                    sockfile.write(placement_json + '\n')
             
             # Determine player ID based on connection order
             player_id = protocol.PLAYER1  # Will be updated by server
@@ -65,14 +132,11 @@ def play_game(host: str, port: int, player: LifePlayer):
             
             while True:
                 # Receive game status
-                game_status = sockfile.readline().rstrip()
+                game_status = receive().rstrip()
                 
                 if game_status == protocol.placement:
                     # Placement phase - player's turn
-                    position = player.place_cell()
-                    placement_json = player.get_placement_json(position)
-                    logging.debug('> ' + placement_json)
-                    sockfile.write(placement_json + '\n')
+                    send_placement(player.choose_cell())
                     placement_count += 1
                 elif game_status == protocol.waiting:
                     # Waiting for opponent
@@ -93,13 +157,13 @@ def play_game(host: str, port: int, player: LifePlayer):
                     raise RuntimeError(f"Unexpected status from server: {game_status}")
                 
                 # Receive observation/result
-                observation = sockfile.readline()
+                observation = receive()
                 if not observation:
                     logging.error('Disconnected from server')
                     break
                 
                 player.update(observation)
-                obs_data = json.loads(observation)
+                obs_data = observation if isinstance(observation, dict) else json.loads(observation)
                 
                 # Update player_id if needed
                 if "next_player" in obs_data:
@@ -18,7 +18,18 @@ HEIGHT = 8
 WIDTH = 8
 PLACEMENT_TURNS = 8
 SIMULATION_GENERATIONS = 5
+# 誕生 (B) と生存 (S) の近傍数、誕生時に親の所有者が同数のときの扱い (rule.py)
+RULE = "B3/S23, tie=dead"
 
 DEAD = 0
 PLAYER1 = 1
-PLAYER2 = 2
\ No newline at end of file
+PLAYER2 = 2
+# クライアントは名前の後にタブで区切って、使いたいオプションをカンマ区切りで付けられる。
+# サーバは受け入れたオプションをフィールド情報の "options" で返す
+option_separator = "\t"
+# 配置フェーズの結果を、盤面全体ではなく置いたセル ("place", "owner") で送る
+option_delta = "delta"
+# delta では、この手数ごとに盤面の crc32 ("checksum") を付ける
+CHECKSUM_INTERVAL = 4
+# フィールド情報の後をバイナリのフレームでやり取りする (wire.py)
+option_binary = "binary"
@@ -0,0 +1,104 @@
+"""Life-like rules compiled into transition tables.
+
+A rule is written like ``"B3/S23, tie=dead"``: a dead cell is born when
+its number of live neighbors is listed after ``B``, and a live cell
+survives when it is listed after ``S``.  A newborn cell belongs to the
+player owning most of its live neighbors; ``tie`` (``dead``, ``player1``
+or ``player2``, default ``dead``) decides births with as many PLAYER1 as
+PLAYER2 neighbors, where ``dead`` means no birth.  The game rule is
+``protocol.RULE``.
+
+``compile_rule`` turns a spec into one lookup table, so stepping a cell is
+a table read whatever the rule; tables are cached per rule.
+
+>>> rule = compile_rule("b36 / s23")
+>>> rule.spec
+'B36/S23, tie=dead'
+>>> rule.next_state(protocol.DEAD, 3, 3)
+0
+>>> compile_rule("B36/S23, tie=player2").next_state(protocol.DEAD, 3, 3)
+2
+"""
+from typing import FrozenSet, NamedTuple, Union
+import functools
+import re
+from . import protocol
+
+
+# 近傍の所有者の重み。PLAYER1 の数 + 16 * PLAYER2 の数が遷移表の添字になる
+_NEIGHBOR_WEIGHTS = (0, 1, 16)
+
+_TIES = {
+    'dead': protocol.DEAD,
+    'player1': protocol.PLAYER1,
+    'player2': protocol.PLAYER2,
+}
+
+_SPEC = re.compile(r'\s*B\s*([0-8]*)\s*/\s*S\s*([0-8]*)\s*(?:,\s*tie\s*=\s*(\w+)\s*)?', re.IGNORECASE)
+
+
+class Rule(NamedTuple):
+    """A compiled rule.
+
+    ``transitions[(player1 + 16 * player2) * 3 + cell]`` is the next
+    state of a cell in state ``cell`` with ``player1`` PLAYER1 and
+    ``player2`` PLAYER2 neighbors.
+    """
+    birth: FrozenSet[int]
+    survival: FrozenSet[int]
+    tie: int
+    transitions: bytes
+
+    @property
+    def spec(self) -> str:
+        tie = next(name for name, owner in _TIES.items() if owner == self.tie)
+        return (f"B{''.join(map(str, sorted(self.birth)))}"
+                f"/S{''.join(map(str, sorted(self.survival)))}, tie={tie}")
+
+    def next_state(self, cell: int, player1_count: int, player2_count: int) -> int:
+        return self.transitions[(player1_count + 16 * player2_count) * 3 + cell]
+
+
+def _build_transitions(birth: FrozenSet[int], survival: FrozenSet[int], tie: int) -> bytes:
+    table = bytearray(3 * (8 * 16 + 1))
+    for player1_count in range(9):
+        for player2_count in range(9 - player1_count):
+            alive_count = player1_count + player2_count
+            total = player1_count + 16 * player2_count
+            if alive_count in survival:
+                for cell in (protocol.PLAYER1, protocol.PLAYER2):
+                    table[total * 3 + cell] = cell
+            if alive_count in birth:  # 多数決で誕生
+                if player1_count > player2_count:
+                    table[total * 3] = protocol.PLAYER1
+                elif player1_count < player2_count:
+                    table[total * 3] = protocol.PLAYER2
+                else:
+                    table[total * 3] = tie
+    return bytes(table)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(birth: FrozenSet[int], survival: FrozenSet[int], tie: int) -> Rule:
+    return Rule(birth, survival, tie, _build_transitions(birth, survival, tie))
+
+
+def compile_rule(spec: Union[str, Rule] = protocol.RULE) -> Rule:
+    """Compile a rule spec such as ``"B3/S23, tie=dead"``.
+
+    A ``Rule`` is returned unchanged.  Raises ``ValueError`` on a
+    malformed spec.
+    """
+    if isinstance(spec, Rule):
+        return spec
+    match = _SPEC.fullmatch(spec)
+    if match is None:
+        raise ValueError(f"invalid rule {spec!r}; expected e.g. {protocol.RULE!r}")
+    birth, survival, tie = match.groups()
+    tie = (tie or 'dead').lower()
+    if tie not in _TIES:
+        raise ValueError(f"invalid tie {tie!r} in rule {spec!r}; choose from {', '.join(_TIES)}")
+    return _compile(frozenset(map(int, birth)), frozenset(map(int, survival)), _TIES[tie])
+
+
+STANDARD_RULE = compile_rule(protocol.RULE)
@@ -1,5 +1,10 @@
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
 from .field import LifeField
+from .backend import FieldBackend, create_field
+from .rule import STANDARD_RULE, Rule, compile_rule
 from . import protocol
+from . import wire
+import contextlib
 import socket
 import json
 import logging
@@ -8,20 +13,75 @@ import time
 from . import display # displayモジュールを追加
 
 
+# サーバが受け入れるプロトコルのオプション
+SUPPORTED_OPTIONS = frozenset({protocol.option_delta, protocol.option_binary})
+
+
 class LifeClient:
-    def __init__(self, client_id: int, name: str, sockfile):
+    def __init__(self, client_id: int, name: str, sockfile, options: Iterable[str] = ()):
         self.id = client_id
         self.name = name
         self.placed_count = 0
         self.sockfile = sockfile
+        self.options = frozenset(options)
+    
+    @property
+    def binary(self) -> bool:
+        return protocol.option_binary in self.options
     
     def can_place(self) -> bool:
         return self.placed_count < protocol.PLACEMENT_TURNS
+    
+    def write(self, data: Union[str, bytes]) -> None:
+        """Send a text line, or a frame (``bytes``) to a binary client."""
+        if isinstance(data, bytes):
+            self.sockfile.buffer.write(data)
+            self.sockfile.buffer.flush()
+        else:
+            self.sockfile.write(data + '\n')
+            self.sockfile.flush()
+    
+    def send_status(self, status: str) -> None:
+        self.write(wire.encode_status(status) if self.binary else status)
+    
+    def read_ack(self) -> bool:
+        """Read the ack of a binary client; False if it sent something else."""
+        return wire.is_ack(wire.read_frame(self.sockfile.buffer))
+    
+    def read_placement(self) -> Optional[Tuple[int, int]]:
+        """Position sent by the client, None if it disconnected.
+
+        Raises ``ValueError`` (``json.JSONDecodeError``) or ``KeyError`` on a malformed message.
+        """
+        if self.binary:
+            payload = wire.read_frame(self.sockfile.buffer)
+            return None if payload is None else wire.decode_placement(payload)
+        line = self.sockfile.readline().rstrip()
+        if not line:
+            return None
+        return tuple(json.loads(line)["place"])
+
+
+def send_result(clients: List[LifeClient], result: dict, field: FieldBackend) -> None:
+    """Send a result of ``LifeGameControl`` to ``clients``, encoded once per wire format."""
+    encoded = {}
+    for client in clients:
+        if client.binary not in encoded:
+            encoded[client.binary] = wire.encode_result(result, field) if client.binary else json.dumps(result)
+        client.write(encoded[client.binary])
 
 
 class LifeGameControl:
-    def __init__(self, field: LifeField):
+    def __init__(self, field: FieldBackend, rule: Union[str, Rule, None] = None):
         self.field = field
+        # ルールを変えられるのは LifeField だけ。他の実装は標準ルールで進む
+        if rule is not None:
+            rule = compile_rule(rule)
+            if isinstance(field, LifeField):
+                field.rule = rule
+            elif rule != STANDARD_RULE:
+                raise ValueError(f'{type(field).__name__} only runs the rule {protocol.RULE!r}')
+        self.rule = getattr(field, 'rule', STANDARD_RULE)
         self.clients = []
         self.current_player = 0
     
@@ -31,7 +91,13 @@ class LifeGameControl:
     def get_player_id(self, client_index: int) -> int:
         return protocol.PLAYER1 if client_index == 0 else protocol.PLAYER2
     
-    def place_cell(self, client_index: int, position: tuple):
+    def place_cell(self, client_index: int, position: tuple, board: bool = True):
+        """Place a cell for client ``client_index``; returns the result message or False.
+
+        With ``board=False`` the message carries the placed cell
+        (``"place"``, ``"owner"``) instead of the whole board, and every
+        ``protocol.CHECKSUM_INTERVAL`` placements the board's ``"checksum"``.
+        """
         client = self.clients[client_index]
         player_id = self.get_player_id(client_index)
         
@@ -44,18 +110,34 @@ class LifeGameControl:
         client.placed_count += 1
         self.current_player = 1 - self.current_player
         
-        return {
+        if board:
+            return {
+                "phase": protocol.phase_placement,
+                "board": self.field.get_board_state(),
+                "next_player": self.get_player_id(self.current_player)
+            }
+        result = {
             "phase": protocol.phase_placement,
-            "board": self.field.get_board_state(),
+            "place": list(position),
+            "owner": player_id,
             "next_player": self.get_player_id(self.current_player)
         }
+        if sum(c.placed_count for c in self.clients) % protocol.CHECKSUM_INTERVAL == 0:
+            result["checksum"] = self.field.checksum()
+        return result
+    
+    def sends_delta(self) -> bool:
+        """True when every client accepted delta placement messages."""
+        return all(protocol.option_delta in client.options for client in self.clients)
     
     def is_placement_complete(self) -> bool:
         return all(client.placed_count == protocol.PLACEMENT_TURNS for client in self.clients)
     
     def run_simulation(self) -> dict:
-        for _ in range(protocol.SIMULATION_GENERATIONS):
-            self.field.next_generation()
+        # 固定点や振動子に入ったら残りの世代は計算せずに最終盤面へ進む
+        period = self.field.advance(protocol.SIMULATION_GENERATIONS)
+        if period:
+            logging.debug(f'Board reached a cycle of period {period}')
         
         count1 = self.field.count(protocol.PLAYER1)
         count2 = self.field.count(protocol.PLAYER2)
@@ -82,11 +164,32 @@ class LifeGameControl:
             return 0
 
 
-def server_main(host: str, port: int):
-    field = LifeField()
-    game_control = LifeGameControl(field)
+def parse_name(line: str) -> Tuple[str, FrozenSet[str]]:
+    """Split a name line into the name and the requested options the server supports."""
+    name, _, options = line.partition(protocol.option_separator)
+    return name, frozenset(options.split(',')) & SUPPORTED_OPTIONS
+
+
+def field_info(game_control: LifeGameControl, options: Iterable[str] = ()) -> str:
+    """Field information line sent to a client after its name, with the options accepted."""
+    return json.dumps({
+        "height": game_control.field.height,
+        "width": game_control.field.width,
+        "rule": game_control.rule.spec,
+        "options": sorted(options)
+    })
+
+
+def server_main(host: str, port: int, backend: Optional[str] = None, rule: Optional[str] = None,
+                headless: bool = False):
+    # backend を省略すると環境変数 LIFEGAME_BACKEND か LifeField を使う
+    field = create_field(backend=backend)
+    game_control = LifeGameControl(field, rule)
+    # 盤面の表示は別スレッドの BoardObserver に任せ、headless なら表示しない
+    observer = None if headless else display.BoardObserver()
     
-    with socket.create_server((host, port), reuse_port=False) as server_sock:
+    with socket.create_server((host, port), reuse_port=False) as server_sock, \
+            (observer or contextlib.nullcontext()):
         logging.info(f'Lifegame server listening on {host}:{port}')
         print(f'Lifegame server listening on {host}:{port}')
         sys.stdout.flush()
@@ -107,96 +210,79 @@ def server_main(host: str, port: int):
             sockfile.flush()
             
             # Receive name
-            name = sockfile.readline().rstrip()
+            name, options = parse_name(sockfile.readline().rstrip())
             logging.info(f'Client {i} name: {name}')
             
             # Create client
-            client = LifeClient(i, name, sockfile)
+            client = LifeClient(i, name, sockfile, options)
             clients.append(client)
             game_control.add_client(client)
             
             # Send field information
-            field_info = json.dumps({
-                "height": field.height,
-                "width": field.width
-            })
-            sockfile.write(field_info + '\n')
+            sockfile.write(field_info(game_control, options) + '\n')
             sockfile.flush()
+            # バイナリにするクライアントは、ack を送ってからフレームに切り替える
+            if client.binary and not client.read_ack():
+                logging.error(f'Client {i} did not acknowledge the binary protocol')
+                return
         
         # Placement phase
+        # 両者が delta を受け入れたら、盤面全体の代わりに置いたセルだけを送る
+        board = not game_control.sends_delta()
         while not game_control.is_placement_complete():
             current_client = clients[game_control.current_player]
             waiting_client = clients[1 - game_control.current_player]
             
             # Send turn notification
-            current_client.sockfile.write(protocol.placement + '\n')
-            current_client.sockfile.flush()
-            waiting_client.sockfile.write(protocol.waiting + '\n')
-            waiting_client.sockfile.flush()
+            current_client.send_status(protocol.placement)
+            waiting_client.send_status(protocol.waiting)
             
             # Receive placement from current player
-            placement_json = current_client.sockfile.readline().rstrip()
-            if not placement_json:
-                logging.error(f'Client {current_client.id} disconnected')
-                break
-            
             try:
-                placement_data = json.loads(placement_json)
-                position = tuple(placement_data["place"])
+                position = current_client.read_placement()
+                if position is None:
+                    logging.error(f'Client {current_client.id} disconnected')
+                    break
                 
-                result = game_control.place_cell(current_client.id, position)
+                result = game_control.place_cell(current_client.id, position, board)
                 if result is False:
                     # Invalid placement
-                    current_client.sockfile.write(protocol.you_lose + '\n')
-                    current_client.sockfile.flush()
-                    waiting_client.sockfile.write(protocol.you_win + '\n')
-                    waiting_client.sockfile.flush()
+                    current_client.send_status(protocol.you_lose)
+                    waiting_client.send_status(protocol.you_win)
                     return
                 
                 # Send result to both clients
-                result_json = json.dumps(result) + '\n'
-                for client in clients:
-                    client.sockfile.write(result_json)
-                    client.sockfile.flush()
+                send_result(clients, result, game_control.field)
                 
-                # --- ここから追加 --- 
-                display.print_board(game_control.field.get_board_state(), title="Board after placement")
-                # --- ここまで追加 --- 
+                if observer is not None:
+                    observer.observe(game_control.field, title="Board after placement")
                     
             except (json.JSONDecodeError, KeyError, ValueError) as e:
                 logging.error(f'Invalid placement from client {current_client.id}: {e}')
-                current_client.sockfile.write(protocol.you_lose + '\n')
-                current_client.sockfile.flush()
-                waiting_client.sockfile.write(protocol.you_win + '\n')
-                waiting_client.sockfile.flush()
+                current_client.send_status(protocol.you_lose)
+                waiting_client.send_status(protocol.you_win)
                 return
         
         # Simulation phase
         for client in clients:
-            client.sockfile.write(protocol.simulation + '\n')
-            client.sockfile.flush()
+            client.send_status(protocol.simulation)
         
         # Run simulation step by step
         result = game_control.run_simulation()
-        result_json = json.dumps(result) + '\n'
-        for client in clients:
-            client.sockfile.write(result_json)
-            client.sockfile.flush()
+        send_result(clients, result, game_control.field)
         
-        display.print_board(game_control.field.get_board_state(), title="Board after simulation")
+        if observer is not None:
+            observer.observe(game_control.field, title="Board after simulation")
 
         # Determine and announce winner
         winner = game_control.get_winner()
         
         if winner == -1:
             for client in clients:
-                client.sockfile.write(protocol.draw + '\n')
-                client.sockfile.flush()
+                client.send_status(protocol.draw)
         else:
-            clients[winner].sockfile.write(protocol.you_win + '\n')
-            clients[winner].sockfile.flush()
-            clients[1 - winner].sockfile.write(protocol.you_lose + '\n')
-            clients[1 - winner].sockfile.flush()
+            clients[winner].send_status(protocol.you_win)
+            clients[1 - winner].send_status(protocol.you_lose)
         
         # Clean up
         for client in clients:
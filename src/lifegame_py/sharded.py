@@ -0,0 +1,295 @@
+"""Game server sharded over worker processes sharing one port.
+
+``ShardedServer`` starts N worker processes, each running its own
+``AsyncLifeServer`` event loop on a listening socket bound with
+``SO_REUSEPORT``, so the kernel spreads incoming connections over the
+workers and capacity grows with the cores without a load balancer.  The
+supervisor restarts workers that die and sums the counters every worker
+publishes in shared memory.
+
+Clients are paired inside the worker that accepted them.  So that two
+clients landing in different workers still meet, a worker hands a client
+that waited ``handoff_delay`` seconds without a partner over to worker 0
+(the socket itself is passed through a Unix datagram socket pair, in the
+same message as the client's name), which pairs the clients it is given.
+"""
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import asyncio
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from .async_server import AsyncLifeServer
+
+
+# ワーカーごとに共有配列へ書き出すカウンタ (ServerStats の属性名)
+COUNTERS = ('connections', 'games_started', 'games_finished', 'moves')
+_PUBLISH_INTERVAL = 0.1
+# 引き渡しのメッセージ (名前とオプションの JSON) の最大の大きさ
+_HANDOFF_SIZE = 1 << 16
+
+
+class ShardServer(AsyncLifeServer):
+    """``AsyncLifeServer`` running as worker ``index`` of a ``ShardedServer``.
+
+    ``lobby`` is the list of sockets to receive clients on for worker 0,
+    and the socket to send clients to worker 0 for the others.
+    """
+    def __init__(self, index: int, slots, lobby, handoff_delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+        self.handoff_delay = handoff_delay
+        self._slots = slots
+        self._lobby = lobby
+        self._waiting_since = 0.0
+        # ワーカー 0 へまだ送れていない (名前, メッセージ, writer)
+        self._outbox = collections.deque()
+        self._sending = False
+        if index != 0:
+            lobby.setblocking(False)
+
+    def add_waiting(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    options: FrozenSet[str] = frozenset()) -> None:
+        super().add_waiting(name, reader, writer, options)
+        # 相手を待ち始めた時刻。handoff_delay を過ぎたらワーカー 0 に引き渡す
+        if self._waiting is not None and self._waiting[2] is writer:
+            self._waiting_since = time.monotonic()
+
+    def publish(self) -> None:
+        base = self.index * len(COUNTERS)
+        for i, name in enumerate(COUNTERS):
+            self._slots[base + i] = getattr(self.stats, name)
+
+    async def housekeeping(self) -> None:
+        while True:
+            self.publish()
+            if (self.index != 0 and self._waiting is not None
+                    and time.monotonic() - self._waiting_since >= self.handoff_delay):
+                self._hand_off()
+            await asyncio.sleep(_PUBLISH_INTERVAL)
+
+    def _hand_off(self) -> None:
+        name, reader, writer, options = self._waiting
+        self._waiting = None
+        if reader.at_eof() or writer.is_closing():
+            writer.close()
+            return
+        # 名前と fd を 1 つのメッセージで送るので、途中で止まっても半端に届かない
+        message = json.dumps({"name": name, "options": sorted(options)}).encode()
+        self._outbox.append((name, message, writer))
+        if len(self._outbox) == 1:
+            self._send_outbox()
+
+    def _send_outbox(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._outbox:
+            name, message, writer = self._outbox[0]
+            sock = writer.get_extra_info('socket')
+            try:
+                socket.send_fds(self._lobby, [message], [sock.fileno()])
+                logging.debug(f'Handed {name} over to worker 0')
+            except (BlockingIOError, InterruptedError):
+                # ワーカー 0 の受信キューが一杯。送れるようになったら続きを送る
+                if not self._sending:
+                    loop.add_writer(self._lobby.fileno(), self._send_outbox)
+                    self._sending = True
+                return
+            except OSError as e:
+                logging.warning(f'Could not hand {name} over to worker 0: {e}')
+            self._outbox.popleft()
+            # 閉じるのはこのプロセスの fd だけで、接続はワーカー 0 に残る
+            writer.close()
+        if self._sending:
+            loop.remove_writer(self._lobby.fileno())
+            self._sending = False
+
+    def listen_lobby(self) -> None:
+        loop = asyncio.get_running_loop()
+        for conn in self._lobby:
+            conn.setblocking(False)
+            loop.add_reader(conn.fileno(), self._receive, conn)
+
+    def _receive(self, conn: socket.socket) -> None:
+        try:
+            message, fds, flags, _ = socket.recv_fds(conn, _HANDOFF_SIZE, 1)
+        except (BlockingIOError, InterruptedError):
+            return
+        try:
+            if len(fds) != 1 or flags & (socket.MSG_TRUNC | socket.MSG_CTRUNC):
+                raise ValueError('expected one socket')
+            handoff = json.loads(message)
+            name, options = handoff["name"], frozenset(handoff["options"])
+        except (ValueError, KeyError, TypeError) as e:
+            for fd in fds:
+                os.close(fd)
+            logging.warning(f'Dropped a malformed handoff message: {e}')
+            return
+        sock = socket.socket(fileno=fds[0])
+        asyncio.ensure_future(self._adopt(name, options, sock))
+
+    async def _adopt(self, name: str, options: FrozenSet[str], sock: socket.socket) -> None:
+        reader, writer = await asyncio.open_connection(sock=sock)
+        self.add_waiting(name, reader, writer, options)
+
+
+def _run_worker(index: int, host: str, port: int, options: dict, slots, lobby,
+                handoff_delay: float, ready) -> None:
+    # Ctrl-C は監督プロセスが受けて、SIGTERM でワーカーを止める
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve_worker(index, host, port, options, slots, lobby, handoff_delay, ready))
+
+
+async def _serve_worker(index, host, port, options, slots, lobby, handoff_delay, ready) -> None:
+    server = ShardServer(index, slots, lobby, handoff_delay, **options)
+    loop = asyncio.get_running_loop()
+    listening = loop.create_future()
+    serving = asyncio.ensure_future(server.serve(host, port, listening, reuse_port=True))
+    await asyncio.wait([listening, serving], return_when=asyncio.FIRST_COMPLETED)
+    if serving.done():
+        serving.result()  # 待ち受けに失敗した
+        return
+    if index == 0:
+        server.listen_lobby()
+    housekeeping = asyncio.ensure_future(server.housekeeping())
+    loop.add_signal_handler(signal.SIGTERM, server.stop)
+    ready.set()
+    try:
+        await serving
+    finally:
+        housekeeping.cancel()
+        server.publish()
+
+
+class ShardedServer:
+    """Supervisor of ``workers`` game server processes on one port.
+
+    ``start()`` binds the port (``port`` 0 picks a free one) and waits
+    until every worker listens; ``poll()`` restarts dead workers;
+    ``counters()`` sums the workers' counters.
+    """
+    def __init__(self, host: str, port: int, workers: Optional[int] = None,
+                 backend: Optional[str] = None, rule: Optional[str] = None,
+                 move_timeout: Optional[float] = None, handoff_delay: float = 0.5):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.handoff_delay = handoff_delay
+        self.restarts = 0
+        self._options = {"backend": backend, "rule": rule, "move_timeout": move_timeout}
+        self._context = multiprocessing.get_context()
+        self._slots = self._context.Array('q', self.workers * len(COUNTERS), lock=False)
+        self._retired = dict.fromkeys(COUNTERS, 0)  # 再起動したワーカーの分
+        # ワーカー 0 とそれ以外をつなぐソケットペア。データグラムなのでメッセージ単位で届く
+        pipes = [socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM) for _ in range(1, self.workers)]
+        self._lobby_ends = [lobby_end for lobby_end, _ in pipes]
+        self._worker_ends = [worker_end for _, worker_end in pipes]
+        self._processes: List[Optional[multiprocessing.Process]] = [None] * self.workers
+        self._placeholder: Optional[socket.socket] = None
+
+    def start(self) -> Tuple[str, int]:
+        """Start the workers; returns the (host, port) they listen on."""
+        # ポート 0 を 1 つに決めるため、SO_REUSEPORT 付きでバインドだけしたソケットを持っておく
+        family, kind, proto, _, address = socket.getaddrinfo(
+            self.host, self.port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)[0]
+        self._placeholder = socket.socket(family, kind, proto)
+        self._placeholder.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._placeholder.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self._placeholder.bind(address)
+        self.port = self._placeholder.getsockname()[1]
+        for index in range(self.workers):
+            self._spawn(index)
+        logging.info(f'Lifegame server listening on {self.host}:{self.port} with {self.workers} workers')
+        return self.host, self.port
+
+    def _spawn(self, index: int) -> None:
+        lobby = self._lobby_ends if index == 0 else self._worker_ends[index - 1]
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_run_worker, name=f'lifegame-worker-{index}', daemon=True,
+            args=(index, self.host, self.port, self._options, self._slots, lobby,
+                  self.handoff_delay, ready))
+        process.start()
+        self._processes[index] = process
+        if not ready.wait(timeout=30):
+            self.stop()
+            raise RuntimeError(f'worker {index} did not start listening on {self.host}:{self.port}')
+
+    def poll(self) -> int:
+        """Restart the workers that have exited; returns how many were restarted."""
+        restarted = 0
+        for index, process in enumerate(self._processes):
+            if process is None or process.is_alive():
+                continue
+            logging.warning(f'Worker {index} exited with code {process.exitcode}; restarting it')
+            base = index * len(COUNTERS)
+            for i, name in enumerate(COUNTERS):
+                self._retired[name] += self._slots[base + i]
+                self._slots[base + i] = 0
+            self._spawn(index)
+            self.restarts += 1
+            restarted += 1
+        return restarted
+
+    def counters(self) -> Dict[str, int]:
+        """Counters summed over the workers, including the restarted ones."""
+        totals = dict(self._retired)
+        in_progress = 0
+        for index in range(self.workers):
+            values = dict(zip(COUNTERS, self._slots[index * len(COUNTERS):(index + 1) * len(COUNTERS)]))
+            for name in COUNTERS:
+                totals[name] += values[name]
+            in_progress += values['games_started'] - values['games_finished']
+        totals['games_in_progress'] = in_progress
+        totals['workers_alive'] = sum(1 for p in self._processes if p is not None and p.is_alive())
+        totals['restarts'] = self.restarts
+        return totals
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop the workers, letting them finish their matches for up to ``timeout`` seconds."""
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is not None:
+                process.join(max(deadline - time.monotonic(), 0))
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+        if self._placeholder is not None:
+            self._placeholder.close()
+            self._placeholder = None
+
+    def serve_forever(self, report_interval: float = 10.0) -> None:
+        """Start, then supervise until interrupted (SIGINT or SIGTERM), logging the counters."""
+        def interrupt(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, interrupt)
+        self.start()
+        next_report = time.monotonic() + report_interval
+        try:
+            while True:
+                time.sleep(1)
+                self.poll()
+                if time.monotonic() >= next_report:
+                    logging.info(f'Server counters: {self.counters()}')
+                    next_report += report_interval
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            logging.info(f'Server counters: {self.counters()}')
+
+
+def sharded_server_main(host: str, port: int, workers: Optional[int] = None,
+                        backend: Optional[str] = None, rule: Optional[str] = None,
+                        move_timeout: Optional[float] = None) -> None:
+    server = ShardedServer(host, port, workers, backend, rule, move_timeout)
+    print(f'Lifegame server listening on {host}:{port} with {server.workers} workers')
+    sys.stdout.flush()
+    server.serve_forever()
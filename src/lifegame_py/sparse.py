@@ -0,0 +1,98 @@
+from typing import Dict, List, Tuple
+from . import protocol
+from .backend import FieldBackend
+from .field import _NEIGHBOR_WEIGHTS, _TRANSITIONS
+
+
+_OFFSETS = tuple((dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+
+
+class SparseLifeField(FieldBackend):
+    """Field that stores only its live cells.
+
+    ``live`` maps (y, x) to the owner of every live cell.  A generation
+    only visits live cells and their neighbors, so its cost follows the
+    population instead of ``height * width``.
+    """
+    __slots__ = ('height', 'width', 'live', '_counts')
+
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH):
+        self.height = height
+        self.width = width
+        self.live: Dict[Tuple[int, int], int] = {}
+        self._counts = [0, 0, 0]  # [未使用, PLAYER1, PLAYER2]
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> 'SparseLifeField':
+        field = cls(len(board), len(board[0]) if board else 0)
+        for y, row in enumerate(board):
+            for x, owner in enumerate(row):
+                if owner != protocol.DEAD:
+                    field.live[(y, x)] = owner
+                    field._counts[owner] += 1
+        return field
+
+    def clone(self) -> 'SparseLifeField':
+        field = SparseLifeField(self.height, self.width)
+        field.live = self.live.copy()
+        field._counts = self._counts[:]
+        return field
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def get(self, pos: Tuple[int, int]) -> int:
+        return self.live.get(pos, protocol.DEAD)
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        if (y, x) in self.live:
+            return False
+        if owner != protocol.DEAD:
+            self.live[(y, x)] = owner
+            self._counts[owner] += 1
+        return True
+
+    def next_generation(self) -> None:
+        height, width = self.height, self.width
+        weights = _NEIGHBOR_WEIGHTS
+        transitions = _TRANSITIONS
+
+        # 近傍の PLAYER1 を 1、PLAYER2 を 16 として足し込む
+        totals: Dict[Tuple[int, int], int] = {}
+        get = totals.get
+        for (y, x), owner in self.live.items():
+            weight = weights[owner]
+            for dy, dx in _OFFSETS:
+                ny, nx = y + dy, x + dx
+                if 0 <= ny < height and 0 <= nx < width:
+                    pos = (ny, nx)
+                    totals[pos] = get(pos, 0) + weight
+
+        # 近傍に生存セルがないセルは死ぬか死んだままなので、totals だけを見ればよい
+        live = self.live
+        new_live = {}
+        counts = [0, 0, 0]
+        for pos, total in totals.items():
+            owner = transitions[total * 3 + live.get(pos, protocol.DEAD)]
+            if owner:
+                new_live[pos] = owner
+                counts[owner] += 1
+        self.live = new_live
+        self._counts = counts
+
+    def count(self, owner: int) -> int:
+        if owner == protocol.DEAD:
+            return self.height * self.width - len(self.live)
+        if owner in (protocol.PLAYER1, protocol.PLAYER2):
+            return self._counts[owner]
+        return 0
+
+    def get_board_state(self) -> List[List[int]]:
+        board = [[protocol.DEAD] * self.width for _ in range(self.height)]
+        for (y, x), owner in self.live.items():
+            board[y][x] = owner
+        return board
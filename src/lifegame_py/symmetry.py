@@ -0,0 +1,163 @@
+"""Rotations and reflections of the board.
+
+The rule only looks at neighbor counts, so rotating or mirroring a board
+commutes with ``next_generation``.  A square board has the 8 symmetries
+of the dihedral group; other boards only the 4 that keep their shape.
+
+Transforms are numbered 0-7 and map a cell (y, x) of a height x width
+board to:
+
+    0: (y, x)                  4: (y, w-1-x)
+    1: (x, h-1-y)   rot 90     5: (h-1-y, x)
+    2: (h-1-y, w-1-x)          6: (x, y)
+    3: (w-1-x, y)   rot 270    7: (w-1-x, h-1-y)
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import operator
+from . import protocol
+
+
+IDENTITY = 0
+_INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+def transform_position(pos: Tuple[int, int], transform: int, height: int, width: int) -> Tuple[int, int]:
+    y, x = pos
+    if transform == 0:
+        return y, x
+    if transform == 1:
+        return x, height - 1 - y
+    if transform == 2:
+        return height - 1 - y, width - 1 - x
+    if transform == 3:
+        return width - 1 - x, y
+    if transform == 4:
+        return y, width - 1 - x
+    if transform == 5:
+        return height - 1 - y, x
+    if transform == 6:
+        return x, y
+    if transform == 7:
+        return width - 1 - x, height - 1 - y
+    raise ValueError(f"unknown transform: {transform}")
+
+
+def inverse(transform: int) -> int:
+    return _INVERSE[transform]
+
+
+def transforms(height: int, width: int) -> Tuple[int, ...]:
+    """Transforms that map a height x width board onto itself."""
+    if height == width:
+        return (0, 1, 2, 3, 4, 5, 6, 7)
+    return (0, 2, 4, 5)
+
+
+# (height, width, transform) -> 変換後の盤面の各セルを元の盤面から取り出す itemgetter
+_GATHERS: Dict[Tuple[int, int, int], Callable] = {}
+
+
+def _gather(height: int, width: int, transform: int) -> Callable:
+    key = (height, width, transform)
+    gather = _GATHERS.get(key)
+    if gather is None:
+        sources = [0] * (height * width)
+        for y in range(height):
+            for x in range(width):
+                ty, tx = transform_position((y, x), transform, height, width)
+                sources[ty * width + tx] = y * width + x
+        if len(sources) == 1:
+            gather = lambda cells: (cells[0],)
+        else:
+            gather = operator.itemgetter(*sources)
+        _GATHERS[key] = gather
+    return gather
+
+
+def _flatten(board) -> Tuple[bytes, int, int]:
+    # LifeField は snapshot() で、入れ子のリストは行ごとに平らにする
+    snapshot = getattr(board, 'snapshot', None)
+    if snapshot is not None:
+        return snapshot(), board.height, board.width
+    height = len(board)
+    width = len(board[0]) if height else 0
+    return bytes(cell for row in board for cell in row), height, width
+
+
+def _transform_cells(cells: bytes, height: int, width: int, transform: int) -> bytes:
+    if not cells:
+        return cells
+    return bytes(_gather(height, width, transform)(cells))
+
+
+def _rows(cells: bytes, width: int) -> List[List[int]]:
+    return [list(cells[i:i + width]) for i in range(0, len(cells), width)]
+
+
+def apply_transform(board, transform: int) -> List[List[int]]:
+    """Return ``board`` (nested lists or a ``LifeField``) transformed."""
+    cells, height, width = _flatten(board)
+    if transform not in transforms(height, width):
+        raise ValueError(f"transform {transform} does not fit a {height}x{width} board")
+    return _rows(_transform_cells(cells, height, width, transform), width)
+
+
+def canonical_form(board) -> Tuple[List[List[int]], int]:
+    """Return the canonical representative of ``board`` and its transform.
+
+    The representative is the lexicographically smallest row-major board
+    among all symmetric images, so symmetric boards share it.
+    ``apply_transform(board, transform)`` equals the representative, and
+    ``transform_position(pos, inverse(transform), ...)`` maps a cell of
+    the representative back to ``board``.
+    """
+    cells, height, width = _flatten(board)
+    best, best_transform = _canonical(cells, height, width)
+    return _rows(best, width), best_transform
+
+
+def _canonical(cells: bytes, height: int, width: int) -> Tuple[bytes, int]:
+    best, best_transform = cells, IDENTITY
+    for transform in transforms(height, width)[1:]:
+        image = _transform_cells(cells, height, width, transform)
+        if image < best:
+            best, best_transform = image, transform
+    return best, best_transform
+
+
+def _symmetries(cells: bytes, height: int, width: int) -> List[int]:
+    return [transform for transform in transforms(height, width)[1:]
+            if _transform_cells(cells, height, width, transform) == cells]
+
+
+def symmetries(board) -> List[int]:
+    """Transforms other than the identity that leave ``board`` unchanged."""
+    return _symmetries(*_flatten(board))
+
+
+def unique_moves(board, moves: Optional[Sequence[Tuple[int, int]]] = None) -> List[Tuple[int, int]]:
+    """Drop moves that are symmetric images of an earlier move.
+
+    ``moves`` defaults to every empty cell in row-major order.  Two moves
+    are equivalent when a symmetry of ``board`` maps one onto the other;
+    they lead to symmetric boards and hence equal outcomes, so only the
+    first of each class is kept.  On the empty 8x8 board 64 moves
+    collapse into 10.
+    """
+    cells, height, width = _flatten(board)
+    if moves is None:
+        moves = [(i // width, i % width) for i, cell in enumerate(cells) if cell == protocol.DEAD]
+    stabilizer = _symmetries(cells, height, width)
+    if not stabilizer:
+        return list(moves)
+
+    unique = []
+    seen = set()
+    for pos in moves:
+        pos = tuple(pos)
+        if pos in seen:
+            continue
+        unique.append(pos)
+        for transform in stabilizer:
+            seen.add(transform_position(pos, transform, height, width))
+    return unique
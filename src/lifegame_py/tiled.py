@@ -0,0 +1,110 @@
+from typing import List, Set, Tuple
+from . import protocol
+from .backend import FieldBackend
+
+
+class ActiveTileField(FieldBackend):
+    """Field that only re-evaluates tiles touched by the previous generation.
+
+    The board is split into ``tile_size`` x ``tile_size`` tiles.  A tile is
+    active when one of its cells, or a cell bordering it, changed in the
+    previous generation (or was placed).  Every other cell saw the same
+    neighborhood as last time and therefore keeps its state, so empty and
+    settled regions are carried over without any work.
+
+    Cells written directly through ``cells[y][x]`` must be reported with
+    ``touch()``.
+    """
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH,
+                 tile_size: int = 8):
+        if tile_size < 1:
+            raise ValueError(f"tile_size must be positive: {tile_size}")
+        self.height = height
+        self.width = width
+        self.tile_size = tile_size
+        self.cells = [[protocol.DEAD] * width for _ in range(height)]
+        self.active: Set[Tuple[int, int]] = set()
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], tile_size: int = 8) -> 'ActiveTileField':
+        field = cls(len(board), len(board[0]) if board else 0, tile_size)
+        for y in range(field.height):
+            for x in range(field.width):
+                if board[y][x] != protocol.DEAD:
+                    field.cells[y][x] = board[y][x]
+                    field.touch((y, x))
+        return field
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def touch(self, pos: Tuple[int, int]) -> None:
+        """Mark the tiles whose cells can see ``pos`` as active."""
+        y, x = pos
+        size = self.tile_size
+        for ty in range(max(y - 1, 0) // size, min(y + 1, self.height - 1) // size + 1):
+            for tx in range(max(x - 1, 0) // size, min(x + 1, self.width - 1) // size + 1):
+                self.active.add((ty, tx))
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        if self.cells[y][x] != protocol.DEAD:
+            return False
+        self.cells[y][x] = owner
+        self.touch(pos)
+        return True
+
+    def _next_state(self, y: int, x: int) -> int:
+        cells = self.cells
+        player1_count = 0
+        player2_count = 0
+        for ny in range(max(y - 1, 0), min(y + 2, self.height)):
+            row = cells[ny]
+            for nx in range(max(x - 1, 0), min(x + 2, self.width)):
+                owner = row[nx]
+                if owner == protocol.PLAYER1:
+                    player1_count += 1
+                elif owner == protocol.PLAYER2:
+                    player2_count += 1
+
+        cell = cells[y][x]
+        if cell == protocol.PLAYER1:
+            player1_count -= 1
+        elif cell == protocol.PLAYER2:
+            player2_count -= 1
+        alive_count = player1_count + player2_count
+
+        if cell > 0:  # 生存セル
+            return cell if 2 <= alive_count <= 3 else protocol.DEAD
+        if alive_count == 3:  # 多数決で誕生
+            if player1_count > player2_count:
+                return protocol.PLAYER1
+            if player1_count < player2_count:
+                return protocol.PLAYER2
+        return protocol.DEAD
+
+    def next_generation(self) -> None:
+        size = self.tile_size
+        changes = []
+        for ty, tx in self.active:
+            for y in range(ty * size, min((ty + 1) * size, self.height)):
+                row = self.cells[y]
+                for x in range(tx * size, min((tx + 1) * size, self.width)):
+                    new_cell = self._next_state(y, x)
+                    if new_cell != row[x]:
+                        changes.append((y, x, new_cell))
+
+        # 変化したセルを反映し、次の世代で再評価が必要なタイルだけを残す
+        self.active = set()
+        for y, x, new_cell in changes:
+            self.cells[y][x] = new_cell
+            self.touch((y, x))
+
+    def count(self, owner: int) -> int:
+        return sum(row.count(owner) for row in self.cells)
+
+    def get_board_state(self) -> List[List[int]]:
+        return [row[:] for row in self.cells]
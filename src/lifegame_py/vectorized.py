@@ -0,0 +1,152 @@
+from typing import List, Tuple
+from . import protocol
+from .backend import FieldBackend
+
+try:
+    import numpy as np
+except ImportError:  # numpy は任意依存
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "numpy is required for lifegame_py.vectorized "
+            "(pip install 'lifegame-py[numpy]')")
+
+
+# 所有者を 1 バイトに符号化して近傍和を一度で取る: 下位 4bit が PLAYER1, 上位 4bit が PLAYER2
+_P2_SHIFT = 4
+_P1_MASK = (1 << _P2_SHIFT) - 1
+_OWNER_CODE = None
+
+
+def _owner_code(cells):
+    global _OWNER_CODE
+    if _OWNER_CODE is None:
+        _OWNER_CODE = np.zeros(3, dtype=np.uint8)
+        _OWNER_CODE[protocol.PLAYER1] = 1
+        _OWNER_CODE[protocol.PLAYER2] = 1 << _P2_SHIFT
+    return _OWNER_CODE[cells]
+
+
+def _box_sum(code):
+    # 3x3 の和 (中央を含む)。盤面外は DEAD として扱う
+    shape = code.shape[:-2] + (code.shape[-2] + 2, code.shape[-1] + 2)
+    padded = np.zeros(shape, dtype=np.uint8)
+    padded[..., 1:-1, 1:-1] = code
+    rows = padded[..., :, :-2] + padded[..., :, 1:-1]
+    rows += padded[..., :, 2:]
+    box = rows[..., :-2, :] + rows[..., 1:-1, :]
+    box += rows[..., 2:, :]
+    return box
+
+
+def neighbor_counts(cells):
+    """Return (player1, player2) neighbor counts of every cell.
+
+    ``cells`` is an integer array whose last two axes are (height, width);
+    any leading axes are treated as a batch of independent boards.
+    """
+    _require_numpy()
+    code = _owner_code(cells)
+    total = _box_sum(code) - code
+    return total & _P1_MASK, total >> _P2_SHIFT
+
+
+def step(cells):
+    """Return the next generation of ``cells`` without modifying it.
+
+    Same rule as ``LifeField.next_generation``; works on a single
+    (height, width) board or on a stack of boards.
+    """
+    _require_numpy()
+    box = _box_sum(_owner_code(cells))
+    # 自分自身を含めた数: 生存セルなら近傍数 + 1
+    player1_count = box & _P1_MASK
+    alive_count = player1_count + (box >> _P2_SHIFT)
+
+    # 4: 生存セルは近傍 3 で生存継続、死亡セルは近傍 4 で DEAD のまま
+    new_cells = np.where(alive_count == 4, cells, protocol.DEAD).astype(cells.dtype, copy=False)
+    # 3: 生存セルは近傍 2 で生存継続、死亡セルは近傍 3 で誕生
+    three = alive_count == 3
+    np.copyto(new_cells, cells, where=three)
+    # 近傍がちょうど 3 なので多数決は同数にならない
+    born = three & (cells == protocol.DEAD)
+    new_cells[born & (player1_count >= 2)] = protocol.PLAYER1
+    new_cells[born & (player1_count < 2)] = protocol.PLAYER2
+    return new_cells
+
+
+class NumpyLifeField(FieldBackend):
+    """Array-backed field that steps the whole board at once."""
+    @classmethod
+    def is_available(cls) -> bool:
+        return np is not None
+
+    def __init__(self, height: int = protocol.HEIGHT, width: int = protocol.WIDTH):
+        _require_numpy()
+        self.height = height
+        self.width = width
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> 'NumpyLifeField':
+        field = cls(len(board), len(board[0]) if board else 0)
+        field.cells[...] = board
+        return field
+
+    def place(self, owner: int, pos: Tuple[int, int]) -> bool:
+        self._check_owner(owner)
+        y, x = pos
+        if not self._is_valid_position(y, x):
+            return False
+        if self.cells[y, x] != protocol.DEAD:
+            return False
+        self.cells[y, x] = owner
+        return True
+
+    def _is_valid_position(self, y: int, x: int) -> bool:
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def next_generation(self) -> None:
+        self.cells = step(self.cells)
+
+    def count(self, owner: int) -> int:
+        return int(np.count_nonzero(self.cells == owner))
+
+    def get_board_state(self) -> List[List[int]]:
+        return self.cells.tolist()
+
+
+def simulate_batch(boards, generations: int = protocol.SIMULATION_GENERATIONS):
+    """Advance a stack of boards by ``generations`` in one call.
+
+    ``boards`` is anything convertible to an (N, height, width) array.
+    Returns ``(boards, counts)`` where ``counts[i, owner]`` is the number
+    of cells of ``owner`` (DEAD, PLAYER1 or PLAYER2) on board ``i``.
+    """
+    _require_numpy()
+    cells = np.array(boards, dtype=np.uint8)
+    if cells.ndim != 3:
+        raise ValueError(f"expected an (N, height, width) stack of boards, got shape {cells.shape}")
+    for _ in range(generations):
+        cells = step(cells)
+    counts = np.stack([np.count_nonzero(cells == owner, axis=(1, 2))
+                       for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2)], axis=1)
+    return cells, counts
+
+
+def placement_boards(board, owner: int):
+    """Return ``(positions, boards)`` for every legal placement of ``owner``.
+
+    ``boards[i]`` is ``board`` with a cell of ``owner`` placed at
+    ``positions[i]``; feed it to :func:`simulate_batch` to score all
+    candidate moves at once.
+    """
+    _require_numpy()
+    cells = np.asarray(board, dtype=np.uint8)
+    ys, xs = np.nonzero(cells == protocol.DEAD)
+    boards = np.repeat(cells[np.newaxis], len(ys), axis=0)
+    boards[np.arange(len(ys)), ys, xs] = owner
+    return list(zip(ys.tolist(), xs.tolist())), boards
@@ -0,0 +1,185 @@
+"""Binary framed encoding of the game messages (the ``binary`` option).
+
+A client asking for ``protocol.option_binary`` on its name line keeps
+the text protocol until it has read the field information; if the
+option was accepted, it answers with an ``ACK`` frame and from then on
+both sides exchange frames only.  The server sends nothing between the
+field information and the ack, so neither side has binary data stuck
+in a text buffer when it switches.
+
+A frame is a 4-byte big-endian payload length and the payload, whose
+first byte is the kind.  Boards are packed 2 bits per cell, four cells
+per byte, row-major with the first cell in the low bits.  ``decode``
+returns the same values as the text protocol: a status string or the
+dict the JSON message would have been.
+
+>>> decode(encode_status(protocol.waiting)[4:])
+'waiting'
+>>> decode(encode_placement((3, 5))[4:])
+{'place': [3, 5]}
+>>> unpack_board(pack_board(bytes([0, 1, 2, 1, 2])), 5)
+b'\\x00\\x01\\x02\\x01\\x02'
+"""
+from typing import Optional, Tuple, Union
+import asyncio
+import struct
+from . import protocol
+
+
+# フレームの種類 (ペイロードの先頭のバイト)
+STATUS = 0
+PLACE = 1
+BOARD = 2
+DELTA = 3
+RESULT = 4
+ACK = 5
+
+STATUSES = (protocol.placement, protocol.waiting, protocol.simulation,
+            protocol.you_win, protocol.you_lose, protocol.draw)
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+MAX_FRAME = 1 << 26
+
+_LENGTH = struct.Struct('!I')
+_PLACE = struct.Struct('!BII')           # kind, y, x
+_BOARD = struct.Struct('!BBII')          # kind, next_player, height, width + 盤面
+_DELTA = struct.Struct('!BIIBB')         # kind, y, x, owner, next_player
+_DELTA_CHECKSUM = struct.Struct('!BIIBBI')  # 上に crc32 を付けたもの
+_RESULT = struct.Struct('!BIIII')        # kind, PLAYER1 の数, PLAYER2 の数, height, width + 盤面
+
+# 4 セルを 1 バイトに詰めるときの、各セルの値をずらす表と取り出す表
+_SHIFT = [bytes((value << (2 * k)) & 0xff for value in range(256)) for k in range(4)]
+_EXTRACT = [bytes((value >> (2 * k)) & 3 for value in range(256)) for k in range(4)]
+
+
+def pack_board(cells: bytes) -> bytes:
+    """Pack row-major cells (0-2 each) into 2 bits per cell."""
+    size = (len(cells) + 3) // 4
+    cells = bytes(cells) + bytes(4 * size - len(cells))
+    # 4 つおきに取り出した列を多倍長整数にして、ずらした値を OR でまとめる
+    packed = 0
+    for k in range(4):
+        packed |= int.from_bytes(cells[k::4].translate(_SHIFT[k]), 'big')
+    return packed.to_bytes(size, 'big')
+
+
+def unpack_board(packed: bytes, cells: int) -> bytes:
+    """Inverse of ``pack_board``: the first ``cells`` cells."""
+    board = bytearray(4 * len(packed))
+    for k in range(4):
+        board[k::4] = packed.translate(_EXTRACT[k])
+    return bytes(board[:cells])
+
+
+def _frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_status(status: str) -> bytes:
+    return _frame(bytes((STATUS, _STATUS_CODES[status])))
+
+
+def encode_placement(position: Tuple[int, int]) -> bytes:
+    return _frame(_PLACE.pack(PLACE, *position))
+
+
+def encode_ack() -> bytes:
+    return _frame(bytes((ACK,)))
+
+
+def encode_result(result: dict, field) -> bytes:
+    """Frame of a result from ``LifeGameControl`` for the game on ``field``.
+
+    A placement result with ``"place"`` becomes a delta; otherwise the
+    board is packed from ``field.snapshot()``, so ``result`` need not
+    carry it.
+    """
+    if result["phase"] == protocol.phase_life_result:
+        header = _RESULT.pack(RESULT, result["count"]["1"], result["count"]["2"], field.height, field.width)
+        return _frame(header + pack_board(field.snapshot()))
+    if "place" in result:
+        y, x = result["place"]
+        if "checksum" in result:
+            return _frame(_DELTA_CHECKSUM.pack(DELTA, y, x, result["owner"], result["next_player"],
+                                               result["checksum"]))
+        return _frame(_DELTA.pack(DELTA, y, x, result["owner"], result["next_player"]))
+    header = _BOARD.pack(BOARD, result["next_player"], field.height, field.width)
+    return _frame(header + pack_board(field.snapshot()))
+
+
+def _board(payload: bytes, offset: int, height: int, width: int) -> list:
+    cells = unpack_board(payload[offset:], height * width)
+    return [list(cells[y * width:(y + 1) * width]) for y in range(height)]
+
+
+def decode(payload: bytes) -> Union[str, dict]:
+    """Status string or message dict of a frame payload; ``ValueError`` if malformed."""
+    try:
+        kind = payload[0]
+        if kind == STATUS:
+            return STATUSES[payload[1]]
+        if kind == PLACE:
+            _, y, x = _PLACE.unpack(payload)
+            return {"place": [y, x]}
+        if kind == BOARD:
+            _, next_player, height, width = _BOARD.unpack_from(payload)
+            return {"phase": protocol.phase_placement,
+                    "board": _board(payload, _BOARD.size, height, width),
+                    "next_player": next_player}
+        if kind == DELTA:
+            if len(payload) == _DELTA_CHECKSUM.size:
+                _, y, x, owner, next_player, checksum = _DELTA_CHECKSUM.unpack(payload)
+                return {"phase": protocol.phase_placement, "place": [y, x], "owner": owner,
+                        "next_player": next_player, "checksum": checksum}
+            _, y, x, owner, next_player = _DELTA.unpack(payload)
+            return {"phase": protocol.phase_placement, "place": [y, x], "owner": owner,
+                    "next_player": next_player}
+        if kind == RESULT:
+            _, count1, count2, height, width = _RESULT.unpack_from(payload)
+            return {"phase": protocol.phase_life_result,
+                    "board": _board(payload, _RESULT.size, height, width),
+                    "count": {"1": count1, "2": count2}}
+        if kind == ACK and len(payload) == 1:
+            return {"ack": True}
+    except (IndexError, struct.error) as e:
+        raise ValueError(f'malformed frame: {e}') from None
+    raise ValueError(f'unknown frame kind {kind}')
+
+
+def is_ack(payload: Optional[bytes]) -> bool:
+    return payload == bytes((ACK,))
+
+
+def decode_placement(payload: bytes) -> Tuple[int, int]:
+    message = decode(payload)
+    if not isinstance(message, dict) or "place" not in message or len(message) != 1:
+        raise ValueError(f'expected a placement, got {message!r}')
+    return tuple(message["place"])
+
+
+def _check_length(header: bytes) -> int:
+    (length,) = _LENGTH.unpack(header)
+    if not 0 < length <= MAX_FRAME:
+        raise ValueError(f'bad frame length {length}')
+    return length
+
+
+def read_frame(stream) -> Optional[bytes]:
+    """Payload of the next frame from a binary file; None at end of stream."""
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        return None
+    length = _check_length(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return payload
+
+
+async def read_frame_async(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """``read_frame`` for an asyncio stream."""
+    try:
+        length = _check_length(await reader.readexactly(_LENGTH.size))
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import pytest
+from lifegame_py import protocol
+
+
+@pytest.fixture(autouse=True)
+def lut_cache_in_tmp(tmp_path, monkeypatch):
+    # 参照表のキャッシュを ~/.cache に書かない
+    monkeypatch.setenv("LIFEGAME_LUT_CACHE", str(tmp_path / "lut.bin"))
+
+def _random_board(height, width, rng, density=0.5):
+    board = [[protocol.DEAD] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < density:
+                board[y][x] = rng.choice([protocol.PLAYER1, protocol.PLAYER2])
+    return board
+
+@pytest.fixture
+def random_board():
+    # 割合 density のセルに、どちらかのプレイヤーのセルを置いた盤面を作る
+    return _random_board
+
+async def _scripted_client(address, name, moves, registered=None):
+    """Play ``moves`` in order and return every line received after the field information."""
+    reader, writer = await asyncio.open_connection(*address)
+    assert (await reader.readline()).decode().rstrip() == protocol.greeting
+    writer.write(name.encode() + b'\n')
+    field_info = json.loads(await reader.readline())
+    assert (field_info["height"], field_info["width"]) == (protocol.HEIGHT, protocol.WIDTH)
+    assert field_info["options"] == ([protocol.option_delta] if protocol.option_delta in name else [])
+    if registered is not None:
+        registered.set()
+    lines = []
+    moves = iter(moves)
+    while True:
+        line = (await reader.readline()).decode().rstrip()
+        if not line:
+            break
+        lines.append(line)
+        if line == protocol.placement:
+            move = next(moves)
+            writer.write((json.dumps({"place": list(move)}) if isinstance(move, tuple) else move).encode() + b'\n')
+    writer.close()
+    return lines
+
+@pytest.fixture
+def scripted_client():
+    # サーバのテストで使う、手順どおりに打つ text プロトコルのクライアント
+    return _scripted_client
+
+@pytest.fixture
+def first_moves():
+    return [(0, i) for i in range(protocol.PLACEMENT_TURNS)]
+
+@pytest.fixture
+def second_moves():
+    # first_moves と重ならない
+    return [(7, i) for i in range(protocol.PLACEMENT_TURNS)]
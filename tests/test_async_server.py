@@ -0,0 +1,173 @@
+import asyncio
+import json
+import pytest
+from lifegame_py.async_server import AsyncLifeServer
+from lifegame_py.player_base import LifePlayer, play_game
+from lifegame_py import protocol
+
+
+def run_server(coroutine_factory, **kwargs):
+    async def main():
+        server = AsyncLifeServer(**kwargs)
+        ready = asyncio.get_running_loop().create_future()
+        serving = asyncio.ensure_future(server.serve('127.0.0.1', 0, ready))
+        address = await ready
+        results = await coroutine_factory(address)
+        await asyncio.wait_for(serving, 10)
+        return server, results
+    return asyncio.run(main())
+
+def test_concurrent_games(scripted_client, first_moves, second_moves):
+    games = 30
+
+    async def clients(address):
+        tasks = []
+        for i in range(games):
+            # 先に名前を送ったほうが PLAYER1
+            for name, moves in [(f'first{i}', first_moves), (f'second{i}', second_moves)]:
+                registered = asyncio.Event()
+                tasks.append(asyncio.ensure_future(scripted_client(address, name, moves, registered)))
+                await registered.wait()
+        return await asyncio.gather(*tasks)
+
+    server, results = run_server(clients, max_games=games)
+    stats = server.stats.as_dict()
+    assert stats["games_finished"] == games
+    assert stats["moves"] == games * 2 * protocol.PLACEMENT_TURNS
+    for lines in results:
+        assert lines.count(protocol.placement) == protocol.PLACEMENT_TURNS
+        assert protocol.simulation in lines
+        assert json.loads(lines[-2])["phase"] == protocol.phase_life_result
+    # 同じ手順なので全て同じ結果
+    assert {tuple(lines[-1:]) for lines in results[0::2]} == {(protocol.you_win,)}
+    assert {tuple(lines[-1:]) for lines in results[1::2]} == {(protocol.you_lose,)}
+
+def test_invalid_placement_loses(scripted_client):
+    async def clients(address):
+        registered = asyncio.Event()
+        first = asyncio.ensure_future(scripted_client(address, 'first', [(0, 0), (9, 9)], registered))
+        await registered.wait()
+        second = asyncio.ensure_future(scripted_client(address, 'second', ['not json']))
+        return await asyncio.gather(first, second)
+
+    _, (first, second) = run_server(clients, max_games=1)
+    assert first[-1] == protocol.you_win
+    assert second[-1] == protocol.you_lose
+
+    async def clients(address):
+        registered = asyncio.Event()
+        first = asyncio.ensure_future(scripted_client(address, 'first', [(0, 0), (9, 9)], registered))
+        await registered.wait()
+        second = asyncio.ensure_future(scripted_client(address, 'second', [(0, 0)]))
+        return await asyncio.gather(first, second)
+
+    _, (first, second) = run_server(clients, max_games=1)
+    assert first[-1] == protocol.you_win
+    assert second[-1] == protocol.you_lose
+
+def test_timeout_and_disconnect(scripted_client, second_moves):
+    async def clients(address):
+        reader, writer = await asyncio.open_connection(*address)
+        writer.write(b'silent\n')
+        await reader.readline()  # 挨拶
+        await reader.readline()  # 盤面の情報
+        second = await scripted_client(address, 'second', second_moves)
+        writer.close()
+        return second
+
+    server, second = run_server(clients, max_games=1, move_timeout=0.2)
+    assert second[-1] == protocol.you_win
+
+class FixedPlayer(LifePlayer):
+    def __init__(self, moves):
+        super().__init__()
+        self.moves = list(moves)
+
+    def name(self):
+        return 'fixed'
+
+    def place_cell(self):
+        return self.moves.pop(0)
+
+def test_play_game_clients(first_moves, second_moves):
+    # 既存のクライアント (play_game) がそのまま使える。どちらが先攻でも手は重ならない
+    async def clients(address):
+        loop = asyncio.get_running_loop()
+        first = loop.run_in_executor(None, play_game, *address, FixedPlayer(first_moves))
+        second = loop.run_in_executor(None, play_game, *address, FixedPlayer(second_moves))
+        await asyncio.gather(first, second)
+
+    server, _ = run_server(clients, max_games=1)
+    assert server.stats.moves == 2 * protocol.PLACEMENT_TURNS
+
+def test_delta_placements(scripted_client, first_moves, second_moves):
+    async def clients(address, first_name, second_name):
+        registered = asyncio.Event()
+        first = asyncio.ensure_future(scripted_client(address, first_name, first_moves, registered))
+        await registered.wait()
+        second = asyncio.ensure_future(scripted_client(address, second_name, second_moves))
+        return await asyncio.gather(first, second)
+
+    def placements(lines):
+        return [json.loads(line) for line in lines
+                if line.startswith('{') and json.loads(line)["phase"] == protocol.phase_placement]
+
+    delta = 'fixed' + protocol.option_separator + protocol.option_delta
+    _, (first, second) = run_server(lambda address: clients(address, delta, delta), max_games=1)
+    messages = placements(first)
+    assert len(messages) == 2 * protocol.PLACEMENT_TURNS
+    assert all("board" not in message for message in messages)
+    assert messages[0]["place"] == list(first_moves[0])
+    assert messages[0]["owner"] == protocol.PLAYER1
+    assert messages[1]["owner"] == protocol.PLAYER2
+    checksums = [i for i, message in enumerate(messages) if "checksum" in message]
+    assert checksums == list(range(protocol.CHECKSUM_INTERVAL - 1, len(messages), protocol.CHECKSUM_INTERVAL))
+    assert first[-1] == protocol.you_win
+
+    # 片方が delta を使わなければ、両者に盤面全体を送る
+    _, (first, second) = run_server(lambda address: clients(address, delta, 'plain'), max_games=1)
+    assert all("board" in message for message in placements(first))
+
+def test_play_game_delta(first_moves, second_moves):
+    players = [FixedPlayer(first_moves), FixedPlayer(second_moves)]
+
+    async def clients(address):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, play_game, *address, player, [protocol.option_delta])
+                               for player in players))
+
+    # 差分から組み立てた盤面がチェックサムと合わなければ play_game が例外を出す
+    server, _ = run_server(clients, max_games=1)
+    assert server.stats.moves == 2 * protocol.PLACEMENT_TURNS
+    for player in players:
+        assert player.last_msg["phase"] == protocol.phase_life_result
+
+@pytest.mark.parametrize("options", [
+    [[protocol.option_binary], [protocol.option_binary]],
+    [[protocol.option_binary, protocol.option_delta], [protocol.option_binary, protocol.option_delta]],
+    [[protocol.option_binary, protocol.option_delta], []],
+])
+def test_play_game_binary(options, first_moves, second_moves):
+    players = [FixedPlayer(first_moves), FixedPlayer(second_moves)]
+
+    async def clients(address):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, play_game, *address, player, player_options)
+                               for player, player_options in zip(players, options)))
+
+    server, _ = run_server(clients, max_games=1)
+    assert server.stats.moves == 2 * protocol.PLACEMENT_TURNS
+    for player in players:
+        assert player.last_msg["phase"] == protocol.phase_life_result
+    assert players[0].last_msg == players[1].last_msg
+
+def test_stop_before_serve():
+    server = AsyncLifeServer()
+    server.stop()  # serve() の前でも例外にならない
+
+    async def main():
+        ready = asyncio.get_running_loop().create_future()
+        await asyncio.wait_for(server.serve('127.0.0.1', 0, ready), 10)
+        return ready.done()
+
+    assert asyncio.run(main())
@@ -0,0 +1,140 @@
+import random
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.backend import (FieldBackend, available_backends, backends, create_field,
+                                 field_from_board, get_backend, register_backend)
+from lifegame_py import backend as backend_module
+from lifegame_py import protocol
+
+
+def close(field):
+    if hasattr(field, 'close'):
+        field.close()
+
+BACKENDS = available_backends()
+
+def test_builtin_backends():
+    assert backends()[:1] == ['reference']
+    assert get_backend('reference') is LifeField
+    for name in ('reference', 'bitboard', 'tiled', 'hashlife', 'lut', 'sparse'):
+        assert name in BACKENDS
+        assert issubclass(get_backend(name), FieldBackend)
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('no-such-engine')
+
+def test_environment_variable(monkeypatch):
+    monkeypatch.setenv(backend_module.ENV_VAR, 'bitboard')
+    assert type(create_field(4, 5)).__name__ == 'BitboardField'
+    # 引数の指定が環境変数より優先される
+    assert type(create_field(4, 5, backend='reference')) is LifeField
+    monkeypatch.delenv(backend_module.ENV_VAR)
+    assert get_backend() is LifeField
+
+def test_register_backend(monkeypatch):
+    monkeypatch.setattr(backend_module, '_BACKENDS', dict(backend_module._BACKENDS))
+    class Custom(LifeField):
+        __slots__ = ()
+    register_backend('custom', Custom)
+    assert type(field_from_board([[protocol.PLAYER1]], backend='custom')) is Custom
+    with pytest.raises(TypeError):
+        register_backend('bad', dict)
+
+# 既定の設定に加えて、タイルや帯の境界が多くなるエンジン固有の設定でも比べる
+CONFIGURATIONS = [(name, {}) for name in BACKENDS] + [
+    (name, options) for name, options in [
+        ('tiled', {'tile_size': 1}),
+        ('tiled', {'tile_size': 3}),
+        ('parallel', {'workers': 3}),
+        ('hashlife', {'cache_size': 64, 'max_nodes': 256}),
+    ] if name in BACKENDS]
+
+@pytest.mark.parametrize("name,options", CONFIGURATIONS)
+@pytest.mark.parametrize("height,width", [(8, 8), (1, 9), (13, 6), (2, 2), (30, 17)])
+def test_matches_reference(name, options, height, width, random_board):
+    rng = random.Random(f'{name} {options} {height} {width}')
+    for density in (0.1, 0.5):
+        board = random_board(height, width, rng, density)
+        reference = LifeField.from_board(board)
+        field = get_backend(name).from_board(board, **options)
+        try:
+            for generations in (0, 1, 2, rng.randrange(3, 12)):
+                reference.advance(generations)
+                field.advance(generations)
+                assert field.get_board_state() == reference.get_board_state()
+                assert field.checksum() == reference.checksum()
+                for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2):
+                    assert field.count(owner) == reference.count(owner)
+            assert field.to_field().get_board_state() == reference.get_board_state()
+        finally:
+            close(field)
+
+@pytest.mark.parametrize("source", BACKENDS)
+@pytest.mark.parametrize("target", BACKENDS)
+def test_from_field_between_backends(source, target, random_board):
+    # LifeField 以外の実装からも、インタフェースだけで変換できる
+    board = random_board(6, 7, random.Random(f'{source} {target}'))
+    field = field_from_board(board, backend=source)
+    converted = get_backend(target).from_field(field)
+    try:
+        assert converted.get_board_state() == board
+    finally:
+        close(field)
+        close(converted)
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_place(name):
+    field = create_field(3, 4, backend=name)
+    try:
+        assert field.place(protocol.PLAYER1, (2, 3)) == True
+        assert field.place(protocol.PLAYER2, (2, 3)) == False
+        assert field.place(protocol.PLAYER2, (3, 0)) == False
+        assert field.place(protocol.PLAYER2, (0, -1)) == False
+        assert field.count(protocol.PLAYER1) == 1
+        assert field.count(protocol.PLAYER2) == 0
+        with pytest.raises(ValueError):
+            field.advance(-1)
+    finally:
+        close(field)
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_unknown_owners(name):
+    field = field_from_board([[1, 2, 0], [0, 1, 0]], backend=name)
+    try:
+        # 盤面にない所有者は 0 個で、置こうとすると ValueError
+        for owner in (-1, 3, 4):
+            assert field.count(owner) == 0
+            with pytest.raises(ValueError):
+                field.place(owner, (1, 2))
+        assert field.place(protocol.DEAD, (1, 2)) == True
+        assert [field.count(owner) for owner in (0, 1, 2)] == [3, 2, 1]
+    finally:
+        close(field)
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_birth_needs_exactly_three(name):
+    # 2 対 2 の同数になる 4 近傍では誕生しない。3 近傍では多数派の所有者で誕生する
+    board = [
+        [1, 0, 2],
+        [0, 0, 0],
+        [2, 0, 1],
+    ]
+    field = field_from_board(board, backend=name)
+    try:
+        field.next_generation()
+        assert field.get_board_state() == [[0] * 3 for _ in range(3)]
+    finally:
+        close(field)
+
+    board = [
+        [2, 0, 2],
+        [0, 0, 0],
+        [1, 0, 0],
+    ]
+    field = field_from_board(board, backend=name)
+    try:
+        field.next_generation()
+        assert field.get_board_state()[1][1] == protocol.PLAYER2
+    finally:
+        close(field)
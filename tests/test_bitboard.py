@@ -0,0 +1,52 @@
+import copy
+import random
+from lifegame_py.bitboard import BitboardField
+from lifegame_py import protocol
+
+
+def test_place_and_count():
+    field = BitboardField(width=3, height=3)
+    assert field.place(protocol.PLAYER1, (0, 0)) == True
+    assert field.place(protocol.PLAYER1, (1, 1)) == True
+    assert field.place(protocol.PLAYER2, (1, 1)) == False
+    assert field.place(protocol.PLAYER2, (3, 0)) == False
+    assert field.place(protocol.PLAYER2, (2, 2)) == True
+    assert field.get((1, 1)) == protocol.PLAYER1
+    assert field.get((2, 2)) == protocol.PLAYER2
+    assert field.count(protocol.PLAYER1) == 2
+    assert field.count(protocol.PLAYER2) == 1
+    assert field.count(protocol.DEAD) == 6
+
+def test_clone_is_independent():
+    field = BitboardField()
+    field.place(protocol.PLAYER1, (0, 0))
+    for cloned in (field.clone(), copy.copy(field), copy.deepcopy(field)):
+        assert cloned == field
+        cloned.place(protocol.PLAYER2, (1, 1))
+        assert cloned != field
+    assert field.count(protocol.PLAYER2) == 0
+
+def test_round_trip(random_board):
+    board = random_board(6, 4, random.Random(0))
+    field = BitboardField.from_board(board)
+    assert field.get_board_state() == board
+    assert field.to_field().get_board_state() == board
+
+def test_advance_matches_stepping(random_board):
+    rng = random.Random(11)
+    for _ in range(60):
+        height, width = rng.randint(1, 9), rng.randint(1, 9)
+        board = random_board(height, width, rng)
+        generations = rng.randint(0, 40)
+        expected = BitboardField.from_board(board)
+        for _ in range(generations):
+            expected.next_generation()
+        field = BitboardField.from_board(board)
+        period = field.advance(generations)
+        assert field == expected
+        if period:
+            # 周期 period で同じ盤面に戻る
+            clone = field.clone()
+            for _ in range(period):
+                clone.next_generation()
+            assert clone == field
@@ -0,0 +1,81 @@
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.book import OpeningBook, position_key, write_book
+from lifegame_py.player_base import LifePlayer
+from lifegame_py.symmetry import apply_transform, transform_position, transforms
+from lifegame_py import protocol
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    # (2, 3) に PLAYER1 がある局面で PLAYER2 が (2, 4) に置く
+    field = LifeField()
+    field.place(protocol.PLAYER1, (2, 3))
+    key, transform = position_key(field, protocol.PLAYER2)
+    path = str(tmp_path / 'opening.book')
+    assert write_book(path, field.height, field.width,
+                      [(key, transform_position((2, 4), transform, field.height, field.width))]) == 1
+    return path
+
+def test_lookup_in_every_orientation(book_path):
+    board = [[protocol.DEAD] * protocol.WIDTH for _ in range(protocol.HEIGHT)]
+    board[2][3] = protocol.PLAYER1
+    with OpeningBook(book_path) as book:
+        assert len(book) == 1
+        for transform in transforms(protocol.HEIGHT, protocol.WIDTH):
+            field = LifeField.from_board(apply_transform(board, transform))
+            expected = transform_position((2, 4), transform, protocol.HEIGHT, protocol.WIDTH)
+            assert book.lookup(field, protocol.PLAYER2) == expected
+
+def test_lookup_needs_the_same_mover(tmp_path):
+    # 実際の対局で現れる局面: PLAYER1 と PLAYER2 が 1 つずつ置いて PLAYER1 の手番
+    field = LifeField()
+    field.place(protocol.PLAYER1, (2, 3))
+    field.place(protocol.PLAYER2, (5, 5))
+    key, transform = position_key(field, protocol.PLAYER1)
+    path = str(tmp_path / 'opening.book')
+    write_book(path, field.height, field.width,
+               [(key, transform_position((3, 3), transform, field.height, field.width))])
+    with OpeningBook(path) as book:
+        assert book.lookup(field, protocol.PLAYER1) == (3, 3)
+        # 所有者を入れ替えた局面は別の局面
+        swapped = LifeField()
+        swapped.place(protocol.PLAYER2, (2, 3))
+        swapped.place(protocol.PLAYER1, (5, 5))
+        assert book.lookup(swapped, protocol.PLAYER1) is None
+        # 手番が違えば別の局面
+        assert book.lookup(field, protocol.PLAYER2) is None
+        assert book.lookup(LifeField(), protocol.PLAYER1) is None
+        assert book.lookup(LifeField(5, 5), protocol.PLAYER1) is None
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not.book'
+    path.write_bytes(b'LGBX' + bytes(20))
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+    path.write_bytes(b'LG')
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+class FixedPlayer(LifePlayer):
+    def name(self):
+        return 'fixed'
+
+    def place_cell(self):
+        return (7, 7)
+
+def test_player_opts_in(book_path):
+    field = LifeField()
+    field.place(protocol.PLAYER1, (2, 3))
+
+    player = FixedPlayer()
+    player.initialize(field, protocol.PLAYER2)
+    assert player.choose_cell() == (7, 7)
+
+    player = FixedPlayer(opening_book=book_path)
+    player.initialize(field, protocol.PLAYER2)
+    assert player.choose_cell() == (2, 4)
+    # ブックにない局面では place_cell() に任せる
+    field.place(protocol.PLAYER2, (2, 4))
+    assert player.choose_cell() == (7, 7)
+    player.opening_book.close()
@@ -0,0 +1,96 @@
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.cache import SimulationCache
+from lifegame_py import protocol
+
+
+def make_field(cells):
+    field = LifeField()
+    for owner, pos in cells:
+        field.place(owner, pos)
+    return field
+
+def test_simulate_hits_and_misses():
+    cache = SimulationCache()
+    field = make_field([(protocol.PLAYER1, (1, 0)), (protocol.PLAYER1, (1, 1)),
+                        (protocol.PLAYER1, (1, 2)), (protocol.PLAYER2, (5, 5))])
+
+    result = cache.simulate(field)
+    expected = LifeField.from_board(field.cells)
+    for _ in range(protocol.SIMULATION_GENERATIONS):
+        expected.next_generation()
+    assert result.counts == (expected.count(protocol.DEAD),
+                             expected.count(protocol.PLAYER1),
+                             expected.count(protocol.PLAYER2))
+    assert result.board is None
+    assert cache.cache_info()[:3] == (0, 1, 0)
+
+    # 同じ盤面を別の順序で作っても置換表に当たる
+    same = make_field([(protocol.PLAYER2, (5, 5)), (protocol.PLAYER1, (1, 2)),
+                       (protocol.PLAYER1, (1, 1)), (protocol.PLAYER1, (1, 0))])
+    assert cache.simulate(same) is result
+    assert cache.cache_info()[:3] == (1, 1, 0)
+
+    # 世代数が違えば別のエントリ
+    cache.simulate(field, 1)
+    assert cache.cache_info().misses == 2
+    assert len(cache) == 2
+
+    # field 自体は変更されない
+    assert field.count(protocol.PLAYER1) == 3
+
+def test_store_boards():
+    cache = SimulationCache(store_boards=True)
+    field = make_field([(protocol.PLAYER1, (1, 0)), (protocol.PLAYER1, (1, 1)), (protocol.PLAYER1, (1, 2))])
+    result = cache.simulate(field, 1)
+    expected = LifeField.from_board(field.cells)
+    expected.next_generation()
+    assert result.get_board_state(field.width) == expected.get_board_state()
+
+def test_memory_bound_evicts_lru():
+    cache = SimulationCache()
+    cache.simulate(make_field([(protocol.PLAYER1, (0, 0))]))
+    entry_bytes = cache.cache_info().current_bytes
+
+    cache = SimulationCache(max_bytes=entry_bytes * 3)
+    fields = [make_field([(protocol.PLAYER1, (0, x))]) for x in range(5)]
+    for field in fields[:3]:
+        cache.simulate(field)
+    cache.simulate(fields[0])  # fields[0] を最近使ったものにする
+    cache.simulate(fields[3])
+    cache.simulate(fields[4])
+
+    info = cache.cache_info()
+    assert info.evictions == 2
+    assert info.entries == 3
+    assert info.current_bytes <= info.max_bytes
+    hits = info.hits
+    cache.simulate(fields[0])
+    assert cache.cache_info().hits == hits + 1
+    cache.simulate(fields[1])
+    assert cache.cache_info().hits == hits + 1
+
+def test_clear():
+    cache = SimulationCache()
+    cache.simulate(make_field([(protocol.PLAYER1, (0, 0))]))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.cache_info() == (0, 0, 0, 0, 0, cache.max_bytes)
+
+def test_rule_is_part_of_the_key():
+    cache = SimulationCache(store_boards=True)
+    cells = [(protocol.PLAYER1, (1, 1)), (protocol.PLAYER1, (1, 2)), (protocol.PLAYER2, (2, 1))]
+    standard = make_field(cells)
+    highlife = make_field(cells)
+    highlife.rule = "B36/S23"
+    seeds = make_field(cells)
+    seeds.rule = "B2/S"
+    for field in (standard, highlife, seeds):
+        expected = LifeField.from_board(field.get_board_state(), field.rule)
+        for _ in range(protocol.SIMULATION_GENERATIONS):
+            expected.next_generation()
+        result = cache.simulate(field)
+        assert result.get_board_state(field.width) == expected.get_board_state()
+    # 同じ盤面でもルールごとに別のエントリ
+    assert cache.cache_info()[:3] == (0, 3, 0)
+    assert cache.simulate(seeds).counts != cache.simulate(standard).counts
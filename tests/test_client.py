@@ -175,4 +175,29 @@ def test_play_game_player_id_update(mock_socket_and_sockfile):
 
     play_game("localhost", 12345, player)
     # placement_count == 1 の後でプレイヤーIDが更新されることを確認
-    assert player.player_id == protocol.PLAYER2
\ No newline at end of file
+    assert player.player_id == protocol.PLAYER2
+
+def test_player_update_delta(player_instance):
+    field = LifeField(width=3, height=2)
+    player_instance.initialize(field, protocol.PLAYER1)
+    player_instance.update(json.dumps({"phase": protocol.phase_placement, "place": [1, 2],
+                                       "owner": protocol.PLAYER2, "next_player": protocol.PLAYER1}))
+    assert field.get_board_state() == [[0, 0, 0], [0, 0, protocol.PLAYER2]]
+
+    expected = LifeField.from_board([[protocol.PLAYER1, 0, 0], [0, 0, protocol.PLAYER2]]).checksum()
+    player_instance.update(json.dumps({"place": [0, 0], "owner": protocol.PLAYER1, "checksum": expected}))
+    with pytest.raises(RuntimeError):
+        player_instance.update(json.dumps({"place": [0, 1], "owner": protocol.PLAYER1, "checksum": expected}))
+
+def test_play_game_requests_options(mock_socket_and_sockfile):
+    mock_sock, mock_sockfile = mock_socket_and_sockfile
+    player = MockLifePlayer()
+
+    mock_sockfile.readline.side_effect = [
+        protocol.greeting + '\n',
+        json.dumps({"height": 20, "width": 20, "options": [protocol.option_delta]}) + '\n',
+        protocol.you_win + '\n',
+    ]
+
+    play_game("localhost", 12345, player, [protocol.option_delta])
+    mock_sockfile.write.assert_any_call(player.name() + protocol.option_separator + protocol.option_delta + '\n')
@@ -0,0 +1,56 @@
+import threading
+from lifegame_py.display import BoardObserver, make_view
+from lifegame_py.field import LifeField
+from lifegame_py import protocol
+
+
+def test_make_view():
+    view = make_view([[protocol.DEAD, protocol.PLAYER1], [protocol.PLAYER2, protocol.DEAD]], show_grid=False)
+    assert view.count('\n') == 1
+    assert view.startswith('.')
+
+def test_observer_renders_snapshots_in_order():
+    rendered = []
+    field = LifeField(2, 3)
+    with BoardObserver(lambda board, title: rendered.append((board, title, threading.current_thread()))) as observer:
+        observer.observe(field, "empty")
+        # 置いた後の変更は、先に渡した盤面に影響しない
+        field.place(protocol.PLAYER1, (1, 2))
+        observer.observe(field, "placed")
+    assert [(board, title) for board, title, _ in rendered] == [
+        ([[0, 0, 0], [0, 0, 0]], "empty"),
+        ([[0, 0, 0], [0, 0, protocol.PLAYER1]], "placed"),
+    ]
+    # 表示はゲームのスレッドではなく別スレッドで行う
+    assert all(thread is not threading.current_thread() for _, _, thread in rendered)
+
+def test_observer_drops_when_behind():
+    release = threading.Event()
+    rendered = []
+
+    def render(board, title):
+        release.wait()
+        rendered.append(title)
+
+    observer = BoardObserver(render, maxsize=2)
+    field = LifeField(1, 1)
+    for i in range(10):
+        observer.observe(field, str(i))  # 表示が詰まっていても待たない
+    release.set()
+    observer.close()
+    assert observer.dropped > 0
+    assert len(rendered) + observer.dropped == 10
+    assert rendered == sorted(rendered, key=int)
+
+def test_observer_survives_render_errors():
+    rendered = []
+
+    def render(board, title):
+        if title == "bad":
+            raise ValueError(title)
+        rendered.append(title)
+
+    with BoardObserver(render) as observer:
+        observer.observe(LifeField(1, 1), "bad")
+        observer.observe(LifeField(1, 1), "good")
+    assert rendered == ["good"]
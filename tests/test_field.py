@@ -1,5 +1,8 @@
+import copy
+import random
 import pytest
-from lifegame_py.field import LifeField
+from lifegame_py.field import LifeField, zobrist_hash
+from lifegame_py import field as field_module
 from lifegame_py import protocol
 
 def test_init():
@@ -170,6 +173,9 @@ def test_count():
     assert field.count(protocol.PLAYER1) == 2
     assert field.count(protocol.PLAYER2) == 1
     assert field.count(protocol.DEAD) == 6 # 9 - 2 - 1
+    # 盤面にない所有者は 0 個
+    assert field.count(3) == 0
+    assert field.count(-1) == 0
 
 def test_get_board_state():
     field = LifeField(width=2, height=2)
@@ -183,4 +189,269 @@ def test_get_board_state():
     # 状態がコピーであることを確認 (元のオブジェクトへの参照ではない)
     retrieved_state = field.get_board_state()
     retrieved_state[0][0] = protocol.PLAYER2
-    assert field.cells[0][0] == protocol.PLAYER1 # 元のフィールドは変更されていない
\ No newline at end of file
+    assert field.cells[0][0] == protocol.PLAYER1 # 元のフィールドは変更されていない
+
+def test_zobrist_incremental():
+    field = LifeField()
+    assert field.zobrist == 0
+
+    field.place(protocol.PLAYER1, (1, 1))
+    field.place(protocol.PLAYER2, (1, 2))
+    field.place(protocol.PLAYER1, (2, 1))
+    assert field.zobrist == zobrist_hash(field.cells)
+    assert field.zobrist != 0
+
+    # 同じ盤面なら配置順に依らず同じハッシュ
+    other = LifeField()
+    other.place(protocol.PLAYER1, (2, 1))
+    other.place(protocol.PLAYER1, (1, 1))
+    other.place(protocol.PLAYER2, (1, 2))
+    assert other.zobrist == field.zobrist
+
+    # 所有者が違えば別のハッシュ
+    swapped = LifeField()
+    swapped.place(protocol.PLAYER2, (1, 1))
+    swapped.place(protocol.PLAYER1, (1, 2))
+    swapped.place(protocol.PLAYER1, (2, 1))
+    assert swapped.zobrist != field.zobrist
+
+    rng = random.Random(0)
+    for _ in range(20):
+        field.place(rng.choice([protocol.PLAYER1, protocol.PLAYER2]),
+                    (rng.randrange(field.height), rng.randrange(field.width)))
+    for _ in range(protocol.SIMULATION_GENERATIONS):
+        field.next_generation()
+        assert field.zobrist == zobrist_hash(field.cells)
+
+def test_zobrist_follows_direct_write():
+    field = LifeField(width=3, height=3)
+    field.cells[0][0] = protocol.PLAYER1
+    assert field.zobrist != 0
+    assert field.zobrist == field.rehash() == LifeField.from_board(field.get_board_state()).zobrist
+    field.cells[0][0] = protocol.DEAD
+    assert field.zobrist == 0
+
+def test_cells_view():
+    field = LifeField(width=3, height=2)
+    field.cells[1][2] = protocol.PLAYER2
+    field.cells[0][-1] = protocol.PLAYER1
+    assert field.cells == [[0, 0, 1], [0, 0, 2]]
+    assert len(field.cells) == 2
+    assert len(field.cells[0]) == 3
+    assert [list(row) for row in field.cells] == field.get_board_state()
+    with pytest.raises(IndexError):
+        field.cells[0][3]
+    with pytest.raises(IndexError):
+        field.cells[2]
+
+    # 盤面ごと差し替えられる
+    field.cells = [[protocol.PLAYER1, protocol.DEAD, protocol.DEAD], [protocol.DEAD, protocol.DEAD, protocol.PLAYER2]]
+    assert field.count(protocol.PLAYER1) == 1
+    assert field.cells[0][0] == protocol.PLAYER1
+    with pytest.raises(ValueError):
+        field.cells = [[protocol.DEAD]]
+
+def test_clone():
+    field = LifeField()
+    field.place(protocol.PLAYER1, (2, 3))
+    for cloned in (field.clone(), copy.copy(field), copy.deepcopy(field)):
+        assert cloned.get_board_state() == field.get_board_state()
+        assert cloned.zobrist == field.zobrist
+        cloned.place(protocol.PLAYER2, (0, 0))
+        assert field.cells[0][0] == protocol.DEAD
+
+    # deepcopy(cells) は従来どおり入れ子のリストになる
+    cells = copy.deepcopy(field.cells)
+    assert cells == field.get_board_state()
+    cells[2][3] = protocol.DEAD
+    assert field.cells[2][3] == protocol.PLAYER1
+
+def test_push_place_pop():
+    field = LifeField(width=4, height=4)
+    field.place(protocol.PLAYER1, (0, 0))
+    before = field.snapshot()
+    zobrist = field.zobrist
+
+    assert field.push_place(protocol.PLAYER2, (1, 1)) == True
+    assert field.push_place(protocol.PLAYER1, (2, 2)) == True
+    # 置けない位置は積まれない
+    assert field.push_place(protocol.PLAYER2, (1, 1)) == False
+    assert field.push_place(protocol.PLAYER2, (4, 0)) == False
+    assert field.cells[2][2] == protocol.PLAYER1
+
+    field.pop()
+    assert field.cells[2][2] == protocol.DEAD
+    assert field.cells[1][1] == protocol.PLAYER2
+    field.pop()
+    assert field.snapshot() == before
+    assert field.zobrist == zobrist
+
+    with pytest.raises(IndexError):
+        field.pop()
+
+    # 世代を進めると取り消せない
+    field.push_place(protocol.PLAYER2, (3, 3))
+    field.next_generation()
+    with pytest.raises(IndexError):
+        field.pop()
+
+def test_simulate():
+    field = LifeField(width=5, height=5)
+    for pos in [(2, 1), (2, 2), (2, 3)]:
+        field.place(protocol.PLAYER1, pos)
+    before = field.snapshot()
+
+    expected = field.clone()
+    expected.next_generation()
+    result = field.simulate(1)
+    assert result.snapshot() == expected.snapshot()
+    assert result.zobrist == expected.zobrist
+    # 元の盤面は変わらない
+    assert field.snapshot() == before
+
+    # 作業領域は使い回される
+    assert field.simulate(2) is result
+    assert result.snapshot() == before
+
+def test_next_generation_reuses_buffers():
+    field = LifeField(width=5, height=5)
+    for pos in [(2, 1), (2, 2), (2, 3)]:
+        field.place(protocol.PLAYER2, pos)
+    field.next_generation()
+    buffers = {id(field._cells), id(field._next)}
+    for _ in range(4):
+        field.next_generation()
+        assert {id(field._cells), id(field._next)} == buffers
+    # 周期 2 の振動子なので 5 世代後は縦向き
+    assert [field.cells[y][2] for y in range(1, 4)] == [protocol.PLAYER2] * 3
+    assert field.count(protocol.PLAYER2) == 3
+
+def test_counts_incremental():
+    rng = random.Random(0)
+    field = LifeField(width=6, height=6)
+    assert field.count(protocol.DEAD) == 36
+    for _ in range(20):
+        field.place(rng.choice([protocol.PLAYER1, protocol.PLAYER2]), (rng.randrange(6), rng.randrange(6)))
+    field.check_consistency()
+    pushed = field.push_place(protocol.PLAYER1, (0, 0))
+    pushed += field.push_place(protocol.PLAYER1, (5, 5))
+    field.cells[3][3] = protocol.PLAYER2
+    field.check_consistency()
+    for _ in range(pushed):
+        field.pop()
+    field.check_consistency()
+    for _ in range(5):
+        field.next_generation()
+        field.check_consistency()
+    clone = field.clone()
+    clone.check_consistency()
+    field.simulate(3).check_consistency()
+    field.cells = [[protocol.PLAYER1] * 6 for _ in range(6)]
+    assert field.count(protocol.PLAYER1) == 36
+    assert field.count(protocol.DEAD) == 0
+
+def test_check_consistency_detects_corruption(monkeypatch):
+    field = LifeField(width=3, height=3)
+    field.place(protocol.PLAYER1, (1, 1))
+    field._counts[protocol.PLAYER1] = 2  # 壊す
+    monkeypatch.setattr(field_module, '_DEBUG', False)
+    assert field.count(protocol.PLAYER1) == 2
+    monkeypatch.setattr(field_module, '_DEBUG', True)
+    with pytest.raises(AssertionError):
+        field.count(protocol.PLAYER1)
+
+    # 検査はハッシュを計算し直して上書きしない
+    field = LifeField(width=3, height=3)
+    field.place(protocol.PLAYER2, (0, 2))
+    field.zobrist ^= 1  # 壊す
+    broken = field.zobrist
+    for _ in range(2):
+        with pytest.raises(AssertionError):
+            field.check_consistency()
+    assert field.zobrist == broken
+
+def test_advance_matches_stepping():
+    rng = random.Random(7)
+    for _ in range(60):
+        height, width = rng.randint(1, 7), rng.randint(1, 7)
+        board = [[rng.choice([protocol.DEAD, protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2])
+                  for _ in range(width)] for _ in range(height)]
+        generations = rng.randint(0, 30)
+        expected = LifeField.from_board(board)
+        for _ in range(generations):
+            expected.next_generation()
+        field = LifeField.from_board(board)
+        field.advance(generations)
+        assert field.snapshot() == expected.snapshot()
+        assert field.zobrist == expected.zobrist
+        field.check_consistency()
+
+def test_advance_reports_period():
+    # ブロック (固定点)
+    field = LifeField(width=4, height=4)
+    for pos in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+        field.place(protocol.PLAYER1, pos)
+    assert field.advance(100) == 1
+    assert field.count(protocol.PLAYER1) == 4
+
+    # ブリンカー (周期 2)
+    field = LifeField(width=5, height=5)
+    for pos in [(2, 1), (2, 2), (2, 3)]:
+        field.place(protocol.PLAYER2, pos)
+    assert field.advance(1001) == 2
+    assert [field.cells[y][2] for y in range(1, 4)] == [protocol.PLAYER2] * 3
+    assert field.advance(2) == 2
+    assert field.cells[1][2] == protocol.PLAYER2
+
+    # 1 世代だけでは繰り返しに気づかない
+    assert field.advance(1) == 0
+    assert field.cells[2][1] == protocol.PLAYER2
+    with pytest.raises(ValueError):
+        field.advance(-1)
+
+class CollidingField(LifeField):
+    # どの世代も同じハッシュになる、衝突だらけのフィールド
+    def next_generation(self):
+        super().next_generation()
+        self.zobrist = 0
+
+def test_advance_ignores_hash_collisions():
+    board = [[protocol.DEAD] * 8 for _ in range(8)]
+    for y, x in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]:  # グライダー
+        board[y][x] = protocol.PLAYER1
+    expected = LifeField.from_board(board)
+    for _ in range(20):
+        expected.next_generation()
+    field = CollidingField.from_board(board)
+    field.zobrist = 0
+    field.advance(20)
+    assert field.snapshot() == expected.snapshot()
+
+def test_iter_generations_diffs():
+    rng = random.Random(7)
+    board = [[rng.choice([0, 0, 1, 2]) for _ in range(9)] for _ in range(7)]
+    field = LifeField.from_board(board)
+    expected = LifeField.from_board(board)
+    replay = [row[:] for row in board]
+    for changes in field.iter_generations(10):
+        expected.next_generation()
+        for (y, x), old, new in changes:
+            assert replay[y][x] == old != new
+            replay[y][x] = new
+        assert replay == expected.get_board_state()
+        assert field.snapshot() == expected.snapshot()
+        assert field.zobrist == expected.zobrist
+    field.check_consistency()
+
+def test_iter_generations_is_lazy():
+    field = LifeField(width=5, height=5)
+    for pos in [(2, 1), (2, 2), (2, 3)]:
+        field.place(protocol.PLAYER1, pos)
+    generations = field.iter_generations(3)
+    assert field.cells[1][2] == protocol.DEAD
+    assert len(next(generations)) == 4
+    assert field.cells[1][2] == protocol.PLAYER1
+    assert len(list(generations)) == 2
+    assert list(field.iter_generations(0)) == []
+    with pytest.raises(ValueError):
+        list(field.iter_generations(-1))
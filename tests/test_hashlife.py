@@ -0,0 +1,69 @@
+import random
+from lifegame_py.field import LifeField
+from lifegame_py.bitboard import BitboardField
+from lifegame_py.hashlife import HashlifeField
+from lifegame_py import protocol
+
+
+def test_long_horizon_matches_bitboard(random_board):
+    board = random_board(24, 24, random.Random(0), 0.4)
+    bitboard = BitboardField.from_board(board)
+    hashlife = HashlifeField.from_board(board)
+    for _ in range(1000):
+        bitboard.next_generation()
+    hashlife.advance(1000)
+    assert hashlife.get_board_state() == bitboard.get_board_state()
+    for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2):
+        assert hashlife.count(owner) == bitboard.count(owner)
+
+def test_bounded_caches(random_board):
+    board = random_board(16, 16, random.Random(1), 0.4)
+    bitboard = BitboardField.from_board(board)
+    hashlife = HashlifeField.from_board(board, cache_size=64, max_nodes=256)
+    for _ in range(10):
+        hashlife.advance(7)
+        for _ in range(7):
+            bitboard.next_generation()
+        assert hashlife.get_board_state() == bitboard.get_board_state()
+    info = hashlife.cache_info()
+    assert info["results"] <= 64
+    assert info["evictions"] > 0
+    assert info["collections"] > 0
+
+class PeakHashlifeField(HashlifeField):
+    peak = 0
+
+    def _join(self, nw, ne, sw, se):
+        node = super()._join(nw, ne, sw, se)
+        self.peak = max(self.peak, len(self._nodes))
+        return node
+
+def test_max_nodes_within_one_advance(random_board):
+    board = random_board(24, 24, random.Random(2), 0.4)
+    bitboard = BitboardField.from_board(board)
+    hashlife = PeakHashlifeField.from_board(board, max_nodes=512)
+    hashlife.peak = 0
+    # 一度の advance の途中でも上限を超えない
+    hashlife.advance(300)
+    for _ in range(300):
+        bitboard.next_generation()
+    assert hashlife.get_board_state() == bitboard.get_board_state()
+    assert hashlife.peak <= 512
+    assert hashlife.cache_info()["flushes"] > 0
+    assert len(hashlife._nodes) <= 512
+
+def test_place_get_and_export():
+    field = HashlifeField(height=5, width=6)
+    assert field.place(protocol.PLAYER1, (0, 0)) == True
+    assert field.place(protocol.PLAYER2, (4, 5)) == True
+    assert field.place(protocol.PLAYER2, (0, 0)) == False
+    assert field.place(protocol.PLAYER2, (5, 0)) == False
+    assert field.get((0, 0)) == protocol.PLAYER1
+    assert field.get((4, 5)) == protocol.PLAYER2
+    assert field.count(protocol.PLAYER1) == 1
+    assert field.count(protocol.DEAD) == 28
+
+    exported = field.to_field()
+    assert isinstance(exported, LifeField)
+    assert exported.get_board_state() == field.get_board_state()
+    assert exported.cells[4][5] == protocol.PLAYER2
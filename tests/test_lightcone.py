@@ -0,0 +1,66 @@
+import random
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.bitboard import BitboardField
+from lifegame_py.lightcone import PlacementEvaluator, light_cone
+from lifegame_py import protocol
+
+
+def full_simulation(field, owner, pos, generations):
+    field = field.clone()
+    field.place(owner, pos)
+    field.advance(generations)
+    return tuple(field.count(o) for o in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2))
+
+def test_light_cone():
+    assert light_cone((5, 5), 2, 20, 20) == (3, 3, 8, 8)
+    assert light_cone((0, 19), 3, 20, 20) == (0, 16, 4, 20)
+    assert light_cone((1, 1), 0, 3, 3) == (1, 1, 2, 2)
+
+@pytest.mark.parametrize("height,width,generations", [(8, 8, 5), (30, 28, 2), (36, 9, 1), (1, 30, 4), (13, 13, 0)])
+@pytest.mark.parametrize("rule", [None, "B36/S23, tie=player2"])
+def test_matches_full_simulation(height, width, generations, rule, random_board):
+    rng = random.Random(f'{height} {width} {generations} {rule}')
+    for density, owner in [(0.0, protocol.PLAYER1), (0.03, protocol.PLAYER2), (0.3, protocol.PLAYER1)]:
+        field = LifeField.from_board(random_board(height, width, rng, density), rule)
+        evaluator = PlacementEvaluator(field, generations)
+        results = evaluator.evaluate_all(owner)
+        assert len(results) == field.count(protocol.DEAD)
+        for pos in rng.sample(sorted(results), min(len(results), 150)):
+            assert results[pos] == full_simulation(field, owner, pos, generations)
+
+def test_isolated_placements_share_one_simulation():
+    field = LifeField(60, 60)
+    for pos in [(30, 30), (30, 31), (31, 30)]:
+        field.place(protocol.PLAYER1, pos)
+    evaluator = PlacementEvaluator(field, 3)
+    moves = [(y, x) for y in range(12, 19) for x in range(40, 50)]  # 盤端からも生存セルからも 6 以上離れている
+    results = evaluator.evaluate_all(protocol.PLAYER2, moves)
+    assert evaluator.simulations == 1
+    assert set(results.values()) == {full_simulation(field, protocol.PLAYER2, moves[0], 3)}
+
+def test_simulations_scale_with_clusters():
+    field = LifeField(120, 120)
+    for pos in [(10, 10), (10, 11), (11, 10), (90, 70), (91, 71), (92, 70)]:
+        field.place(protocol.PLAYER1, pos)
+    evaluator = PlacementEvaluator(field, 5)
+    evaluator.evaluate_all(protocol.PLAYER2)
+    # 生存セルの周り 2 つ分と、盤端からの距離で分かれる孤立した配置の分だけ
+    assert evaluator.simulations < 2 * 23 * 23 + 4 * 11 * 11 + 4 * 11
+    assert evaluator.simulations < field.count(protocol.DEAD) // 10
+
+def test_occupied_cell():
+    field = LifeField(3, 3)
+    field.place(protocol.PLAYER1, (1, 1))
+    with pytest.raises(ValueError):
+        PlacementEvaluator(field).evaluate(protocol.PLAYER2, (1, 1))
+
+def test_window(random_board):
+    board = random_board(9, 13, random.Random(5))
+    field = LifeField.from_board(board, "B36/S23")
+    expected = [row[3:10] for row in board[2:6]]
+    window = field.window(2, 3, 6, 10)
+    assert window.get_board_state() == expected
+    assert window.rule is field.rule
+    window.check_consistency()
+    assert BitboardField.from_board(board).window(2, 3, 6, 10).get_board_state() == expected
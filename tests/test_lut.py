@@ -0,0 +1,75 @@
+import itertools
+import random
+from lifegame_py.field import LifeField
+from lifegame_py import lut, protocol
+from lifegame_py.lut import LutLifeField, load_tables, next_state
+
+
+def test_cell_table_matches_reference():
+    for states in itertools.product(range(3), repeat=9):
+        board = [list(states[0:3]), list(states[3:6]), list(states[6:9])]
+        field = LifeField.from_board(board)
+        field.next_generation()
+        assert next_state(board) == field.cells[1][1]
+
+def test_tile_tables_match_reference(random_board):
+    tables = load_tables()
+    rng = random.Random(0)
+    for _ in range(2000):
+        board = random_board(4, 4, rng)
+        alive = player1 = 0
+        for y in range(4):
+            for x in range(4):
+                if board[y][x]:
+                    alive |= 1 << (y * 4 + x)
+                if board[y][x] == protocol.PLAYER1:
+                    player1 |= 1 << (y * 4 + x)
+        survive_born = tables.alive[alive]
+        major_centre = tables.player1[player1]
+
+        field = LifeField.from_board(board)
+        field.next_generation()
+        for i, (y, x) in enumerate([(1, 1), (1, 2), (2, 1), (2, 2)]):
+            survive = survive_born >> i & 1
+            born = survive_born >> (i + 4) & 1
+            if survive:
+                expected = board[y][x]
+            elif born:
+                expected = protocol.PLAYER1 if major_centre >> i & 1 else protocol.PLAYER2
+            else:
+                expected = protocol.DEAD
+            assert field.cells[y][x] == expected
+
+def test_tables_cached_on_disk(tmp_path, monkeypatch):
+    path = tmp_path / "lut.bin"
+    monkeypatch.setenv("LIFEGAME_LUT_CACHE", str(path))
+    monkeypatch.setattr(lut, "_TABLES", None)
+    built = load_tables()
+    assert path.exists()
+    assert load_tables() is built  # プロセス内では一度だけ
+
+    monkeypatch.setattr(lut, "_TABLES", None)
+    monkeypatch.setattr(lut, "_build_cell_table", None)  # ファイルから読むので呼ばれない
+    assert load_tables() == built
+
+def test_corrupted_cache_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / "lut.bin"
+    monkeypatch.setenv("LIFEGAME_LUT_CACHE", str(path))
+    monkeypatch.setattr(lut, "_TABLES", None)
+    built = load_tables()
+    # 長さは同じで中身だけ壊れたファイルは使わない
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xff
+    path.write_bytes(bytes(data))
+    monkeypatch.setattr(lut, "_TABLES", None)
+    assert load_tables() == built
+    assert path.read_bytes() != bytes(data)  # 作り直して書き直す
+
+def test_place_and_count():
+    field = LutLifeField(width=3, height=3)
+    assert field.place(protocol.PLAYER1, (1, 1)) == True
+    assert field.place(protocol.PLAYER2, (1, 1)) == False
+    assert field.place(protocol.PLAYER2, (-1, 1)) == False
+    assert field.count(protocol.PLAYER1) == 1
+    assert field.count(protocol.DEAD) == 8
+    assert field.to_field().get_board_state() == field.get_board_state()
@@ -0,0 +1,27 @@
+import pytest
+from lifegame_py import protocol
+
+np = pytest.importorskip("numpy")
+from lifegame_py.parallel import ParallelLifeField, _bands
+
+
+def test_bands():
+    assert _bands(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert _bands(2, 8) == [(0, 1), (1, 2)]
+    assert _bands(5, 0) == [(0, 5)]
+    # 行数より多いワーカーは起こさない
+    with ParallelLifeField(height=5, width=40, workers=8) as parallel:
+        assert parallel.workers == 5
+
+def test_place_between_generations():
+    with ParallelLifeField(height=6, width=6, workers=2) as parallel:
+        for pos in [(2, 1), (2, 2), (2, 3)]:
+            assert parallel.place(protocol.PLAYER1, pos) == True
+        assert parallel.place(protocol.PLAYER2, (2, 2)) == False
+        assert parallel.place(protocol.PLAYER2, (6, 0)) == False
+        parallel.next_generation()
+        assert [parallel.get((y, 2)) for y in range(1, 4)] == [protocol.PLAYER1] * 3
+        assert parallel.place(protocol.PLAYER2, (2, 1)) == True
+        field = parallel.to_field()
+    field.next_generation()
+    assert field.count(protocol.PLAYER1) + field.count(protocol.PLAYER2) > 0
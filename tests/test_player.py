@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from lifegame_py.server import LifeGameControl, LifeClient
+from lifegame_py.server import LifeGameControl, LifeClient, parse_name
 from lifegame_py.field import LifeField
 from lifegame_py import protocol
 
@@ -113,8 +113,8 @@ def test_run_simulation(game_control, mock_field):
 
     result = game_control.run_simulation()
 
-    # next_generation が SIMULATION_GENERATIONS 回呼び出されることを確認
-    assert mock_field.next_generation.call_count == protocol.SIMULATION_GENERATIONS
+    # SIMULATION_GENERATIONS 世代まとめて進める (周期に入れば途中で打ち切られる)
+    mock_field.advance.assert_called_once_with(protocol.SIMULATION_GENERATIONS)
     assert result["phase"] == protocol.phase_life_result
     assert result["board"] == mock_field.get_board_state.return_value
     assert result["count"] == {"1": 10, "2": 5}
@@ -130,4 +130,26 @@ def test_get_winner(game_control, mock_field):
 
     # 引き分けの場合
     mock_field.count.side_effect = [7, 7] # Player1: 7, Player2: 7
-    assert game_control.get_winner() == -1
\ No newline at end of file
+    assert game_control.get_winner() == -1
+
+def test_place_cell_delta():
+    clients = [LifeClient(0, "Player1", None), LifeClient(1, "Player2", None, [protocol.option_delta])]
+    game_control = LifeGameControl(LifeField())
+    for client in clients:
+        game_control.add_client(client)
+    assert not game_control.sends_delta()
+    clients[0].options = frozenset({protocol.option_delta})
+    assert game_control.sends_delta()
+
+    result = game_control.place_cell(0, (2, 3), board=False)
+    assert result == {"phase": protocol.phase_placement, "place": [2, 3],
+                      "owner": protocol.PLAYER1, "next_player": protocol.PLAYER2}
+    for i in range(1, protocol.CHECKSUM_INTERVAL):
+        result = game_control.place_cell(i % 2, (0, i), board=False)
+    # CHECKSUM_INTERVAL 手ごとに盤面のチェックサムが付く
+    assert result["checksum"] == game_control.field.checksum()
+
+def test_parse_name():
+    assert parse_name("bot") == ("bot", frozenset())
+    # 知らないオプションは受け入れない
+    assert parse_name("bot\tdelta,unknown") == ("bot", frozenset({protocol.option_delta}))
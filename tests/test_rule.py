@@ -0,0 +1,102 @@
+import random
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.rule import STANDARD_RULE, compile_rule
+from lifegame_py.server import LifeGameControl
+from lifegame_py.bitboard import BitboardField
+from lifegame_py import protocol
+
+
+def reference_step(board, birth, survival, tie):
+    # ルールをそのまま書き下した実装
+    height, width = len(board), len(board[0])
+    new_board = [[protocol.DEAD] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            neighbors = [board[y + dy][x + dx]
+                         for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                         if (dy or dx) and 0 <= y + dy < height and 0 <= x + dx < width
+                         and board[y + dy][x + dx] != protocol.DEAD]
+            player1 = neighbors.count(protocol.PLAYER1)
+            player2 = neighbors.count(protocol.PLAYER2)
+            if board[y][x] != protocol.DEAD:
+                if len(neighbors) in survival:
+                    new_board[y][x] = board[y][x]
+            elif len(neighbors) in birth:
+                if player1 > player2:
+                    new_board[y][x] = protocol.PLAYER1
+                elif player2 > player1:
+                    new_board[y][x] = protocol.PLAYER2
+                else:
+                    new_board[y][x] = tie
+    return new_board
+
+def test_parse():
+    rule = compile_rule(" b36/S 23 , TIE = Player1 ")
+    assert rule.birth == {3, 6}
+    assert rule.survival == {2, 3}
+    assert rule.tie == protocol.PLAYER1
+    assert rule.spec == "B36/S23, tie=player1"
+    assert compile_rule(rule.spec) is rule
+    assert compile_rule(rule) is rule
+    assert compile_rule("B/S") == compile_rule("B/S, tie=dead")
+    assert compile_rule() is STANDARD_RULE
+    assert STANDARD_RULE.spec == protocol.RULE
+
+@pytest.mark.parametrize("spec", ["B3S23", "B9/S23", "B3/S23, tie=draw", "B3/S23 tie=dead", ""])
+def test_parse_errors(spec):
+    with pytest.raises(ValueError):
+        compile_rule(spec)
+
+def test_standard_rule_matches_other_engines(random_board):
+    rng = random.Random(3)
+    board = random_board(9, 11, rng)
+    field = LifeField.from_board(board, rule="B3/S23")
+    bitboard = BitboardField.from_board(board)
+    for _ in range(8):
+        field.next_generation()
+        bitboard.next_generation()
+        assert field.get_board_state() == bitboard.get_board_state()
+
+@pytest.mark.parametrize("spec", ["B36/S23, tie=dead", "B36/S23, tie=player1", "B36/S23, tie=player2",
+                                  "B2/S", "B1357/S1357", "B0/S8, tie=player2", "B4678/S35678"])
+def test_rule_matches_reference(spec, random_board):
+    rule = compile_rule(spec)
+    rng = random.Random(spec)
+    for density in (0.2, 0.6):
+        board = random_board(7, 10, rng, density)
+        field = LifeField.from_board(board, rule=spec)
+        for _ in range(6):
+            board = reference_step(board, rule.birth, rule.survival, rule.tie)
+            field.next_generation()
+            assert field.get_board_state() == board
+            field.check_consistency()
+
+def test_tie_rule():
+    # 空きセルの近傍が PLAYER1 3 個と PLAYER2 3 個
+    board = [
+        [1, 1, 1],
+        [0, 0, 0],
+        [2, 2, 2],
+    ]
+    for tie, owner in [('dead', protocol.DEAD), ('player1', protocol.PLAYER1), ('player2', protocol.PLAYER2)]:
+        field = LifeField.from_board(board, rule=f"B6/S, tie={tie}")
+        field.next_generation()
+        assert field.cells[1][1] == owner
+
+def test_rule_follows_clone_and_simulate():
+    field = LifeField(3, 3, rule="B1/S")
+    field.place(protocol.PLAYER1, (0, 0))
+    assert field.clone().rule is field.rule
+    assert field.simulate(1).count(protocol.PLAYER1) == 3  # (0, 1), (1, 0), (1, 1) に誕生
+    field.rule = "B3/S23"
+    assert field.simulate(1).count(protocol.PLAYER1) == 0
+
+def test_game_control_rule():
+    field = LifeField(4, 4)
+    control = LifeGameControl(field, "B36/S23")
+    assert field.rule is control.rule is compile_rule("B36/S23")
+    assert LifeGameControl(LifeField(4, 4)).rule is STANDARD_RULE
+    assert LifeGameControl(BitboardField(4, 4), protocol.RULE).rule is STANDARD_RULE
+    with pytest.raises(ValueError):
+        LifeGameControl(BitboardField(4, 4), "B36/S23")
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+import pytest
+from lifegame_py.sharded import COUNTERS, ShardServer, ShardedServer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'SO_REUSEPORT'), reason="needs SO_REUSEPORT")
+
+
+@pytest.fixture
+def sharded():
+    server = ShardedServer('127.0.0.1', 0, workers=3, handoff_delay=0.1)
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def play_pairs(scripted_client, first_moves, second_moves):
+    def play(address, pairs):
+        async def main():
+            tasks = []
+            for i in range(pairs):
+                registered = asyncio.Event()
+                tasks.append(asyncio.ensure_future(scripted_client(address, f'first{i}', first_moves, registered)))
+                await registered.wait()
+                tasks.append(asyncio.ensure_future(scripted_client(address, f'second{i}', second_moves)))
+            return await asyncio.wait_for(asyncio.gather(*tasks), 30)
+        return asyncio.run(main())
+    return play
+
+def wait_counters(server, **expected):
+    # ワーカーは一定間隔でカウンタを書き出す
+    deadline = time.monotonic() + 5
+    while True:
+        counters = server.counters()
+        if all(counters[name] == value for name, value in expected.items()) or time.monotonic() > deadline:
+            return counters
+        time.sleep(0.05)
+
+def test_pairs_across_workers(sharded, play_pairs):
+    address = (sharded.host, sharded.port)
+    # 1 組ずつ対戦させる。別々のワーカーに着いた 2 人もワーカー 0 で組む
+    for _ in range(4):
+        first, second = play_pairs(address, 1)
+        assert {first[-1], second[-1]} == {'you win', 'you lose'}
+    counters = wait_counters(sharded, games_finished=4)
+    assert counters["games_finished"] == 4
+    assert counters["games_in_progress"] == 0
+    assert counters["workers_alive"] == 3
+
+def test_concurrent_pairs(sharded, play_pairs):
+    results = play_pairs((sharded.host, sharded.port), 10)
+    assert all(len(lines) > 1 for lines in results)
+    counters = wait_counters(sharded, games_finished=10, connections=20)
+    assert counters["games_finished"] == 10
+    assert counters["connections"] == 20
+
+def test_restart_worker(sharded, play_pairs):
+    address = (sharded.host, sharded.port)
+    play_pairs(address, 2)
+    wait_counters(sharded, games_finished=2)
+    os.kill(sharded._processes[1].pid, signal.SIGKILL)
+    sharded._processes[1].join()
+    assert sharded.poll() == 1
+    assert sharded.poll() == 0
+    play_pairs(address, 2)
+    # 止まったワーカーの分も合計に残る
+    counters = wait_counters(sharded, games_finished=4)
+    assert counters["games_finished"] == 4
+    assert counters["restarts"] == 1
+    assert counters["workers_alive"] == 3
+
+def handoff_message(name, options=()):
+    return json.dumps({"name": name, "options": list(options)}).encode()
+
+def test_receive_does_not_block():
+    lobby_end, worker_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server = ShardServer(0, [0] * (3 * len(COUNTERS)), [lobby_end], 0.1)
+    adopted = []
+
+    async def adopt(name, options, sock):
+        adopted.append((name, options, sock.family))
+        sock.close()
+
+    async def main():
+        server._adopt = adopt
+        server.listen_lobby()
+        # 何も届いていなくても、fd のないメッセージや壊れたメッセージでも待たずに戻る
+        server._receive(lobby_end)
+        worker_end.send(handoff_message('lost'))
+        server._receive(lobby_end)
+        client, _ = socket.socketpair()
+        socket.send_fds(worker_end, [b'not json'], [client.fileno()])
+        server._receive(lobby_end)
+        socket.send_fds(worker_end, [handoff_message('first', ['delta'])], [client.fileno()])
+        client.close()
+        server._receive(lobby_end)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert adopted == [('first', frozenset(['delta']), socket.AF_UNIX)]
+    lobby_end.close()
+    worker_end.close()
+
+def test_hand_off_waits_for_a_full_lobby():
+    lobby_end, worker_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server = ShardServer(1, [0] * (3 * len(COUNTERS)), worker_end, 0.1)
+    lobby_end.setblocking(False)
+
+    async def main():
+        # ワーカー 0 の受信キューを一杯にしておく
+        filler = 0
+        while True:
+            try:
+                worker_end.send(b'{}')
+            except BlockingIOError:
+                break
+            filler += 1
+        client, peer = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=client)
+        server._waiting = ('first', reader, writer, frozenset())
+        server._hand_off()  # イベントループを止めずに戻る
+        assert len(server._outbox) == 1
+        assert not writer.is_closing()
+        for _ in range(filler):
+            lobby_end.recv(16)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not server._outbox:
+                break
+        message, fds, _, _ = socket.recv_fds(lobby_end, 1024, 1)
+        for fd in fds:
+            os.close(fd)
+        peer.close()
+        return json.loads(message), len(fds), writer.is_closing(), server._sending
+
+    handoff, fds, closed, sending = asyncio.run(main())
+    assert handoff == {"name": "first", "options": []}
+    assert fds == 1
+    assert closed and not sending
+    lobby_end.close()
+    worker_end.close()
@@ -0,0 +1,40 @@
+import random
+from lifegame_py.field import LifeField
+from lifegame_py.sparse import SparseLifeField
+from lifegame_py import protocol
+
+
+def test_round_trip(random_board):
+    board = random_board(6, 11, random.Random(1), 0.3)
+    sparse = SparseLifeField.from_board(board)
+    assert sparse.get_board_state() == board
+    field = sparse.to_field()
+    assert isinstance(field, LifeField)
+    assert field.get_board_state() == board
+    assert SparseLifeField.from_field(field).live == sparse.live
+
+def test_place():
+    field = SparseLifeField(height=3, width=3)
+    assert field.place(protocol.PLAYER1, (1, 1)) == True
+    assert field.live == {(1, 1): protocol.PLAYER1}
+    assert field.get((1, 1)) == protocol.PLAYER1
+    assert field.place(protocol.PLAYER2, (1, 1)) == False
+    assert field.place(protocol.PLAYER1, (-1, 0)) == False
+    assert field.place(protocol.PLAYER1, (0, 3)) == False
+    assert field.count(protocol.PLAYER1) == 1
+    assert field.count(protocol.DEAD) == 8
+
+def test_clone_is_independent():
+    field = SparseLifeField(height=4, width=4)
+    field.place(protocol.PLAYER2, (0, 0))
+    clone = field.clone()
+    clone.place(protocol.PLAYER1, (3, 3))
+    assert field.count(protocol.PLAYER1) == 0
+    assert clone.count(protocol.PLAYER1) == 1
+
+def test_dies_out():
+    field = SparseLifeField(height=1000, width=1000)
+    field.place(protocol.PLAYER1, (500, 500))
+    field.next_generation()
+    assert field.live == {}
+    assert field.count(protocol.DEAD) == 1000 * 1000
@@ -0,0 +1,60 @@
+import random
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py.symmetry import (apply_transform, canonical_form, inverse, symmetries,
+                                  transform_position, transforms, unique_moves)
+from lifegame_py import protocol
+
+
+@pytest.mark.parametrize("height,width", [(8, 8), (5, 5), (4, 7)])
+def test_transforms_commute_with_next_generation(height, width, random_board):
+    rng = random.Random(height * width)
+    board = random_board(height, width, rng, 0.3)
+    for transform in transforms(height, width):
+        field = LifeField.from_board(board)
+        image = LifeField.from_board(apply_transform(board, transform))
+        for _ in range(protocol.SIMULATION_GENERATIONS):
+            field.next_generation()
+            image.next_generation()
+        assert image.get_board_state() == apply_transform(field, transform)
+
+def test_transform_position_and_inverse():
+    board = [[protocol.DEAD] * 6 for _ in range(6)]
+    board[1][4] = protocol.PLAYER1
+    for transform in transforms(6, 6):
+        image = apply_transform(board, transform)
+        y, x = transform_position((1, 4), transform, 6, 6)
+        assert image[y][x] == protocol.PLAYER1
+        assert transform_position((y, x), inverse(transform), 6, 6) == (1, 4)
+    with pytest.raises(ValueError):
+        apply_transform([[0, 0, 0]], 1)
+
+def test_canonical_form_is_shared_by_symmetric_boards(random_board):
+    rng = random.Random(3)
+    board = random_board(8, 8, rng, 0.3)
+    canonical, transform = canonical_form(board)
+    assert apply_transform(board, transform) == canonical
+    for t in transforms(8, 8):
+        image = apply_transform(board, t)
+        assert canonical_form(image)[0] == canonical
+    # LifeField もそのまま渡せる
+    assert canonical_form(LifeField.from_board(board)) == (canonical, transform)
+
+def test_unique_moves():
+    # 空の 8x8 盤面では 64 手が 10 通りにまとまる
+    field = LifeField()
+    assert symmetries(field) == [1, 2, 3, 4, 5, 6, 7]
+    assert unique_moves(field) == [(0, 0), (0, 1), (0, 2), (0, 3), (1, 1),
+                                   (1, 2), (1, 3), (2, 2), (2, 3), (3, 3)]
+
+    # 対角線に関して対称な盤面
+    field.place(protocol.PLAYER1, (0, 0))
+    moves = unique_moves(field)
+    assert (0, 1) in moves and (1, 0) not in moves
+    assert len(moves) == (64 - 8) // 2 + 7
+
+    # 対称性のない盤面では全ての手が残る
+    field.place(protocol.PLAYER2, (0, 3))
+    assert symmetries(field) == []
+    assert len(unique_moves(field)) == 62
+    assert unique_moves(field, [(5, 5), (2, 1)]) == [(5, 5), (2, 1)]
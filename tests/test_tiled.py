@@ -0,0 +1,24 @@
+from lifegame_py.tiled import ActiveTileField
+from lifegame_py import protocol
+
+
+def test_place_marks_tiles_active():
+    field = ActiveTileField(height=16, width=16, tile_size=8)
+    assert field.active == set()
+    assert field.place(protocol.PLAYER1, (0, 0)) == True
+    assert field.active == {(0, 0)}
+    # タイル境界のセルは隣のタイルも活性化する
+    assert field.place(protocol.PLAYER1, (7, 8)) == True
+    assert field.active == {(0, 0), (0, 1), (1, 0), (1, 1)}
+    assert field.place(protocol.PLAYER2, (7, 8)) == False
+    assert field.place(protocol.PLAYER2, (16, 0)) == False
+
+def test_still_life_goes_idle():
+    field = ActiveTileField(height=32, width=32, tile_size=8)
+    for pos in [(10, 10), (10, 11), (11, 10), (11, 11)]:
+        field.place(protocol.PLAYER1, pos)
+    field.next_generation()
+    assert field.active == set()
+    field.next_generation()
+    assert field.count(protocol.PLAYER1) == 4
+    assert field.count(protocol.DEAD) == 32 * 32 - 4
@@ -0,0 +1,68 @@
+import random
+import pytest
+from lifegame_py.field import LifeField
+from lifegame_py import protocol
+
+np = pytest.importorskip("numpy")
+from lifegame_py.vectorized import NumpyLifeField, neighbor_counts, step, simulate_batch, placement_boards
+
+
+def test_neighbor_counts():
+    field = LifeField(width=3, height=3)
+    field.place(protocol.PLAYER1, (0, 1))
+    field.place(protocol.PLAYER2, (1, 0))
+    field.place(protocol.PLAYER1, (1, 1))
+
+    n1, n2 = neighbor_counts(np.array(field.cells, dtype=np.uint8))
+    for y in range(3):
+        for x in range(3):
+            neighbors = field._get_neighbors(y, x)
+            assert n1[y, x] == neighbors.count(protocol.PLAYER1)
+            assert n2[y, x] == neighbors.count(protocol.PLAYER2)
+
+def test_step_batch(random_board):
+    rng = random.Random(0)
+    boards = [random_board(6, 6, rng) for _ in range(4)]
+    stepped = step(np.array(boards, dtype=np.uint8))
+    for board, result in zip(boards, stepped):
+        field = LifeField.from_board(board)
+        field.next_generation()
+        assert result.tolist() == field.get_board_state()
+
+def test_place_count_and_convert():
+    field = NumpyLifeField(width=3, height=3)
+    assert field.place(protocol.PLAYER1, (1, 1)) == True
+    assert field.place(protocol.PLAYER2, (1, 1)) == False
+    assert field.place(protocol.PLAYER2, (0, 3)) == False
+    assert field.place(protocol.PLAYER2, (2, 2)) == True
+    assert field.count(protocol.PLAYER1) == 1
+    assert field.count(protocol.DEAD) == 7
+    assert field.to_field().get_board_state() == field.get_board_state()
+
+def test_simulate_batch_matches_reference(random_board):
+    rng = random.Random(1)
+    boards = [random_board(protocol.HEIGHT, protocol.WIDTH, rng) for _ in range(16)]
+    for generations in (0, 1, protocol.SIMULATION_GENERATIONS):
+        results, counts = simulate_batch(boards, generations)
+        assert results.shape == (16, protocol.HEIGHT, protocol.WIDTH)
+        for board, result, count in zip(boards, results, counts):
+            field = LifeField.from_board(board)
+            for _ in range(generations):
+                field.next_generation()
+            assert result.tolist() == field.get_board_state()
+            for owner in (protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2):
+                assert count[owner] == field.count(owner)
+
+def test_simulate_batch_rejects_single_board(random_board):
+    with pytest.raises(ValueError):
+        simulate_batch(random_board(4, 4, random.Random(0)))
+
+def test_placement_boards():
+    field = LifeField(width=3, height=2)
+    field.place(protocol.PLAYER1, (0, 1))
+    positions, boards = placement_boards(field.cells, protocol.PLAYER2)
+    assert positions == [(0, 0), (0, 2), (1, 0), (1, 1), (1, 2)]
+    for (y, x), board in zip(positions, boards):
+        expected = LifeField.from_board(field.get_board_state())
+        expected.place(protocol.PLAYER2, (y, x))
+        assert board.tolist() == expected.get_board_state()
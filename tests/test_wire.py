@@ -0,0 +1,54 @@
+import io
+import random
+import pytest
+from lifegame_py import wire
+from lifegame_py.field import LifeField
+from lifegame_py.server import LifeClient, LifeGameControl
+from lifegame_py import protocol
+
+
+def test_pack_board():
+    rng = random.Random(0)
+    for cells in (0, 1, 3, 4, 5, 64, 1001):
+        board = bytes(rng.choice([protocol.DEAD, protocol.PLAYER1, protocol.PLAYER2]) for _ in range(cells))
+        packed = wire.pack_board(board)
+        assert len(packed) == (cells + 3) // 4
+        assert wire.unpack_board(packed, cells) == board
+
+def test_statuses():
+    for status in wire.STATUSES:
+        assert wire.decode(wire.encode_status(status)[4:]) == status
+
+def game_results(board):
+    # 本物のゲームで配置と結果のメッセージを作り、JSON と同じ内容に戻ることを確かめる
+    game_control = LifeGameControl(LifeField(5, 7))
+    for i in range(2):
+        game_control.add_client(LifeClient(i, f'p{i}', None))
+    for i, position in enumerate([(0, 0), (1, 1), (0, 1), (4, 6)]):
+        result = game_control.place_cell(i % 2, position, board)
+        yield result, game_control.field
+    yield game_control.run_simulation(), game_control.field
+
+@pytest.mark.parametrize("board", [True, False])
+def test_results_match_json(board):
+    for result, field in game_results(board):
+        frame = wire.encode_result(result, field)
+        assert wire.decode(frame[4:]) == result
+
+def test_read_frame():
+    frames = wire.encode_placement((2, 9)) + wire.encode_ack() + wire.encode_status(protocol.draw)
+    stream = io.BytesIO(frames + frames[:3])
+    assert wire.decode_placement(wire.read_frame(stream)) == (2, 9)
+    assert wire.is_ack(wire.read_frame(stream))
+    assert wire.decode(wire.read_frame(stream)) == protocol.draw
+    # 途中で切れたフレームは終わりとみなす
+    assert wire.read_frame(stream) is None
+
+def test_malformed_frames():
+    for payload in (b'\x09', b'\x01\x00', bytes((wire.STATUS, 99))):
+        with pytest.raises(ValueError):
+            wire.decode(payload)
+    with pytest.raises(ValueError):
+        wire.decode_placement(wire.encode_status(protocol.placement)[4:])
+    with pytest.raises(ValueError):
+        wire.read_frame(io.BytesIO(b'\xff\xff\xff\xff'))